@@ -0,0 +1,71 @@
+"""
+Filtered audit queries: a full parse of audit.log versus AuditService.query_logs
+over the sidecar index. Also reports the one-off cost of indexing an existing log.
+
+    python benchmarks/bench_audit_query.py --size-mb 256
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.services.audit_service import AuditService, LOG_PATTERN
+from bench_audit_tail import write_log
+
+QUERIES = [
+    {"action": "RETRIEVE", "since": "2024-01-10", "until": "2024-01-12", "contains": "service-42"},
+    {"action": "DELETE"},
+    {"since": "2024-01-20", "until": "2024-01-20"},
+]
+
+
+def full_scan(log_file: str, action=None, since=None, until=None, contains=None) -> list[dict]:
+    results = []
+    with open(log_file, "r") as f:
+        for line in f:
+            match = LOG_PATTERN.match(line.strip())
+            if not match:
+                continue
+            day = match.group(1)[:10]
+            if action and match.group(2) != action:
+                continue
+            if (since and day < since) or (until and day > until):
+                continue
+            if contains and contains.lower() not in match.group(3).lower():
+                continue
+            results.append({"timestamp": match.group(1), "action": match.group(2), "details": match.group(3)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=256)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = AuditService(tmp, max_bytes=2 ** 62)
+        write_log(service.log_file, args.size_mb)
+
+        start = time.perf_counter()
+        service.index.catch_up(service.log_file)
+        print(f"initial index of {args.size_mb} MB: {time.perf_counter() - start:.1f}s, "
+              f"sidecar {os.path.getsize(service.index.filepath) / 1024 / 1024:.0f} MB")
+
+        for query in QUERIES:
+            start = time.perf_counter()
+            expected = full_scan(service.log_file, **query)
+            scan = time.perf_counter() - start
+
+            start = time.perf_counter()
+            logs = service.query_logs(**query)
+            indexed = time.perf_counter() - start
+
+            print(f"{str(query):<90} scan {scan * 1000:9.1f} ms  index {indexed * 1000:8.1f} ms  "
+                  f"{len(logs)} matches  identical={logs == expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+vault audit latency and peak memory on a large audit.log: the old readlines() parse
+versus AuditService's reverse block reader. Each reader runs in its own interpreter
+so peak RSS is measured independently, and the parsed entries are compared.
+
+    python benchmarks/bench_audit_tail.py --size-mb 1024 --limit 20
+"""
+import argparse
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.services.audit_service import AuditService
+
+ACTIONS = ["LOGIN_SUCCESS", "RETRIEVE", "SEARCH", "VIEW_ALL", "ADD", "UPDATE", "DELETE"]
+
+
+def write_log(path: str, size_mb: int):
+    target = size_mb * 1024 * 1024
+    written = 0
+    n = 0
+
+    with open(path, "w") as f:
+        while written < target:
+            lines = "".join(
+                f"[2024-01-{1 + (n + i) // 100000 % 28:02d} 12:{(n + i) // 60 % 60:02d}:{(n + i) % 60:02d}] "
+                f"{ACTIONS[(n + i) % len(ACTIONS)]}: Copied password for: service-{(n + i) % 5000}\n"
+                for i in range(10000)
+            )
+            f.write(lines)
+            written += len(lines)
+            n += 10000
+
+
+def readlines_parse(log_file: str, limit: int) -> list[dict]:
+    with open(log_file, "r") as f:
+        lines = f.readlines()
+
+    pattern = re.compile(r"\[(.*?)\] (.*?): (.*)")
+    results = []
+    for line in lines[-limit:]:
+        match = pattern.match(line.strip())
+        if match:
+            results.append({"timestamp": match.group(1), "action": match.group(2), "details": match.group(3)})
+    return results
+
+
+def worker(method: str, log_file: str, limit: int):
+    start = time.perf_counter()
+    if method == "readlines":
+        logs = readlines_parse(log_file, limit)
+    else:
+        service = AuditService(os.path.dirname(log_file))
+        logs = service.get_parsed_logs(limit)
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": elapsed, "peak_mb": peak_kb / 1024, "logs": logs}))
+
+
+def run_worker(method: str, log_file: str, limit: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", method, "--path", log_file, "--limit", str(limit)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--path", help="Reuse an existing audit.log instead of generating one.")
+    parser.add_argument("--skip-readlines", action="store_true", help="Only time the tail reader.")
+    parser.add_argument("--worker", choices=["readlines", "tail"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.path, args.limit)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = args.path or os.path.join(tmp, "audit.log")
+        if not args.path:
+            start = time.perf_counter()
+            write_log(log_file, args.size_mb)
+            print(f"generated {os.path.getsize(log_file) / 1024 / 1024:.0f} MB in {time.perf_counter() - start:.1f}s")
+
+        methods = ["tail"] if args.skip_readlines else ["readlines", "tail"]
+        results = {method: run_worker(method, log_file, args.limit) for method in methods}
+
+        for method, result in results.items():
+            print(f"{method:<10} {result['seconds'] * 1000:10.1f} ms   peak RSS {result['peak_mb']:8.1f} MB")
+
+        if len(results) == 2:
+            identical = results["readlines"]["logs"] == results["tail"]["logs"]
+            print(f"identical results: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Vault file size and end-to-end save/load latency (serialize, compress, encrypt, write and back)
+for every available compression codec and record format.
+
+    python benchmarks/bench_compression.py --records 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.repositories.json_repository import JsonRepository
+from vault.utils.compression import available_codecs, get_codec
+from vault.utils.encryptors import FernetDataEncryptor
+from vault.utils.serializers import get_serializer
+
+PASSWORD = "BenchmarkPassword1!"
+
+
+def make_records(count: int) -> dict:
+    # Shared accounts: a few hundred usernames and e-mail addresses reused across services.
+    rng = random.Random(42)
+    users = [f"team-{i}@example.com" for i in range(200)] + [f"svc_account_{i}" for i in range(100)]
+    return {f"service-{i}": {"service_name": f"Service-{i}", "username": rng.choice(users),
+                             "password": "".join(rng.choices("abcdefghijkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789!@#$%", k=20))}
+            for i in range(count)}
+
+
+def best_of(action, runs: int = 3) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        encryptor = FernetDataEncryptor()
+        encryptor.encrypt("", PASSWORD)
+
+        for vault_format in ("jsonl", "binary"):
+            for name in available_codecs():
+                repository = JsonRepository(os.path.join(tmp, f"{vault_format}-{name}.json"), encryptor,
+                                            serializer=get_serializer(vault_format), codec=get_codec(name))
+
+                save = best_of(lambda: repository.save_data(records, PASSWORD))
+                load = best_of(lambda: repository.load_data(PASSWORD))
+                size = os.path.getsize(repository.filepath)
+
+                print(f"{vault_format:<7} {name:<5} {size / 1024:8.0f} KiB  save {save * 1000:7.1f} ms  load {load * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
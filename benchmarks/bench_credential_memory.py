@@ -0,0 +1,53 @@
+"""
+Bytes per Credential for the slotted model against the previous plain dataclass, traced with
+tracemalloc. The field strings are created before tracing starts, so only the objects
+themselves are counted; the last column adds the strings for a sense of the whole record.
+
+    python benchmarks/bench_credential_memory.py --counts 100000 500000 1000000
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.models.credential import Credential
+
+
+@dataclass
+class DictCredential:
+    service_name: str
+    username: str
+    password: str
+
+
+def traced_bytes(build) -> tuple[int, object]:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100000, 500000, 1000000])
+    args = parser.parse_args()
+
+    for count in args.counts:
+        string_bytes, fields = traced_bytes(
+            lambda: [(f"Service-{i}", f"user{i}@example.com", f"secret-password-{i}") for i in range(count)]
+        )
+
+        for label, model in (("dataclass", DictCredential), ("slots", Credential)):
+            object_bytes, credentials = traced_bytes(lambda: [model(*values) for values in fields])
+            print(f"{count:>9} {label:<10} {object_bytes / count:6.1f} B/credential  "
+                  f"{(object_bytes + string_bytes) / count:6.1f} B with strings")
+            del credentials
+
+
+if __name__ == "__main__":
+    main()
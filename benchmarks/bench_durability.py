@@ -0,0 +1,57 @@
+"""
+Per-mutation latency of VaultService.add_credential under each durability mode, and
+the time the final flush takes to bring the vault file up to date.
+
+    python benchmarks/bench_durability.py --records 10000 --mutations 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.models.credential import Credential
+from vault.repositories.json_repository import JsonRepository
+from vault.repositories.write_behind import DURABILITY_MODES
+from vault.services.vault_service import VaultService
+from vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "BenchmarkPassword1!"
+
+
+def make_records(count: int) -> dict:
+    return {f"service-{i}": {"service_name": f"Service-{i}", "username": f"user{i}", "password": f"Password-{i}!"}
+            for i in range(count)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--mutations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        encryptor = FernetDataEncryptor()
+        encryptor.encrypt("", PASSWORD)
+
+        for mode in DURABILITY_MODES:
+            path = os.path.join(tmp, f"{mode}.json")
+            JsonRepository(path, encryptor).save_data(make_records(args.records), PASSWORD)
+            service = VaultService(JsonRepository(path, encryptor, durability=mode), PASSWORD)
+
+            start = time.perf_counter()
+            for i in range(args.mutations):
+                service.add_credential(Credential(f"New-{i}", "user", "Password-1!"))
+            mutations = time.perf_counter() - start
+
+            start = time.perf_counter()
+            service.flush()
+            flush = time.perf_counter() - start
+
+            print(f"{mode:<9} {mutations / args.mutations * 1000:8.2f} ms/mutation  final flush {flush * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Export time and peak memory for a large vault: the streaming writers against the old
+approach of copying every credential into a dict and calling json.dump(indent=4).
+
+    python benchmarks/bench_export.py --records 300000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.repositories.json_repository import JsonRepository
+from vault.services.vault_service import VaultService
+from vault.services.vault_transfer_service import VaultTransferService
+from vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "BenchmarkPassword1!"
+
+
+def copy_and_dump(service: VaultService, filepath: str):
+    export_data = {}
+    for key, cred in service.list_all_credentials().items():
+        export_data[key] = {"service_name": cred.service_name, "username": cred.username, "password": cred.password}
+
+    with open(filepath, "w") as f:
+        json.dump(export_data, f, indent=4)
+
+
+def timed(action) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def peak_mb(action) -> float:
+    tracemalloc.start()
+    action()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=300000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        encryptor = FernetDataEncryptor()
+        vault_path = os.path.join(tmp, "vault.json")
+        JsonRepository(vault_path, encryptor).save_data(
+            {f"service-{i}": {"service_name": f"Service-{i}", "username": f"user{i}@example.com", "password": f"Password-{i}!"}
+             for i in range(args.records)}, PASSWORD)
+
+        runs = [("copy + json.dump(indent=4)", "old.json", lambda service, path: copy_and_dump(service, path))]
+        runs += [(f"streaming {name}", f"export.{name}", lambda service, path: VaultTransferService(service).export_to_file(path))
+                 for name in ("json", "ndjson", "csv")]
+
+        for label, filename, export in runs:
+            # A freshly opened vault for each measurement, so none benefits from Credentials another one built.
+            path = os.path.join(tmp, filename)
+            elapsed = timed(lambda: export(VaultService(JsonRepository(vault_path, encryptor), PASSWORD), path))
+            service = VaultService(JsonRepository(vault_path, encryptor), PASSWORD)
+            peak = peak_mb(lambda: export(service, path))
+
+            print(f"{label:<28} {elapsed:6.2f} s  peak {peak:7.1f} MiB  {os.path.getsize(path) / 1024 / 1024:6.1f} MiB written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Bulk import from JSON, NDJSON and CSV exports: parser peak memory (streaming reader
+against json.load of the whole file) and end-to-end import throughput into a vault.
+
+    python benchmarks/bench_import.py --records 300000
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.repositories.json_repository import JsonRepository
+from vault.services.vault_service import VaultService
+from vault.services.vault_transfer_service import VaultTransferService
+from vault.utils.encryptors import FernetDataEncryptor
+from vault.utils.import_readers import get_reader
+
+PASSWORD = "BenchmarkPassword1!"
+
+
+def make_records(count: int) -> list[dict]:
+    return [{"service_name": f"Service-{i}", "username": f"user{i}@example.com", "password": f"Password-{i}-xYz!"}
+            for i in range(count)]
+
+
+def write_exports(tmp: str, records: list[dict]) -> dict:
+    paths = {"json": os.path.join(tmp, "export.json"), "ndjson": os.path.join(tmp, "export.ndjson"),
+             "csv": os.path.join(tmp, "export.csv")}
+
+    with open(paths["json"], "w") as f:
+        json.dump({record["service_name"].lower(): record for record in records}, f, indent=4)
+    with open(paths["ndjson"], "w") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+    with open(paths["csv"], "w", newline="") as f:
+        writer = csv.DictWriter(f, ["service_name", "username", "password"])
+        writer.writeheader()
+        writer.writerows(records)
+
+    return paths
+
+
+def parse_peak_mb(action) -> float:
+    tracemalloc.start()
+    action()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def stream_all(name: str, path: str):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for _ in get_reader(name)(f):
+            pass
+
+
+def load_all(path: str):
+    with open(path) as f:
+        json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=300000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_exports(tmp, make_records(args.records))
+        encryptor = FernetDataEncryptor()
+        encryptor.encrypt("", PASSWORD)
+
+        print(f"json.load (whole file)   parse peak {parse_peak_mb(lambda: load_all(paths['json'])):7.1f} MiB")
+
+        for name, path in paths.items():
+            peak = parse_peak_mb(lambda: stream_all(name, path))
+
+            service = VaultService(JsonRepository(os.path.join(tmp, f"vault-{name}.json"), encryptor), PASSWORD)
+            start = time.perf_counter()
+            summary = VaultTransferService(service).import_from_file(path)
+            elapsed = time.perf_counter() - start
+
+            print(f"{name:<6} {os.path.getsize(path) / 1024 / 1024:6.1f} MiB  parse peak {peak:7.1f} MiB  "
+                  f"import {elapsed:6.2f} s  {summary.imported / elapsed:9,.0f} records/s")
+
+
+if __name__ == "__main__":
+    main()
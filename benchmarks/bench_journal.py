@@ -0,0 +1,66 @@
+"""
+Latency of a single VaultService.add_credential against vault size,
+for the plain JsonRepository and the JournaledJsonRepository.
+
+    python benchmarks/bench_journal.py --sizes 10 20000 --adds 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.models.credential import Credential
+from vault.repositories.json_repository import JsonRepository
+from vault.repositories.journaled_repository import JournaledJsonRepository
+from vault.services.vault_service import VaultService
+from vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "benchmark-password"
+
+
+def seed(repo_class, path: str, encryptor, size: int):
+    data = {
+        f"service{i}": {"service_name": f"Service{i}", "username": f"user{i}", "password": f"pw-{i}"}
+        for i in range(size)
+    }
+    repo_class(path, encryptor).save_data(data, PASSWORD)
+
+
+def time_adds(repo_class, size: int, adds: int) -> list[float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.json")
+        encryptor = FernetDataEncryptor()
+        seed(repo_class, path, encryptor, size)
+
+        repo = repo_class(path, encryptor)
+        if isinstance(repo, JournaledJsonRepository):
+            repo.max_journal_records = adds + 1
+        service = VaultService(repo, PASSWORD)
+
+        timings = []
+        for i in range(adds):
+            start = time.perf_counter()
+            service.add_credential(Credential(f"new{i}", "user", "password"))
+            timings.append(time.perf_counter() - start)
+        return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20000])
+    parser.add_argument("--adds", type=int, default=50)
+    args = parser.parse_args()
+
+    for repo_class in (JsonRepository, JournaledJsonRepository):
+        for size in args.sizes:
+            ms = [t * 1000 for t in time_adds(repo_class, size, args.adds)]
+            print(f"{repo_class.__name__:<24} size={size:>7}  "
+                  f"median={statistics.median(ms):8.2f} ms  mean={statistics.mean(ms):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
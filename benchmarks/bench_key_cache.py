@@ -0,0 +1,77 @@
+"""
+Per-save latency of JsonRepository.save_data with and without the
+session key cache in FernetDataEncryptor.
+
+    python benchmarks/bench_key_cache.py --saves 20 --entries 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.repositories.json_repository import JsonRepository
+from vault.utils.encryptors import FernetDataEncryptor
+
+
+class UncachedEncryptor(FernetDataEncryptor):
+    """Derives a fresh key on every call, matching the behaviour before the cache."""
+
+    def _get_key(self, password, salt, params):
+        return self.derive_key(password, salt, params)
+
+    def encrypt(self, data, password):
+        self.rekey()
+        return super().encrypt(data, password)
+
+
+def make_data(entries: int) -> dict:
+    return {
+        f"service{i}": {"service_name": f"Service{i}", "username": f"user{i}", "password": f"pw-{i}"}
+        for i in range(entries)
+    }
+
+
+def time_saves(encryptor, data: dict, saves: int, password: str) -> list[float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = JsonRepository(os.path.join(tmp, "bench.json"), encryptor)
+        repo.save_data(data, password)
+        repo.load_data(password)
+
+        timings = []
+        for _ in range(saves):
+            start = time.perf_counter()
+            repo.save_data(data, password)
+            timings.append(time.perf_counter() - start)
+        return timings
+
+
+def report(label: str, timings: list[float]):
+    ms = [t * 1000 for t in timings]
+    print(f"{label:<10} mean={statistics.mean(ms):8.2f} ms  "
+          f"median={statistics.median(ms):8.2f} ms  total={sum(ms):9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--saves", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=200)
+    args = parser.parse_args()
+
+    data = make_data(args.entries)
+    password = "benchmark-password"
+
+    before = time_saves(UncachedEncryptor(), data, args.saves, password)
+    after = time_saves(FernetDataEncryptor(), data, args.saves, password)
+
+    print(f"{args.saves} saves of a {args.entries}-entry vault")
+    report("uncached", before)
+    report("cached", after)
+    print(f"speedup    {statistics.mean(before) / statistics.mean(after):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
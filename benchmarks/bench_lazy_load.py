@@ -0,0 +1,68 @@
+"""
+Cost of a single-lookup command ('get') on a large vault: load_data followed by one lookup,
+with Credential objects built lazily versus every record materialised up front.
+
+    python benchmarks/bench_lazy_load.py --records 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.repositories.json_repository import JsonRepository
+from vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "BenchmarkPassword1!"
+
+
+def load_and_get(repository: JsonRepository, eager: bool):
+    credentials = repository.load_data(PASSWORD)
+    if eager:
+        credentials = dict(credentials.items())
+    credentials.get("service-4242")
+    return credentials
+
+
+def measure(repository: JsonRepository, eager: bool, runs: int = 3):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        load_and_get(repository, eager)
+        timings.append(time.perf_counter() - start)
+
+    # Memory is traced in a separate run, tracemalloc slows allocation-heavy code down too much to time it.
+    tracemalloc.start()
+    credentials = load_and_get(repository, eager)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del credentials
+
+    return min(timings), retained, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+
+    records = {f"service-{i}": {"service_name": f"Service-{i}", "username": f"user{i}", "password": f"secret-{i}"}
+               for i in range(args.records)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        encryptor = FernetDataEncryptor()
+        repository = JsonRepository(os.path.join(tmp, "vault.json"), encryptor)
+        repository.save_data(records, PASSWORD)
+        del records
+        repository.load_data(PASSWORD)
+
+        for label, eager in (("eager", True), ("lazy", False)):
+            elapsed, retained, peak = measure(repository, eager)
+            print(f"{label:<6} {elapsed * 1000:8.1f} ms  retained {retained / 1024 / 1024:7.1f} MB  peak {peak / 1024 / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Master password rotation across many vaults: re-wrapping the envelope key
+versus decrypting and re-encrypting each vault.
+
+    python benchmarks/bench_rotation.py --vaults 200 --entries 500
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.repositories.json_repository import JsonRepository
+from vault.services.vault_service import VaultService
+from vault.utils.encryptors import FernetDataEncryptor
+
+OLD_PASSWORD = "old-benchmark-password"
+NEW_PASSWORD = "new-benchmark-password"
+
+
+def seed(data_dir: str, vaults: int, entries: int):
+    data = {
+        f"service{i}": {"service_name": f"Service{i}", "username": f"user{i}", "password": f"pw-{i}"}
+        for i in range(entries)
+    }
+    for n in range(vaults):
+        encryptor = FernetDataEncryptor()
+        JsonRepository(os.path.join(data_dir, f"vault{n}.json"), encryptor).save_data(data, OLD_PASSWORD)
+
+
+def reencrypt_all(data_dir: str):
+    for path in glob.glob(os.path.join(data_dir, "*.json")):
+        repo = JsonRepository(path, FernetDataEncryptor())
+        data = {k: c.to_dict() for k, c in repo.load_data(OLD_PASSWORD).items()}
+        repo.save_data(data, NEW_PASSWORD)
+
+
+def rewrap_all(data_dir: str, max_workers: int | None = None):
+    repo = JsonRepository(os.path.join(data_dir, "vault0.json"), FernetDataEncryptor())
+    service = VaultService(repo, OLD_PASSWORD)
+    service.change_master_password(NEW_PASSWORD, max_workers=max_workers)
+
+
+def measure(label: str, rotate, vaults: int, entries: int, kdf_seconds: float):
+    with tempfile.TemporaryDirectory() as tmp:
+        seed(tmp, vaults, entries)
+        start = time.perf_counter()
+        rotate(tmp)
+        elapsed = time.perf_counter() - start
+
+    print(f"{label:<14} {elapsed * 1000:9.1f} ms  ({elapsed / kdf_seconds / vaults:4.2f} KDF-equivalents per vault)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vaults", type=int, default=200)
+    parser.add_argument("--entries", type=int, default=500)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    FernetDataEncryptor().derive_key(OLD_PASSWORD, os.urandom(16))
+    kdf_seconds = time.perf_counter() - start
+
+    print(f"{args.vaults} vaults x {args.entries} entries, one KDF = {kdf_seconds * 1000:.1f} ms")
+    measure("re-encrypt", reencrypt_all, args.vaults, args.entries, kdf_seconds)
+    measure("rewrap x1", lambda d: rewrap_all(d, max_workers=1), args.vaults, args.entries, kdf_seconds)
+    measure("rewrap pool", rewrap_all, args.vaults, args.entries, kdf_seconds)
+
+
+if __name__ == "__main__":
+    main()
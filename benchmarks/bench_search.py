@@ -0,0 +1,72 @@
+"""
+search_credentials latency: linear thefuzz scan versus the service name index.
+
+    python benchmarks/bench_search.py --entries 100000
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from thefuzz import fuzz
+from vault.models.credential import Credential
+from vault.utils.search_index import ServiceNameIndex
+
+QUERIES = ["netlfix", "github", "aws-prod", "mail", "bank of", "zz", "xq"]
+
+
+def make_credentials(entries: int) -> dict:
+    rng = random.Random(42)
+    words = ["github", "gitlab", "netflix", "amazon", "aws", "bank", "mail", "google", "outlook", "shop"]
+    credentials = {}
+    for i in range(entries):
+        suffix = "".join(rng.choice(string.ascii_lowercase + string.digits) for _ in range(rng.randint(3, 10)))
+        name = f"{rng.choice(words)}-{suffix}"
+        credentials[name.lower()] = Credential(name, "user", "password")
+    return credentials
+
+
+def linear_search(credentials: dict, query: str) -> dict:
+    return {
+        key: cred for key, cred in credentials.items()
+        if fuzz.partial_ratio(query.lower(), cred.service_name.lower()) > 60
+    }
+
+
+def indexed_search(credentials: dict, index: ServiceNameIndex, query: str) -> dict:
+    return {key: credentials[key] for key in index.search(query, 60)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100000)
+    args = parser.parse_args()
+
+    credentials = make_credentials(args.entries)
+
+    start = time.perf_counter()
+    index = ServiceNameIndex({key: cred.service_name for key, cred in credentials.items()})
+    print(f"{len(credentials)} credentials, index built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for query in QUERIES:
+        start = time.perf_counter()
+        expected = linear_search(credentials, query)
+        linear_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        actual = indexed_search(credentials, index, query)
+        indexed_ms = (time.perf_counter() - start) * 1000
+
+        assert actual == expected
+        keys = index.candidates(query.lower(), 60)
+        candidates = "scan" if keys is None else len(keys)
+        print(f"{query!r:<12} matches={len(expected):>6} candidates={candidates:>6}  "
+              f"linear={linear_ms:8.1f} ms  indexed={indexed_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Serialize and deserialize throughput of the record formats, against a plain json.dumps/json.loads
+of the whole vault, plus the encoded size. Encryption is left out.
+
+    python benchmarks/bench_serializers.py --records 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.utils.serializers import BinaryRecordSerializer, JsonDocumentSerializer, JsonLinesSerializer
+
+
+def best_of(action, runs: int = 5) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    for count in args.records:
+        records = {f"service-{i}": {"service_name": f"Service-{i}", "username": f"user{i}@example.com",
+                                    "password": f"pässword-{i:08d}"} for i in range(count)}
+
+        for serializer in (JsonDocumentSerializer(), JsonLinesSerializer(), BinaryRecordSerializer()):
+            chunks = list(serializer.encode(records))
+            assert dict(serializer.decode(chunks)) == records
+
+            encode = best_of(lambda: list(serializer.encode(records)))
+            decode = best_of(lambda: list(serializer.decode(chunks)))
+            size = sum(map(len, chunks))
+
+            print(f"{count:>7} {serializer.FORMAT:<7} encode {encode * 1000:7.1f} ms ({count / encode / 1000:6.0f}k rec/s)  "
+                  f"decode {decode * 1000:7.1f} ms ({count / decode / 1000:6.0f}k rec/s)  {size / 1024:8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
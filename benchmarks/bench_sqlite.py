@@ -0,0 +1,62 @@
+"""
+Per-change cost of the JSON, journal and SQLite repositories on a vault of --records
+credentials: one add, one update and one delete through VaultService, plus the load.
+
+    python benchmarks/bench_sqlite.py --records 10000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.app import create_repository
+from vault.models.credential import Credential
+from vault.services.vault_service import VaultService
+from vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "BenchmarkPassword1!"
+
+
+def timed(action) -> float:
+    start = time.perf_counter()
+    action()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=10000)
+    args = parser.parse_args()
+
+    records = {f"service-{i}": {"service_name": f"Service-{i}", "username": f"user{i}", "password": f"secret-{i}"}
+               for i in range(args.records)}
+
+    for repository_type in ("json", "journal", "sqlite"):
+        with tempfile.TemporaryDirectory() as tmp:
+            encryptor = FernetDataEncryptor()
+            repository = create_repository(repository_type, os.path.join(tmp, "vault.json"), encryptor)
+            repository.save_data(records, PASSWORD)
+
+            service = None
+
+            def load():
+                nonlocal service
+                service = VaultService(repository.sibling(repository.filepath), PASSWORD)
+
+            load_ms = timed(load)
+            add_ms = timed(lambda: service.add_credential(Credential("New", "user", "secret")))
+            update_ms = timed(lambda: service.update_credential(Credential("Service-1", "renamed", "")))
+            delete_ms = timed(lambda: service.delete_credential("service-2"))
+            flush = getattr(service.repo, "flush", None)
+            if flush:
+                flush()
+
+            print(f"{repository_type:<8} load {load_ms:8.1f} ms  add {add_ms:7.2f} ms  "
+                  f"update {update_ms:7.2f} ms  delete {delete_ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
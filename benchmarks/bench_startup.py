@@ -0,0 +1,87 @@
+"""
+Cold-start import time of the vault CLI, checked against a per-command budget.
+
+Each command runs in a fresh interpreter under `python -X importtime` with HOME pointed at a
+throwaway directory; the reported figure is the best of --runs. The script exits with status 1
+when a command goes over its budget, so it can gate CI. `generate` copies a throwaway password
+to the clipboard (or fails to, on headless machines) after its imports are done.
+
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --budget help=120 --budget generate=180
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+ENTRY_POINT = os.path.join(ROOT, "run.py")
+
+DEFAULT_BUDGETS_MS = {"help": 150, "generate": 200}
+HEAVY_MODULES = ("cryptography", "thefuzz", "rapidfuzz", "rich", "pyperclip")
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def measure(command: str, home: str) -> tuple[float, set[str]]:
+    env = dict(os.environ, HOME=home)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", ENTRY_POINT, command],
+        env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+
+    total_us = 0
+    heavy = set()
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+
+        name = match.group(4)
+        if not match.group(3):
+            total_us += int(match.group(2))
+        if name.split(".")[0] in HEAVY_MODULES:
+            heavy.add(name.split(".")[0])
+
+    return total_us / 1000, heavy
+
+
+def parse_budgets(values: list[str]) -> dict[str, float]:
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for value in values:
+        command, _, limit = value.partition("=")
+        budgets[command] = float(limit)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", action="append", default=[], metavar="COMMAND=MS",
+                        help="Import-time budget in milliseconds (defaults: help=150, generate=200).")
+    args = parser.parse_args()
+
+    budgets = parse_budgets(args.budget)
+    over_budget = False
+
+    with tempfile.TemporaryDirectory() as home:
+        for command, budget in budgets.items():
+            best = None
+            heavy = set()
+            for _ in range(args.runs):
+                elapsed, loaded = measure(command, home)
+                best = elapsed if best is None else min(best, elapsed)
+                heavy |= loaded
+
+            status = "ok" if best <= budget else "OVER BUDGET"
+            over_budget |= best > budget
+            print(f"{command:<10} {best:8.1f} ms  (budget {budget:.0f} ms)  {status}")
+            print(f"{'':<10} heavy modules loaded: {', '.join(sorted(heavy)) or 'none'}")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Peak RSS of saving and loading a large vault: the single-token envelope (whole JSON document
+through one Fernet token) against the segmented stream JsonRepository now writes.
+Each phase runs in its own process and reports its peak RSS above the RSS it started from
+(the generated records for saves, the bare interpreter for loads).
+
+    python benchmarks/bench_stream_memory.py --size-mb 500
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.repositories.json_repository import JsonRepository
+from vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "BenchmarkPassword1!"
+RECORD_NOTE_SIZE = 4000
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_records(size_mb: int) -> dict:
+    # Every record shares one password string, so the records themselves stay small in memory.
+    count = size_mb * 1024 * 1024 // (RECORD_NOTE_SIZE + 100)
+    note = "x" * RECORD_NOTE_SIZE
+    return {f"service-{i}": {"service_name": f"Service-{i}", "username": f"user{i}", "password": note}
+            for i in range(count)}
+
+
+def run_phase(phase: str, path: str, size_mb: int):
+    encryptor = FernetDataEncryptor()
+    repository = JsonRepository(path, encryptor)
+
+    if phase.startswith("save"):
+        records = make_records(size_mb)
+
+    # Derive the key up front so the KDF does not show up in the timings.
+    encryptor.encrypt("", PASSWORD)
+    baseline = rss_mb()
+    start = time.perf_counter()
+
+    if phase == "save-token":
+        with open(path, "wb") as f:
+            f.write(encryptor.encrypt(json.dumps(records), PASSWORD))
+    elif phase == "save-stream":
+        repository.save_data(records, PASSWORD)
+    elif phase == "scan-stream":
+        for _ in repository._iter_records(PASSWORD):
+            pass
+    else:
+        repository.load_data(PASSWORD)
+
+    elapsed = time.perf_counter() - start
+    print(f"{phase:<12} {elapsed:7.1f} s  peak {peak_rss_mb():7.0f} MB  above start {peak_rss_mb() - baseline:7.0f} MB  "
+          f"file {os.path.getsize(path) / 1024 / 1024:6.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=500)
+    parser.add_argument("--phase", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.phase:
+        run_phase(args.phase, args.path, args.size_mb)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        token_path = os.path.join(tmp, "token.json")
+        stream_path = os.path.join(tmp, "stream.json")
+
+        for phase, path in (("save-token", token_path), ("load-token", token_path),
+                            ("save-stream", stream_path), ("load-stream", stream_path), ("scan-stream", stream_path)):
+            subprocess.run([sys.executable, __file__, "--phase", phase, "--path", path, "--size-mb", str(args.size_mb)], check=True)
+
+
+if __name__ == "__main__":
+    main()
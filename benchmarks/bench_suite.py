@@ -0,0 +1,276 @@
+"""
+Benchmark suite for the vault hot paths on deterministic synthetic vaults.
+
+Measures load_data, saving after a change (_save_credentials), search_credentials,
+change_master_password and get_parsed_logs at each vault size, plus the key derivation
+on its own. Time spent deriving keys is taken out of every path and reported separately
+as kdf_ms, so the percentiles show the work that changes with the vault.
+
+    python benchmarks/bench_suite.py --sizes 1k,10k,100k,1m --output results.json
+    python benchmarks/bench_suite.py --sizes 1k,10k --compare baseline.json
+    python benchmarks/bench_suite.py --results results.json --compare baseline.json
+
+With --compare, a path whose p50 grew by more than --threshold (default 15%) and by more
+than --min-delta-ms over the baseline is flagged as a regression, and the exit status is 1.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from vault.app import create_repository
+from vault.services.audit_service import AuditService
+from vault.services.vault_service import VaultService
+from vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "BenchmarkPassword1!"
+NEW_PASSWORD = "BenchmarkPassword2!"
+WORDS = ["github", "gitlab", "netflix", "amazon", "aws", "bank", "mail", "google", "outlook", "shop",
+         "spotify", "slack", "jira", "dropbox", "paypal", "steam", "adobe", "zoom", "linkedin", "reddit"]
+ACTIONS = ["LOGIN_SUCCESS", "RETRIEVE", "SEARCH", "VIEW_ALL", "ADD", "UPDATE", "DELETE"]
+
+
+class TimedKdfEncryptor(FernetDataEncryptor):
+    """
+    Records how long key derivation takes, so it can be separated from the rest of a path.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.kdf_seconds = 0.0
+
+    def derive_key(self, password: str, salt: bytes, params: dict | None = None) -> bytes:
+        start = time.perf_counter()
+        try:
+            return super().derive_key(password, salt, params)
+        finally:
+            self.kdf_seconds += time.perf_counter() - start
+
+
+def parse_size(value: str) -> int:
+    value = value.strip().lower()
+    multiplier = {"k": 1000, "m": 1000000}.get(value[-1:], 1)
+    return int(value.rstrip("km")) * multiplier
+
+
+def size_label(size: int) -> str:
+    if size >= 1000000 and size % 1000000 == 0:
+        return f"{size // 1000000}m"
+    if size >= 1000 and size % 1000 == 0:
+        return f"{size // 1000}k"
+    return str(size)
+
+
+def make_records(count: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
+    records = {}
+
+    while len(records) < count:
+        suffix = "".join(rng.choices(string.ascii_lowercase + string.digits, k=rng.randint(4, 10)))
+        name = f"{rng.choice(WORDS)}-{suffix}"
+        records[name.lower()] = {"service_name": name,
+                                 "username": f"user{rng.randrange(count)}@example.com",
+                                 "password": "".join(rng.choices(alphabet, k=rng.randint(12, 24)))}
+
+    return records
+
+
+def make_queries(records: dict, seed: int, count: int = 50) -> list[str]:
+    rng = random.Random(seed + 1)
+    names = [record["service_name"] for record in rng.sample(list(records.values()), min(count, len(records)))]
+    # Half exact names, half with a dropped character, as users mistype them.
+    return [name if i % 2 else name[:len(name) // 2] + name[len(name) // 2 + 1:] for i, name in enumerate(names)]
+
+
+def write_audit_log(data_dir: str, count: int, seed: int):
+    rng = random.Random(seed + 2)
+    with open(os.path.join(data_dir, "audit.log"), "w") as f:
+        for start in range(0, count, 10000):
+            f.write("".join(
+                f"[2024-{1 + n // 300000 % 12:02d}-{1 + n // 10000 % 28:02d} 12:{n // 60 % 60:02d}:{n % 60:02d}] "
+                f"{rng.choice(ACTIONS)}: Copied password for: {rng.choice(WORDS)}-{n % 5000}\n"
+                for n in range(start, min(start + 10000, count))
+            ))
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(action, encryptor: TimedKdfEncryptor, min_time: float, max_iterations: int, min_iterations: int = 3) -> dict:
+    samples, kdf = [], []
+    started = time.perf_counter()
+
+    for i in range(max_iterations):
+        encryptor.kdf_seconds = 0.0
+        start = time.perf_counter()
+        action(i)
+        elapsed = time.perf_counter() - start
+
+        kdf.append(encryptor.kdf_seconds)
+        samples.append(elapsed - encryptor.kdf_seconds)
+
+        if i + 1 >= min_iterations and time.perf_counter() - started >= min_time:
+            break
+
+    total = sum(samples)
+    return {
+        "iterations": len(samples),
+        "ops_per_sec": len(samples) / total if total else None,
+        "mean_ms": total / len(samples) * 1000,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p90_ms": percentile(samples, 0.90) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "kdf_ms": sum(kdf) / len(kdf) * 1000,
+    }
+
+
+def run_size(size: int, args) -> list[dict]:
+    results = []
+
+    def record(case: str, stats: dict):
+        results.append({"case": case, "size": size, **stats})
+        print(f"{case:<24} {size_label(size):>5}  {stats['iterations']:5d} runs  "
+              f"p50 {stats['p50_ms']:10.3f} ms  p90 {stats['p90_ms']:10.3f} ms  p99 {stats['p99_ms']:10.3f} ms  "
+              f"kdf {stats['kdf_ms']:8.1f} ms", flush=True)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        encryptor = TimedKdfEncryptor()
+        vault_path = os.path.join(data_dir, "credentials.json")
+        records = make_records(size, args.seed)
+
+        def open_repository():
+            return create_repository(args.repository, vault_path, encryptor, args.vault_format, args.compression)
+
+        open_repository().save_data(records, PASSWORD)
+        queries = make_queries(records, args.seed)
+        del records
+
+        record("load_data", measure(lambda i: open_repository().load_data(PASSWORD), encryptor,
+                                    args.min_time, args.max_iterations))
+
+        service = VaultService(open_repository(), PASSWORD)
+        keys = list(service.credentials)[:args.max_iterations]
+
+        def save(i):
+            key = keys[i % len(keys)]
+            service.credentials[key].password = f"changed-{i}"
+            service._save_credentials([key])
+
+        record("save_credentials", measure(save, encryptor, args.min_time, args.max_iterations))
+
+        service.search_index
+        record("search_credentials", measure(lambda i: service.search_credentials(queries[i % len(queries)]), encryptor,
+                                             args.min_time, args.max_iterations * 10))
+
+        passwords = [PASSWORD, NEW_PASSWORD]
+
+        def rotate(i):
+            service.change_master_password(passwords[(i + 1) % 2])
+
+        record("change_master_password", measure(rotate, encryptor, args.min_time, args.max_iterations))
+        service.flush()
+
+        write_audit_log(data_dir, size, args.seed)
+        audit = AuditService(data_dir)
+        record("get_parsed_logs", measure(lambda i: audit.get_parsed_logs(20), encryptor,
+                                          args.min_time, args.max_iterations * 10))
+        audit.close()
+
+    return results
+
+
+def run_kdf(args) -> dict:
+    encryptor = TimedKdfEncryptor()
+    stats = measure(lambda i: encryptor.derive_key(PASSWORD, os.urandom(16)), encryptor, args.min_time, args.max_iterations)
+
+    # Here the derivation is the whole operation, so report it as the path's latency.
+    stats.update(p50_ms=stats["kdf_ms"], p90_ms=stats["kdf_ms"], p99_ms=stats["kdf_ms"], mean_ms=stats["kdf_ms"],
+                 ops_per_sec=1000 / stats["kdf_ms"])
+    print(f"{'kdf':<24} {'-':>5}  {stats['iterations']:5d} runs  p50 {stats['p50_ms']:10.3f} ms", flush=True)
+    return {"case": "kdf", "size": 0, **stats}
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    previous = {(item["case"], item["size"]): item for item in baseline["results"]}
+    regressions = []
+
+    print(f"\n{'case':<24} {'size':>5}  {'baseline p50':>14}  {'current p50':>14}  change")
+    for item in current["results"]:
+        before = previous.get((item["case"], item["size"]))
+        if before is None or not before["p50_ms"]:
+            continue
+
+        change = item["p50_ms"] / before["p50_ms"] - 1
+        flag = ""
+        if change > threshold and item["p50_ms"] - before["p50_ms"] > min_delta_ms:
+            flag = "  REGRESSION"
+            regressions.append(f"{item['case']}@{size_label(item['size'])}")
+
+        print(f"{item['case']:<24} {size_label(item['size']) if item['size'] else '-':>5}  "
+              f"{before['p50_ms']:11.3f} ms  {item['p50_ms']:11.3f} ms  {change:+7.1%}{flag}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k,10k,100k,1m", help="Comma separated vault sizes (default: 1k,10k,100k,1m).")
+    parser.add_argument("--repository", default="json", choices=("json", "journal", "sqlite"))
+    parser.add_argument("--vault-format", default="jsonl", choices=("jsonl", "binary"))
+    parser.add_argument("--compression", default="none")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to keep repeating each path (default: 1).")
+    parser.add_argument("--max-iterations", type=int, default=50)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--results", help="Compare this results file instead of running the suite.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Flag regressions against a stored results file.")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed p50 slowdown before flagging (default: 0.15).")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore p50 slowdowns smaller than this, which are noise (default: 1).")
+    args = parser.parse_args()
+
+    if args.results:
+        with open(args.results) as f:
+            current = json.load(f)
+    else:
+        current = {
+            "meta": {
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "seed": args.seed,
+                "repository": args.repository,
+                "vault_format": args.vault_format,
+                "compression": args.compression,
+            },
+            "results": [run_kdf(args)],
+        }
+        for size in map(parse_size, args.sizes.split(",")):
+            current["results"].extend(run_size(size, args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(current, json.load(f), args.threshold, args.min_delta_ms)
+
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
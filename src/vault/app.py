@@ -1,52 +1,124 @@
+from __future__ import annotations
+
 import os
 import sys
 import argparse
 import shlex
 import time
+import datetime
+from typing import TYPE_CHECKING
 
-from .utils.encryptors import FernetDataEncryptor, Pbkdf2PasswordHasher
 from .utils.password_validator import PasswordStrength
 from .utils.clipboard import SystemClipboard
-from .views.console_view import ConsoleView
 
 from .repositories.file_master_hash_repository import FileMasterHashRepository
-from .repositories.json_repository import JsonRepository
 from .services.authentication_service import AuthenticationService
-from .services.vault_service import VaultService
 from .services.configuration_service import ConfigurationService
 from .services.credential_input_service import CredentialInputService
 from .services.vault_transfer_service import VaultTransferService
 from .services.audit_service import AuditService
+from .interfaces.vault_service_interface import IVaultService
+from .services.agent_client import AgentClient, AgentVaultService
 
 from .controllers.vault_controller import VaultController
 from .controllers.authentication_controller import AuthenticationController
+from .controllers.agent_controller import AgentController
+from .controllers.generator_controller import GeneratorController
+from .controllers.kdf_controller import KdfController
+
+if TYPE_CHECKING:
+    from .utils.encryptors import FernetDataEncryptor, Pbkdf2PasswordHasher
+    from .views.console_view import ConsoleView
+    from .interfaces.vault_repository_interface import IVaultRepository
+    from .services.metrics_service import MetricsService
+
+# cryptography, thefuzz and rich are only imported on the paths that use them,
+# so 'help' and 'generate' start without loading them.
 
 def ensure_data_directory(data_dir: str):
     os.makedirs(data_dir, exist_ok=True)
 
-def setup_tools() -> tuple[FernetDataEncryptor, Pbkdf2PasswordHasher, SystemClipboard, ConsoleView, PasswordStrength]:
-    encryptor = FernetDataEncryptor()
-    hasher = Pbkdf2PasswordHasher()
+def setup_view() -> ConsoleView:
+    from .views.console_view import ConsoleView
+    return ConsoleView()
+
+def setup_plain_view() -> ConsoleView:
+    from .views.console_view import PlainConsoleView
+    return PlainConsoleView()
+
+def setup_tools(kdf: dict | None = None) -> tuple[FernetDataEncryptor, Pbkdf2PasswordHasher, SystemClipboard, ConsoleView, PasswordStrength]:
+    from .utils.encryptors import FernetDataEncryptor, Pbkdf2PasswordHasher
+
+    encryptor = FernetDataEncryptor(kdf)
+    hasher = Pbkdf2PasswordHasher(kdf)
     clipboard = SystemClipboard()
-    view = ConsoleView()
+    view = setup_view()
     validator = PasswordStrength()  
     return encryptor, hasher, clipboard, view, validator
 
-def setup_services(hash_file: str, config_file: str, data_dir: str, hasher: Pbkdf2PasswordHasher) -> tuple[AuthenticationService, ConfigurationService, AuditService]:
+def setup_services(hash_file: str, data_dir: str, hasher: Pbkdf2PasswordHasher) -> tuple[AuthenticationService, AuditService]:
     hash_repo = FileMasterHashRepository(hash_file)
     auth_service = AuthenticationService(repo=hash_repo, hasher=hasher)
-    config_service = ConfigurationService(config_file, data_dir) 
     audit_service = AuditService(data_dir)
     
-    return auth_service, config_service, audit_service
+    return auth_service, audit_service
+
+def setup_metrics(config_service: ConfigurationService, audit_service: AuditService) -> MetricsService | None:
+    metrics_file = config_service.get_metrics_file()
+    if not metrics_file:
+        return None
+
+    from .services.metrics_service import MetricsService
+    from .utils.profiling import profiler
+
+    metrics = MetricsService(os.path.expanduser(metrics_file))
+    metrics.attach(audit_service, profiler)
+    return metrics
+
+def record_vault_metrics(metrics: MetricsService | None, vault_path: str, vault_service: IVaultService):
+    if metrics is not None:
+        metrics.record_vault(vault_path, vault_service.count_credentials())
+
+def create_repository(repository_type: str, vault_path: str, encryptor: FernetDataEncryptor,
+                      vault_format: str = "jsonl", compression: str = "none",
+                      durability: str = "strict") -> IVaultRepository:
+    from .utils.compression import get_codec
+    from .utils.migrators import EnvelopeFormatMigrator
+    from .utils.serializers import get_serializer
+    from .repositories.json_repository import JsonRepository
+    from .repositories.journaled_repository import JournaledJsonRepository
+
+    serializer = get_serializer(vault_format)
+    codec = get_codec(compression)
+    migrator = EnvelopeFormatMigrator(encryptor, serializer, codec)
+
+    if repository_type == "sqlite":
+        from .repositories.sqlite_repository import SqliteRepository
+
+        legacy = JournaledJsonRepository(vault_path, encryptor, migrator, serializer=serializer, codec=codec,
+                                         durability=durability)
+        return SqliteRepository(os.path.splitext(vault_path)[0] + SqliteRepository.FILE_EXTENSION, encryptor, migrator, legacy)
+
+    if repository_type == "journal":
+        return JournaledJsonRepository(vault_path, encryptor, migrator, serializer=serializer, codec=codec,
+                                       durability=durability)
+
+    return JsonRepository(vault_path, encryptor, migrator, serializer, codec, durability)
 
 def bootstrap_controllers(auth_service: AuthenticationService, config_service: ConfigurationService, audit_service: AuditService,
                           view: ConsoleView, encryptor: FernetDataEncryptor, clipboard: SystemClipboard, 
-                          validator: PasswordStrength, user_password: str, vault_path: str) -> VaultController:
+                          validator: PasswordStrength, user_password: str, vault_path: str,
+                          vault_service: IVaultService = None) -> VaultController:
     """Construct repositories, services, and controllers with their dependencies."""
     
-    repository = JsonRepository(vault_path, encryptor)
-    vault_service = VaultService(repository, user_password)
+    if vault_service is None:
+        from .services.vault_service import VaultService
+
+        repository = create_repository(config_service.get_repository_type(), vault_path, encryptor,
+                                       config_service.get_vault_format(), config_service.get_compression(),
+                                       config_service.get_durability())
+        vault_service = VaultService(repository, user_password)
+
     credential_input_service = CredentialInputService(io=view, password_validator=validator)
     transfer_service = VaultTransferService(vault_service)
 
@@ -63,37 +135,87 @@ def bootstrap_controllers(auth_service: AuthenticationService, config_service: C
 
     return vault_controller
 
+def audit_date(value: str) -> str:
+    try:
+        return datetime.date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', expected YYYY-MM-DD")
+
+def export_fields(value: str) -> list[str]:
+    from .utils.export_writers import FIELDS
+
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in FIELDS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown field '{unknown[0]}', expected one of {', '.join(FIELDS)}")
+    return fields
+
 def create_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="A command-line credential vault.")
     
     subparsers = parser.add_subparsers(dest="command", required=False, help="Action to perform.")
 
+    add_parser = subparsers.add_parser('add', help='Add a new credential.')
+    add_parser.add_argument('service', type=str, nargs='?', help='The service.')
+    add_parser.add_argument('--from-file', type=str, metavar='FILEPATH', help='Add every credential in a JSON file, saving once.')
+
     subcommands = [
-        ('add', 'Add a new credential.', 'service'),
         ('get', 'Get password for a service.', 'service'),
-        ('delete', 'Delete a credential.', 'service'),
         ('update', 'Update a credential.', 'service'),
         ('search', 'Search for credentials.', 'query'),
         ('switch', 'Switch the active vault.', 'vault_name'),
-        ('export', 'Export decrypted vault to JSON.', 'filepath'),
-        ('import', 'Import credentials from JSON.', 'filepath'),
+        ('export', 'Export decrypted vault to JSON, NDJSON or CSV.', 'filepath'),
+        ('import', 'Import credentials from JSON, NDJSON or CSV.', 'filepath'),
     ]
 
     for cmd, help_text, arg_name in subcommands:
         sp = subparsers.add_parser(cmd, help=help_text)
         sp.add_argument(arg_name, type=str, help=f"The {arg_name}.")
 
-    subparsers.add_parser('audit', help='View audit logs.')
+    delete_parser = subparsers.add_parser('delete', help='Delete one or more credentials.')
+    delete_parser.add_argument('service', type=str, nargs='+', help='The services, deleted with a single save.')
+
+    audit_parser = subparsers.add_parser('audit', help='View audit logs.')
+    audit_parser.add_argument('--action', type=str, help='Only show this action (e.g. RETRIEVE).')
+    audit_parser.add_argument('--since', type=audit_date, metavar='YYYY-MM-DD', help='Only show entries on or after this day.')
+    audit_parser.add_argument('--until', type=audit_date, metavar='YYYY-MM-DD', help='Only show entries on or before this day.')
+    audit_parser.add_argument('--contains', type=str, help='Only show entries whose details contain this text.')
     subparsers.add_parser('view', help='View all credentials.')
     subparsers.add_parser('passwd', help='Change the master password.')
     subparsers.add_parser('help', help='Show this help message.')
 
+    search_parser = subparsers.choices['search']
+    search_parser.add_argument('--limit', type=int, default=20, help='Maximum number of results, best first (default: 20, 0 for all).')
+    search_parser.add_argument('--offset', type=int, default=0, help='Number of results to skip, for paging (default: 0).')
+    search_parser.add_argument('--min-score', type=int, default=61, help='Minimum match score from 0 to 100 (default: 61).')
+
+    export_parser = subparsers.choices['export']
+    export_parser.add_argument('--format', choices=('json', 'ndjson', 'csv'), default=None, help='File format (default: from the file extension).')
+    export_parser.add_argument('--fields', type=export_fields, default=None, metavar='FIELD,...', help='Only export these fields (service_name, username, password).')
+
+    import_parser = subparsers.choices['import']
+    import_parser.add_argument('--format', choices=('json', 'ndjson', 'csv'), default=None, help='File format (default: from the file extension).')
+    import_parser.add_argument('--dry-run', action='store_true', help='Report counts and conflicts without changing the vault.')
+
+    agent_parser = subparsers.add_parser('agent', help='Keep vaults unlocked for one-shot commands.')
+    agent_parser.add_argument('--ttl', type=int, default=None, help='Seconds before the agent locks and exits (default: agent_ttl from config, 900).')
+    agent_parser.add_argument('--foreground', action='store_true', help='Run the agent in the foreground instead of detaching.')
+    agent_parser.add_argument('--stop', action='store_true', help='Stop a running agent.')
+    agent_parser.add_argument('--status', action='store_true', help='Show whether an agent is running.')
+
+    kdf_parser = subparsers.add_parser('kdf', help='Show or calibrate the key derivation settings.')
+    kdf_parser.add_argument('action', choices=('show', 'calibrate'), nargs='?', default='show', help='show (default) or calibrate.')
+    kdf_parser.add_argument('--algorithm', choices=('pbkdf2-sha256', 'scrypt'), default='pbkdf2-sha256', help='KDF to calibrate (default: pbkdf2-sha256).')
+    kdf_parser.add_argument('--target-ms', type=int, default=500, help='Unlock time to aim for on this machine (default: 500).')
+
     gen_parser = subparsers.add_parser('generate', help='Generate a secure password.')
     gen_parser.add_argument('-l', '--length', type=int, default=16, help='Length of password (default: 16).')
     gen_parser.add_argument('--no-symbols', action='store_true', help='Exclude special characters.')
     gen_parser.add_argument('--no-numbers', action='store_true', help='Exclude numbers.')
     
     parser.add_argument('-f', '--file', type=str, metavar='FILEPATH', help='Specify a custom vault file path.')
+    parser.add_argument('--profile', action='store_true', help='Print how long each phase of the command took.')
+    parser.add_argument('--profile-dump', type=str, metavar='FILEPATH', help='Also write cProfile stats (pstats) for the command to this file.')
     return parser
 
 def resolve_export_path(filename: str, downloads_dir: str):
@@ -108,39 +230,102 @@ def route_command(args, vault_controller: VaultController, parser: argparse.Argu
         return
     
     if args.command == 'add':
-        vault_controller.add_entry(args.service)
+        if args.from_file:
+            vault_controller.add_entries_from_file(args.from_file)
+        elif args.service:
+            vault_controller.add_entry(args.service)
+        else:
+            vault_controller.io.show_error("Specify a service name or --from-file.")
     elif args.command == 'view':
         vault_controller.view_all_entries()
     elif args.command == 'get':
         vault_controller.get_entry(args.service)
     elif args.command == 'delete':
-        vault_controller.delete_entry(args.service)
+        if len(args.service) == 1:
+            vault_controller.delete_entry(args.service[0])
+        else:
+            vault_controller.delete_entries(args.service)
     elif args.command == 'update':
         vault_controller.update_entry(args.service)
     elif args.command == 'search':
-        vault_controller.find_entry(args.query)
+        limit = args.limit if args.limit > 0 else None
+        vault_controller.find_entry(args.query, limit=limit, offset=max(args.offset, 0), min_score=args.min_score)
     elif args.command == 'switch':
         vault_controller.switch_active_vault(args.vault_name)
     elif args.command == 'passwd':
         vault_controller.change_password()
     elif args.command == 'export':
         path = resolve_export_path(args.filepath, downloads_dir)
-        vault_controller.export_vault(path) 
+        vault_controller.export_vault(path, args.format, args.fields)
     elif args.command == 'import':
-        vault_controller.import_vault(args.filepath)
+        vault_controller.import_vault(args.filepath, args.format, args.dry_run)
     elif args.command == 'audit':
-        vault_controller.show_audit_logs()
+        if any((args.action, args.since, args.until, args.contains)):
+            vault_controller.query_audit_logs(args.action, args.since, args.until, args.contains)
+        else:
+            vault_controller.show_audit_logs()
     elif args.command == 'generate':
         vault_controller.generate_password(args.length, args.no_symbols, args.no_numbers)
+    elif args.command == 'agent':
+        vault_controller.io.show_info("The unlock agent is managed from your shell: run 'vault agent'.")
+    elif args.command == 'kdf':
+        vault_controller.io.show_info("Key derivation is managed from your shell: run 'vault kdf'.")
 
 
 
 
 
+def run_agent_command(args, auth_controller: AuthenticationController, agent_controller: AgentController,
+                      config_service: ConfigurationService, encryptor: FernetDataEncryptor, view: ConsoleView, socket_path: str):
+    if not agent_controller.is_supported():
+        view.show_error("The unlock agent is not supported on this platform.")
+        sys.exit(1)
+
+    if args.stop:
+        agent_controller.stop()
+        return
+
+    if args.status:
+        agent_controller.status()
+        return
+
+    if agent_controller.client.is_running():
+        view.show_warning("The unlock agent is already running.")
+        return
+
+    user_password = auth_controller.authenticate_user()
+    if not user_password:
+        sys.exit(1)
+
+    from .services.agent_server import VaultAgent
+    from .services.vault_service import VaultService
+
+    repository_type = config_service.get_repository_type()
+    vault_format = config_service.get_vault_format()
+    compression = config_service.get_compression()
+    durability = config_service.get_durability()
+    agent = VaultAgent(
+        socket_path=socket_path,
+        password=user_password,
+        service_factory=lambda path, password: VaultService(create_repository(repository_type, path, encryptor, vault_format, compression, durability), password),
+        ttl=args.ttl if args.ttl is not None else config_service.get_agent_ttl()
+    )
+
+    agent_controller.start(agent, foreground=args.foreground)
+
+
+
 # -------------------------------
 # Interactive Shell
 # -------------------------------
 def run_interactive_shell(controller: VaultController, view: ConsoleView, parser: argparse.ArgumentParser, downloads_dir: str):
+    try:
+        return _run_shell_loop(controller, view, parser, downloads_dir)
+    finally:
+        # Saves may still be pending under the batched or deferred durability modes.
+        controller.service.flush()
+
+def _run_shell_loop(controller: VaultController, view: ConsoleView, parser: argparse.ArgumentParser, downloads_dir: str):
     vault_name = controller.get_vault_name()
     view.show_header(f"{vault_name} [Session Active]")
     view.show_info("Type 'help' for commands, 'exit' to quit.")
@@ -150,6 +335,7 @@ def run_interactive_shell(controller: VaultController, view: ConsoleView, parser
 
     while True:
         try:
+            controller.report_write_error()
             user_input = view.get_input(f"vault({vault_name}) > ").strip()
             
             current_time = time.time()
@@ -190,28 +376,90 @@ def run_interactive_shell(controller: VaultController, view: ConsoleView, parser
 # Main Run Function
 # -------------------------------
 def run():
+    parser = create_parser()
+
+    if len(sys.argv) == 1:
+        _run(parser, None)
+        return
+
+    args = parser.parse_args()
+    if not (args.profile or args.profile_dump):
+        _run(parser, args)
+        return
+
+    from .utils.profiling import profile_command, profiler
+
+    try:
+        with profile_command(args.profile_dump):
+            _run(parser, args)
+    finally:
+        sys.stderr.write("\n" + "\n".join(profiler.report()) + "\n")
+        if args.profile_dump:
+            sys.stderr.write(f"cProfile stats written to {args.profile_dump}\n")
+
+def _run(parser: argparse.ArgumentParser, args):
     HOME_DIR = os.path.expanduser("~")
     DATA_DIR = os.path.join(HOME_DIR, '.credential_vault')
     DOWNLOADS_DIR = os.path.join(HOME_DIR, "Downloads")
     HASH_FILE = os.path.join(DATA_DIR, 'master.hash')
     CONFIG_FILE = os.path.join(DATA_DIR, 'config.json')
+    AGENT_SOCKET = os.path.join(DATA_DIR, 'agent.sock')
 
-    ensure_data_directory(DATA_DIR)
+    interactive_mode = args is None
 
-    encryptor, hasher, clipboard, view, validator = setup_tools()
-    auth_service, config_service, audit_service = setup_services(HASH_FILE, CONFIG_FILE, DATA_DIR, hasher)
+    if not interactive_mode and args.command in (None, 'help'):
+        parser.print_help()
+        return
 
-    parser = create_parser()
+    ensure_data_directory(DATA_DIR)
 
-    if len(sys.argv) == 1:
-        interactive_mode = True
-        args = None
-    else:
-        interactive_mode = False
-        args = parser.parse_args()
+    if not interactive_mode and args.command == 'generate':
+        generator = GeneratorController(setup_plain_view(), SystemClipboard(), AuditService(DATA_DIR))
+        generator.generate_password(args.length, args.no_symbols, args.no_numbers)
+        return
+
+    if not interactive_mode and args.command == 'kdf':
+        kdf_controller = KdfController(setup_view(), ConfigurationService(CONFIG_FILE, DATA_DIR), AuditService(DATA_DIR))
+        if args.action == 'calibrate':
+            kdf_controller.calibrate(args.algorithm, max(args.target_ms, 1))
+        else:
+            kdf_controller.show()
+        return
 
+    config_service = ConfigurationService(CONFIG_FILE, DATA_DIR)
+    encryptor, hasher, clipboard, view, validator = setup_tools(config_service.get_kdf())
+    auth_service, audit_service = setup_services(HASH_FILE, DATA_DIR, hasher)
+    metrics = setup_metrics(config_service, audit_service)
 
     auth_controller = AuthenticationController(auth_service, view, config_service, audit_service)
+    agent_client = AgentClient(AGENT_SOCKET)
+
+    if not interactive_mode and args.command == 'agent':
+        agent_controller = AgentController(agent_client, view, audit_service)
+        run_agent_command(args, auth_controller, agent_controller, config_service, encryptor, view, AGENT_SOCKET)
+        return
+
+    if not interactive_mode and agent_client.is_running():
+        vault_path = os.path.abspath(args.file) if args.file else config_service.get_active_vault()
+
+        vault_controller = bootstrap_controllers(
+            auth_service=auth_service,
+            config_service=config_service,
+            audit_service=audit_service,
+            view=view,
+            encryptor=encryptor,
+            clipboard=clipboard,
+            validator=validator,
+            user_password=None,
+            vault_path=vault_path,
+            vault_service=AgentVaultService(agent_client, vault_path)
+        )
+
+        route_command(args, vault_controller, parser, DOWNLOADS_DIR)
+        vault_controller.report_write_error()
+        record_vault_metrics(metrics, vault_path, vault_controller.service)
+        return
+
     user_password = auth_controller.authenticate_user()
     if not user_password:
         sys.exit(1)
@@ -233,6 +481,7 @@ def run():
             )
 
             should_continue = run_interactive_shell(vault_controller, view, parser, DOWNLOADS_DIR)
+            record_vault_metrics(metrics, vault_path, vault_controller.service)
             
             user_password = vault_controller.service.password
             
@@ -254,7 +503,12 @@ def run():
             vault_path=vault_path
         )
         
-        route_command(args, vault_controller, parser, DOWNLOADS_DIR)
+        try:
+            route_command(args, vault_controller, parser, DOWNLOADS_DIR)
+        finally:
+            vault_controller.service.flush()
+
+        record_vault_metrics(metrics, vault_path, vault_controller.service)
 
 if __name__ == "__main__":
     run()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import sys
+from typing import TYPE_CHECKING
+from ..interfaces.user_io_interface import IUserIO
+from ..services.audit_service import AuditService
+from ..services.agent_client import AgentClient
+
+if TYPE_CHECKING:
+    from ..services.agent_server import VaultAgent
+
+
+class AgentController:
+    """
+    Starts, stops and reports on the local unlock agent.
+    The agent runs in a detached child process unless it is started in the foreground.
+    """
+
+
+    def __init__(self, client: AgentClient, io: IUserIO, audit_service: AuditService):
+        self.client = client
+        self.io = io
+        self.audit = audit_service
+
+    @staticmethod
+    def is_supported() -> bool:
+        return hasattr(os, "fork") and hasattr(os, "setsid") and sys.platform != "win32"
+
+    def start(self, agent: VaultAgent, foreground: bool = False):
+        if self.client.is_running():
+            self.io.show_warning("The unlock agent is already running.")
+            return
+
+        self.audit.log_event("AGENT_START", f"Unlock agent started (ttl={agent.ttl}s)")
+
+        if foreground:
+            self.io.show_success(f"Unlock agent listening on {agent.socket_path} for {agent.ttl} seconds.")
+            agent.serve()
+            self.io.show_info("Unlock agent stopped.")
+            return
+
+        pid = os.fork()
+        if pid > 0:
+            self.io.show_success(f"Unlock agent started (pid {pid}) for {agent.ttl} seconds.")
+            return
+
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+
+        try:
+            agent.serve()
+        finally:
+            os._exit(0)
+
+    def stop(self):
+        if self.client.stop():
+            self.audit.log_event("AGENT_STOP", "Unlock agent stopped")
+            self.io.show_success("Unlock agent stopped.")
+        else:
+            self.io.show_info("The unlock agent is not running.")
+
+    def status(self):
+        status = self.client.status()
+
+        if status is None:
+            self.io.show_info("The unlock agent is not running.")
+        else:
+            self.io.show_info(f"Unlock agent running (pid {status['pid']}), locks in {status['expires_in']} seconds.")
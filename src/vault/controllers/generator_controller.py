@@ -0,0 +1,34 @@
+from ..interfaces.user_io_interface import IUserIO, IClipboard
+from ..services.audit_service import AuditService
+from ..utils.password_generator import PasswordGenerator
+
+
+class GeneratorController:
+    """
+    Generates random passwords and copies them to the clipboard.
+    Needs no unlocked vault, so the CLI can serve it without authentication.
+    """
+
+
+    def __init__(self, io: IUserIO, clipboard: IClipboard, audit_service: AuditService):
+        self.io = io
+        self.clipboard = clipboard
+        self.audit = audit_service
+
+    def generate_password(self, length: int, no_symbols: bool, no_numbers: bool):
+        self.io.show_header("Password Generator")
+
+        use_symbols = not no_symbols
+        use_numbers = not no_numbers
+
+        password = PasswordGenerator.generate(length, use_symbols, use_numbers)
+
+        self.io.line_break()
+        self.io.show_message(f"Generated Password ({length} chars):")
+        self.io.show_success(f"  {password}  ") 
+        self.io.line_break()
+
+        self.clipboard.copy_to_clipboard(password)
+        self.io.show_info("Password has been copied to clipboard!")
+
+        self.audit.log_event("GENERATE", f"Generated password (len={length})")    
@@ -0,0 +1,41 @@
+from ..interfaces.user_io_interface import IUserIO
+from ..services.audit_service import AuditService
+from ..services.configuration_service import ConfigurationService
+from ..utils.kdf import MIN_CALIBRATED, PBKDF2, calibrate, format_params, measure, normalise_kdf
+
+
+class KdfController:
+    """
+    Shows and calibrates the key derivation settings used for new hashes and vault saves.
+    Needs no unlocked vault: existing files record their own settings and pick up the
+    configured ones when they are next written.
+    """
+
+
+    def __init__(self, io: IUserIO, config_service: ConfigurationService, audit_service: AuditService):
+        self.io = io
+        self.config = config_service
+        self.audit = audit_service
+
+    def show(self):
+        params = normalise_kdf(self.config.get_kdf())
+        self.io.show_info(f"Key derivation: {params['kdf']} ({format_params(params)})")
+
+    def calibrate(self, algorithm: str, target_ms: int):
+        self.io.show_info(f"Timing {algorithm} on this machine...")
+
+        # Unlocking derives twice with these settings: once to check the master hash, once for the vault key.
+        params = calibrate(algorithm, target_ms / 1000 / 2)
+
+        if not self.config.set_kdf(params):
+            self.io.show_error("Could not save the key derivation settings.")
+            return
+
+        unlock_ms = round(measure(params) * 2 * 1000)
+        self.io.show_success(f"Key derivation set to {params['kdf']} ({format_params(params)}), about {unlock_ms} ms per unlock.")
+
+        floor = MIN_CALIBRATED[params['kdf']]
+        if params["iterations" if params['kdf'] == PBKDF2 else "n"] == floor and unlock_ms > target_ms:
+            self.io.show_warning(f"This machine cannot reach {target_ms} ms: calibration never goes below the default cost ({floor}).")
+        self.io.show_info("The master hash is upgraded at your next login and each vault on its next save.")
+        self.audit.log_event("KDF_CALIBRATE", f"{params['kdf']} {format_params(params)}")
@@ -1,13 +1,13 @@
 import os
 from ..models.credential import Credential
-from ..services.vault_service import IVaultService
+from ..interfaces.vault_service_interface import IVaultService
 from ..services.configuration_service import ConfigurationService
 from ..services.authentication_service import AuthenticationService
 from ..interfaces.user_io_interface import IUserIO, IClipboard
 from ..services.credential_input_service import CredentialInputService
 from ..services.vault_transfer_service import VaultTransferService
 from ..services.audit_service import AuditService
-from ..utils.password_generator import PasswordGenerator
+from .generator_controller import GeneratorController
 
 class VaultController:
     """
@@ -33,12 +33,19 @@ class VaultController:
         self.transfer = transfer_service
         self.credential_input = credential_input
         self.audit = audit_service
+        self.generator = GeneratorController(io, clipboard, audit_service)
 
     def get_vault_name(self):
         full_path = self.config.get_active_vault()
         filename = os.path.basename(full_path)
 
         return os.path.splitext(filename)[0].capitalize()
+
+    def report_write_error(self):
+        error = self.service.take_write_error()
+        if error:
+            self.audit.log_event("SAVE_FAIL", f"Background save failed: {error}")
+            self.io.show_error(f"Saving the vault failed: {error}. Your changes are kept and retried on the next save or when the session ends.")
        
     def add_entry(self, service_name):
         self.io.show_header(self.get_vault_name())
@@ -54,6 +61,30 @@ class VaultController:
             self.audit.log_event("ADD_FAIL", f"Failed to add {service_name} (Duplicate)")
             self.io.show_error(f"Service {service_name} already exists.")
 
+    def add_entries_from_file(self, filepath):
+        self.io.show_header(self.get_vault_name())
+
+        if not os.path.exists(filepath):
+            self.io.show_error(f"File '{filepath}' not found.")
+            return
+
+        try:
+            credentials = self.transfer.read_credentials(filepath)
+            added = set(self.service.add_credentials(credentials))
+        except Exception as e:
+            self.audit.log_event("ADD_FAIL", f"Add from {filepath} failed: {e}")
+            self.io.show_error(f"Add failed: {e}")
+            return
+
+        for credential in credentials:
+            if credential.service_name in added:
+                self.audit.log_event("ADD", f"Added credential: {credential.service_name}")
+            else:
+                self.audit.log_event("ADD_FAIL", f"Failed to add {credential.service_name} (Duplicate)")
+                self.io.show_warning(f"Service {credential.service_name} already exists.")
+
+        self.io.show_success(f"Added {len(added)} of {len(credentials)} credentials.")
+
     def view_all_entries(self):
         self.audit.log_event("VIEW_ALL", "Viewed credential list")
         self.io.show_header(self.get_vault_name())
@@ -85,6 +116,18 @@ class VaultController:
             self.audit.log_event("DELETE_FAIL", f"Service not found: {service_name}")
             self.io.show_warning(f"Service {service_name} not found.")
 
+    def delete_entries(self, service_names):
+        self.io.show_header(self.get_vault_name())
+        deleted = set(self.service.delete_credentials(service_names))
+
+        for service_name in service_names:
+            if service_name in deleted:
+                self.audit.log_event("DELETE", f"Deleted credential: {service_name}")
+                self.io.show_success(f"Credential for {service_name} deleted.")
+            else:
+                self.audit.log_event("DELETE_FAIL", f"Service not found: {service_name}")
+                self.io.show_warning(f"Service {service_name} not found.")
+
     def update_entry(self, service_name):
         self.io.show_header(self.get_vault_name())
         if not self.service.get_credential(service_name):
@@ -107,11 +150,16 @@ class VaultController:
             self.audit.log_event("UPDATE_FAIL", f"Service not found: {service_name}")
             self.io.show_error("Update failed.")
 
-    def find_entry(self, query):
+    def find_entry(self, query, limit=None, offset=0, min_score=None):
         self.audit.log_event("SEARCH", f"Searched for: '{query}'")
         self.io.show_header(self.get_vault_name())
-        matches = self.service.search_credentials(query)
-        self.io.show_search_results(matches, query)
+
+        options = {"limit": limit, "offset": offset}
+        if min_score is not None:
+            options["min_score"] = min_score
+
+        results = self.service.rank_credentials(query, **options)
+        self.io.show_ranked_results(results, query, offset)
 
     def switch_active_vault(self, vault_name):
         new_path = self.config.set_active_vault(vault_name)
@@ -124,6 +172,9 @@ class VaultController:
     def change_password(self):
         self.io.show_header(self.get_vault_name())
 
+        if self.service.has_pending_rotation():
+            self.io.show_warning("An interrupted password change was found. Enter the same passwords to resume it.")
+
         current_pass = self.io.get_password("Enter CURRENT master password: ")
 
         if not self.auth.verify_password(current_pass):
@@ -137,17 +188,27 @@ class VaultController:
             self.io.show_error("Passwords do not match.")
             return
 
-        success_count, errors = self.service.change_master_password(new_pass)
-        self.auth.create_master_hash(new_pass)
+        try:
+            success_count, errors = self.service.change_master_password(new_pass, progress=self.io.show_progress)
+        except ValueError as e:
+            self.io.show_error(str(e))
+            return
 
         if errors:
             for error in errors:
-                self.io.show_warning(f"Skipping {error}")
+                self.io.show_warning(f"Not updated: {error}")
+
+            # The master hash and the remaining vaults keep the current password until every vault is done.
+            self.audit.log_event("MASTER_CHANGE_FAIL", f"Master password change incomplete ({len(errors)} vaults failed)")
+            self.io.show_error("Master password change incomplete. Run 'passwd' again with the same passwords to retry the remaining vaults.")
+            return
+
+        self.auth.create_master_hash(new_pass)
         
         self.audit.log_event("MASTER_CHANGE", f"Master password changed ({success_count} vaults updated)")
         self.io.show_success(f"Master password changed successfully. {success_count} vaults updated.")
 
-    def export_vault(self, filepath):
+    def export_vault(self, filepath, file_format=None, fields=None):
         self.io.show_header(self.get_vault_name())
         self.io.show_warning(f"SECURITY RISK: You are about to save unencrypted passwords to '{filepath}'.")
 
@@ -157,7 +218,7 @@ class VaultController:
             return
         
         try:
-            self.transfer.export_to_file(filepath)
+            self.transfer.export_to_file(filepath, file_format, fields, progress=self.io.show_progress)
             self.audit.log_event("EXPORT", f"Vault exported to: {filepath}")
             self.io.show_success("Vault exported successfully.")
 
@@ -165,7 +226,7 @@ class VaultController:
             self.audit.log_event("EXPORT_FAIL", f"Export error: {e}")
             self.io.show_error(f"Export failed: {e}")
 
-    def import_vault(self, filepath):
+    def import_vault(self, filepath, file_format=None, dry_run=False):
         self.io.show_header(self.get_vault_name())
         
         if not os.path.exists(filepath):
@@ -173,19 +234,27 @@ class VaultController:
             return
 
         try:
-            success, count = self.transfer.import_from_file(filepath)
-            
-            if success:
-                self.audit.log_event("IMPORT", f"Imported {count} items from {filepath}")
-                self.io.show_success(f"Successfully imported {count} credentials.")
-            else:
-                self.audit.log_event("IMPORT_FAIL", f"No valid data in {filepath}")
-                self.io.show_warning("No valid credentials found to import.")
-    
+            summary = self.transfer.import_from_file(filepath, file_format, progress=self.io.show_progress, dry_run=dry_run)
         except Exception as e:
             self.audit.log_event("IMPORT_FAIL", f"Import error: {e}")
             self.io.show_error(f"Import failed: {e}")
-    
+            if not dry_run:
+                self.io.show_info("Credentials imported before the error were kept.")
+            return
+
+        details = f"{summary.conflicts} replace existing entries, {summary.invalid} invalid records skipped"
+
+        if dry_run:
+            self.audit.log_event("IMPORT_DRY_RUN", f"Checked {filepath}: {summary.imported} importable")
+            self.io.show_info(f"Dry run: {summary.imported} credentials would be imported ({details}). Nothing was changed.")
+        elif summary.imported:
+            self.audit.log_event("IMPORT", f"Imported {summary.imported} items from {filepath}")
+            self.io.show_success(f"Successfully imported {summary.imported} credentials ({details}) "
+                                 f"in {summary.elapsed:.1f}s, {summary.rate:,.0f} records/s.")
+        else:
+            self.audit.log_event("IMPORT_FAIL", f"No valid data in {filepath}")
+            self.io.show_warning("No valid credentials found to import.")
+
     def show_audit_logs(self):
         self.audit.log_event("AUDIT_VIEW", "Accessed audit logs")
         self.io.show_header("Audit Logs")
@@ -206,24 +275,13 @@ class VaultController:
 
         logs = self.audit.get_parsed_logs(limit)
         self.io.show_audit_table(logs)
-    
-    def generate_password(self, length: int, no_symbols: bool, no_numbers: bool):
-        self.io.show_header("Password Generator")
-
-        use_symbols = not no_symbols
-        use_numbers = not no_numbers
-
-        password = PasswordGenerator.generate(length, use_symbols, use_numbers)
 
-        self.io.line_break()
-        self.io.show_message(f"Generated Password ({length} chars):")
-        self.io.show_success(f"  {password}  ") 
-        self.io.line_break()
-
-        self.clipboard.copy_to_clipboard(password)
-        self.io.show_info("Password has been copied to clipboard!")
-
-        self.audit.log_event("GENERATE", f"Generated password (len={length})")    
+    def query_audit_logs(self, action=None, since=None, until=None, contains=None):
+        self.audit.log_event("AUDIT_VIEW", "Queried audit logs")
+        self.io.show_header("Audit Logs")
 
+        logs = self.audit.query_logs(action=action, since=since, until=until, contains=contains)
+        self.io.show_audit_table(logs)
     
-    
\ No newline at end of file
+    def generate_password(self, length: int, no_symbols: bool, no_numbers: bool):
+        self.generator.generate_password(length, no_symbols, no_numbers)
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
+
+class ICompressionCodec(ABC):
+    """
+    Defines a streaming compression stage between record serialization and encryption.
+    NAME is stored in the vault header so a reader can pick the matching codec.
+    """
+
+    NAME: str
+
+    @abstractmethod
+    def compress(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        pass
+
+    @abstractmethod
+    def decompress(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        pass
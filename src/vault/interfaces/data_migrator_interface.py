@@ -3,8 +3,18 @@ from abc import ABC, abstractmethod
 class IDataMigrator(ABC):
     """
     Defines methods migrate legacy vault data to the current format.
+    needs_upgrade and upgrade work on the raw file contents, before decryption;
+    migrate works on the decrypted records.
     """
 
     @abstractmethod
     def migrate(self, data: dict) -> dict:
         pass
+
+    @abstractmethod
+    def needs_upgrade(self, raw: bytes) -> bool:
+        pass
+
+    @abstractmethod
+    def upgrade(self, raw: bytes, password: str) -> bytes:
+        pass
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import BinaryIO, Iterable, Iterator
 
 """
 Defines encryption/decryption operations and key derivation for secure vault storage.
@@ -12,9 +13,30 @@ class IDataEncryptor(ABC):
     @abstractmethod
     def decrypt(self, encrypted_data: bytes, password: str) -> str:
         pass
+
+    @abstractmethod
+    def rewrap(self, encrypted_data: bytes, old_password: str, new_password: str) -> bytes:
+        pass
+
+    @abstractmethod
+    def encrypt_stream(self, chunks: Iterable[bytes], password: str, target: BinaryIO,
+                       metadata: dict | None = None) -> None:
+        pass
+
+    @abstractmethod
+    def decrypt_stream(self, source: BinaryIO, password: str) -> Iterator[bytes]:
+        pass
+
+    @abstractmethod
+    def rewrap_stream(self, source: BinaryIO, target: BinaryIO, old_password: str, new_password: str) -> None:
+        pass
     
     @abstractmethod
-    def derive_key(self, password: str, salt: bytes) -> bytes:
+    def derive_key(self, password: str, salt: bytes, params: dict | None = None) -> bytes:
+        pass
+
+    @abstractmethod
+    def rekey(self, password: str | None = None) -> None:
         pass
 
 class IPasswordHasher(ABC):
@@ -24,4 +46,8 @@ class IPasswordHasher(ABC):
 
     @abstractmethod
     def verify_password(self, password_attempt: str, stored_hash: str) -> bool:
+        pass
+
+    @abstractmethod
+    def needs_rehash(self, stored_hash: str) -> bool:
         pass
\ No newline at end of file
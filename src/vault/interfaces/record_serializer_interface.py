@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
+
+class IRecordSerializer(ABC):
+    """
+    Defines how vault records are turned into the plaintext byte stream that gets encrypted.
+    encode yields chunks of any size and decode accepts chunks split at any point.
+    FORMAT is stored in the vault header so a reader can pick the matching serializer.
+    """
+
+    FORMAT: str
+
+    @abstractmethod
+    def encode(self, records: dict) -> Iterator[bytes]:
+        pass
+
+    @abstractmethod
+    def decode(self, chunks: Iterable[bytes]) -> Iterator[tuple[str, dict]]:
+        pass
@@ -63,8 +63,16 @@ class IUserIO(ABC):
     def show_search_results(self, matches: dict, query: str): 
         pass
 
+    @abstractmethod
+    def show_ranked_results(self, results: list, query: str, offset: int = 0):
+        pass
+
     @abstractmethod
     def show_password_strength(self, formatted_score: str): 
         pass
 
+    @abstractmethod
+    def show_progress(self, completed: int, total: int, label: str = ""):
+        pass
+
 
@@ -4,6 +4,11 @@ class IVaultRepository(ABC):
     """
     Defines the contract for data repositories.
     Specifies methods to load, save, and rotate encryption of vault data.
+    load_data returns a CredentialMap; save_data takes plain record dicts.
+    rotate_key re-wraps the vault key for a new password without re-encrypting the data.
+    sibling returns a repository of the same kind and configuration for another vault file.
+    flush blocks until every accepted save, and any background work, has reached the disk.
+    take_write_error returns, once, the last failure of a save written in the background.
     """
 
     @abstractmethod
@@ -16,4 +21,32 @@ class IVaultRepository(ABC):
 
     @abstractmethod
     def rotate_encryption(self, data: dict, new_password: str) -> None:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def rotate_key(self, old_password: str, new_password: str) -> None:
+        pass
+
+    @abstractmethod
+    def sibling(self, filepath: str) -> "IVaultRepository":
+        pass
+
+    @abstractmethod
+    def flush(self) -> None:
+        pass
+
+    @abstractmethod
+    def take_write_error(self) -> BaseException | None:
+        pass
+
+
+class IIncrementalVaultRepository(IVaultRepository):
+    """
+    Extends the repository contract with single-record writes.
+    save_changes receives a mapping of key to record dict, or to None for deletions,
+    and persists only those records.
+    """
+
+    @abstractmethod
+    def save_changes(self, changes: dict, password: str) -> None:
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Dict
+from typing import ContextManager, Optional, Dict, List
 from ..models.credential import Credential
+from ..models.search_result import SearchResult
 
 class IVaultService(ABC):
     """
@@ -16,6 +17,18 @@ class IVaultService(ABC):
     def list_all_credentials(self) -> Dict[str, Credential]:
         pass
 
+    @abstractmethod
+    def count_credentials(self) -> int:
+        pass
+
+    @abstractmethod
+    def add_credentials(self, credentials: List[Credential]) -> List[str]:
+        pass
+
+    @abstractmethod
+    def delete_credentials(self, service_names: List[str]) -> List[str]:
+        pass
+
     @abstractmethod
     def get_credential(self, service_name: str) -> Optional[Credential]:
         pass
@@ -33,9 +46,29 @@ class IVaultService(ABC):
         pass
 
     @abstractmethod
-    def change_master_password(self, new_password: str) -> tuple[int, list[str]]:
+    def rank_credentials(self, query: str, limit: Optional[int] = None, offset: int = 0, min_score: int = 61) -> List[SearchResult]:
+        pass
+
+    @abstractmethod
+    def change_master_password(self, new_password: str, progress=None, max_workers: int | None = None) -> tuple[int, list[str]]:
+        pass
+
+    @abstractmethod
+    def has_pending_rotation(self) -> bool:
         pass
 
     @abstractmethod
     def import_credentials(self, new_data: dict) -> tuple[bool, int]:
+        pass
+
+    @abstractmethod
+    def flush(self) -> None:
+        pass
+
+    @abstractmethod
+    def take_write_error(self) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def transaction(self) -> ContextManager[None]:
         pass
\ No newline at end of file
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class Credential:
     """
         Represents a single stored credential in the vault
@@ -9,8 +9,17 @@ class Credential:
         service_name: The name of the service (e.g., 'GitHub')
         username: The username or email for the account
         password: The associated password or secret
+
+        Slotted, so instances carry no per-object __dict__.
     """
         
     service_name: str
     username: str
-    password: str
\ No newline at end of file
+    password: str
+
+    def to_dict(self) -> dict:
+        return {
+            "service_name": self.service_name,
+            "username": self.username,
+            "password": self.password
+        }
@@ -0,0 +1,46 @@
+from collections.abc import Iterator, MutableMapping
+from .credential import Credential
+from ..utils.profiling import profiler
+
+
+class CredentialMap(MutableMapping):
+    """
+    Maps vault keys to Credential objects, built from the loaded records on first access.
+    Records that were never looked up are handed back unchanged by records(), so a save
+    does not materialise the whole vault.
+    """
+
+    def __init__(self, records: dict | None = None):
+        self._entries = records if records is not None else {}
+
+    def __getitem__(self, key: str) -> Credential:
+        value = self._entries[key]
+
+        if not isinstance(value, Credential):
+            value = Credential(value["service_name"], value["username"], value["password"])
+            self._entries[key] = value
+            profiler.count("credentials built")
+
+        return value
+
+    def __setitem__(self, key: str, credential: Credential):
+        self._entries[key] = credential
+
+    def __delitem__(self, key: str):
+        del self._entries[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"CredentialMap({len(self)} credentials)"
+
+    def records(self) -> Iterator[tuple[str, dict]]:
+        for key, value in self._entries.items():
+            yield key, value.to_dict() if isinstance(value, Credential) else value
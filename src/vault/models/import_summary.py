@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+
+@dataclass
+class ImportSummary:
+    """
+        The outcome of a bulk credential import
+
+        Attributes:
+        imported: Records written to the vault (or that would be, on a dry run)
+        conflicts: Records whose key already existed in the vault or earlier in the file
+        invalid: Records skipped for missing or malformed fields
+        elapsed: Seconds the import took
+        dry_run: Whether the vault was left untouched
+    """
+
+    imported: int = 0
+    conflicts: int = 0
+    invalid: int = 0
+    elapsed: float = 0.0
+    dry_run: bool = False
+
+    @property
+    def rate(self) -> float:
+        return (self.imported + self.invalid) / self.elapsed if self.elapsed else 0.0
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from .credential import Credential
+
+@dataclass
+class SearchResult:
+    """
+        A ranked match returned by a credential search
+
+        Attributes:
+        key: The vault key of the matching credential
+        credential: The matching credential
+        score: The fuzzy match score from 0 to 100
+    """
+
+    key: str
+    credential: Credential
+    score: int
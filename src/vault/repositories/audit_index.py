@@ -0,0 +1,239 @@
+import gzip
+import os
+import re
+from contextlib import closing
+from ..utils.lazy_import import lazy_import
+
+sqlite3 = lazy_import("sqlite3")
+
+LIVE_FILE = "audit.log"
+ENTRY_PATTERN = re.compile(rb"\[(.*?)\] (.*?): (.*)")
+INSERT_BATCH = 10000
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS files (
+        id INTEGER PRIMARY KEY, name TEXT UNIQUE, inode INTEGER, indexed INTEGER,
+        last_action TEXT, last_action_start INTEGER, last_action_end INTEGER,
+        last_day TEXT, last_day_start INTEGER, last_day_end INTEGER
+    );
+    CREATE TABLE IF NOT EXISTS ranges (
+        action TEXT, file INTEGER, start INTEGER, end INTEGER, PRIMARY KEY (action, file, start)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS days (
+        file INTEGER, day TEXT, start INTEGER, end INTEGER, PRIMARY KEY (file, day, start)
+    ) WITHOUT ROWID;
+"""
+
+
+class AuditIndex:
+    """
+    SQLite sidecar with the byte ranges of each action and each day in the audit log.
+    Consecutive lines with the same action, or the same day, share one range, so a query
+    only reads the parts of the log it needs.
+    Ranges are supersets: callers still check every line they read against the filters.
+    Offsets into rotated segments refer to their decompressed contents.
+
+    The index is derived data: it records how far into the live file it has read and
+    catches up from there, and it is rebuilt from zero if the live file was replaced or truncated.
+    Segments it has no entry for (rotated before the index existed, or while it could not be
+    updated) are indexed whole on the next catch-up.
+    """
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self.filepath = os.path.join(data_dir, "audit.idx")
+
+    def _connect(self):
+        connection = sqlite3.connect(self.filepath, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=OFF")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def catch_up(self, log_file: str, segments: list[str] = ()) -> None:
+        """
+        Indexes every complete line appended to the live log since the last call, and any
+        of the given segment paths the index does not know yet.
+        """
+        try:
+            stat = os.stat(log_file)
+        except FileNotFoundError:
+            stat = None
+
+        if stat is None and not segments:
+            return
+
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._index_segments(connection, segments)
+                if stat is not None:
+                    self._catch_up(connection, log_file, stat)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def _index_segments(self, connection, segments: list[str]):
+        known = {name for name, in connection.execute("SELECT name FROM files")}
+
+        for path in segments:
+            name = os.path.basename(path)
+            if name in known:
+                continue
+
+            file_id = connection.execute("INSERT INTO files (name, indexed) VALUES (?, 0)", (name,)).lastrowid
+            try:
+                offset = self._index_lines(connection, file_id, path, 0, [None, None], gzip.open)
+            except FileNotFoundError:
+                # Removed since it was listed; drop the placeholder so a later one is not masked.
+                connection.execute("DELETE FROM ranges WHERE file = ?", (file_id,))
+                connection.execute("DELETE FROM days WHERE file = ?", (file_id,))
+                connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                continue
+
+            connection.execute("UPDATE files SET indexed = ? WHERE id = ?", (offset, file_id))
+
+    def _catch_up(self, connection, log_file: str, stat):
+        row = connection.execute(
+            "SELECT id, inode, indexed, last_action, last_action_start, last_action_end, "
+            "last_day, last_day_start, last_day_end FROM files WHERE name = ?", (LIVE_FILE,)
+        ).fetchone()
+
+        if row is None:
+            file_id = connection.execute(
+                "INSERT INTO files (name, inode, indexed) VALUES (?, ?, 0)", (LIVE_FILE, stat.st_ino)
+            ).lastrowid
+            runs = [None, None]
+            offset = 0
+        elif row[1] != stat.st_ino or row[2] > stat.st_size:
+            file_id = row[0]
+            connection.execute("DELETE FROM ranges WHERE file = ?", (file_id,))
+            connection.execute("DELETE FROM days WHERE file = ?", (file_id,))
+            runs = [None, None]
+            offset = 0
+        else:
+            file_id = row[0]
+            runs = [list(row[3:6]) if row[3] is not None else None, list(row[6:9]) if row[6] is not None else None]
+            offset = row[2]
+
+        if offset < stat.st_size:
+            offset = self._index_lines(connection, file_id, log_file, offset, runs)
+
+        connection.execute(
+            "UPDATE files SET inode = ?, indexed = ?, last_action = ?, last_action_start = ?, last_action_end = ?, "
+            "last_day = ?, last_day_start = ?, last_day_end = ? WHERE id = ?",
+            (stat.st_ino, offset, *(runs[0] or (None,) * 3), *(runs[1] or (None,) * 3), file_id)
+        )
+
+    @staticmethod
+    def _index_lines(connection, file_id: int, log_file: str, offset: int, runs: list, opener=open) -> int:
+        """
+        Indexes complete lines from offset on. runs holds the open [key, start, end] run for actions
+        and for days; a run continues across calls while the next line carries the same key.
+        """
+        pending = ([], [])
+        statements = (
+            "INSERT OR REPLACE INTO ranges (action, file, start, end) VALUES (?, ?, ?, ?)",
+            "INSERT OR REPLACE INTO days (day, file, start, end) VALUES (?, ?, ?, ?)",
+        )
+
+        def write(kind, rows):
+            connection.executemany(statements[kind], [(key, file_id, start, end) for key, start, end in rows])
+
+        with opener(log_file, "rb") as f:
+            f.seek(offset)
+
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+
+                start = offset
+                offset += len(line)
+
+                match = ENTRY_PATTERN.match(line.strip())
+                if not match:
+                    continue
+
+                keys = (match.group(2).decode(errors="replace"), match.group(1)[:10].decode(errors="replace"))
+
+                for kind, key in enumerate(keys):
+                    run = runs[kind]
+                    if run is not None and run[0] == key and run[2] == start:
+                        run[2] = offset
+                        if not pending[kind]:
+                            pending[kind].append(run)
+                    else:
+                        runs[kind] = [key, start, offset]
+                        pending[kind].append(runs[kind])
+
+                    if len(pending[kind]) > INSERT_BATCH:
+                        write(kind, pending[kind][:-1])
+                        del pending[kind][:-1]
+
+        for kind in (0, 1):
+            write(kind, pending[kind])
+
+        return offset
+
+    def reset(self) -> None:
+        """
+        Deletes the index, so the next catch-up rebuilds it from the live file and every segment.
+        """
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.filepath + suffix)
+            except FileNotFoundError:
+                pass
+
+    def rename_live_file(self, segment_name: str) -> None:
+        """
+        Points the live file's ranges at the segment it was rotated into.
+        """
+        with closing(self._connect()) as connection:
+            connection.execute("UPDATE files SET name = ?, inode = NULL WHERE name = ?", (segment_name, LIVE_FILE))
+
+    def ranges(self, action: str | None = None, since: str | None = None, until: str | None = None) -> dict[str, list[tuple[int, int]]]:
+        """
+        Returns the byte ranges that may hold matching entries, grouped by file name, in log order.
+        Days are compared as YYYY-MM-DD strings and both bounds are inclusive.
+        """
+        grouped = {}
+
+        with closing(self._connect()) as connection:
+            files = connection.execute("SELECT id, name FROM files").fetchall()
+
+            for file_id, name in sorted(files, key=lambda item: (item[1] == LIVE_FILE, item[1])):
+                spans = connection.execute(
+                    "SELECT start, end FROM days WHERE file = ? AND day >= ? AND day <= ? ORDER BY start",
+                    (file_id, since or "", until or "\uffff")
+                ).fetchall()
+
+                if action is not None:
+                    spans = self._action_ranges(connection, file_id, action.upper(), spans)
+
+                if spans:
+                    grouped[name] = spans
+
+        return grouped
+
+    @staticmethod
+    def _action_ranges(connection, file_id: int, action: str, spans: list) -> list[tuple[int, int]]:
+        ranges = []
+
+        for low, high in spans:
+            straddling = connection.execute(
+                "SELECT start, end FROM ranges WHERE action = ? AND file = ? AND start < ? ORDER BY start DESC LIMIT 1",
+                (action, file_id, low)
+            ).fetchone()
+            if straddling is not None and straddling[1] > low:
+                ranges.append((low, min(straddling[1], high)))
+
+            ranges.extend(
+                (start, min(end, high)) for start, end in connection.execute(
+                    "SELECT start, end FROM ranges WHERE action = ? AND file = ? AND start >= ? AND start < ? ORDER BY start",
+                    (action, file_id, low, high)
+                )
+            )
+
+        return ranges
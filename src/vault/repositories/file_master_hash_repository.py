@@ -1,10 +1,12 @@
 import os
 from ..interfaces.master_hash_repository_interface import IMasterHashRepository
+from ..utils.atomic_file import atomic_write
 
 
 class FileMasterHashRepository(IMasterHashRepository):
     """
     Stores and retrieves the master password hash from a file.
+    The hash is replaced atomically, as it is also rewritten when its KDF is upgraded.
     """
 
     def __init__(self, filepath: str):
@@ -14,8 +16,7 @@ class FileMasterHashRepository(IMasterHashRepository):
         try:
             os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
 
-            with open(self.filepath, "w") as f:
-                f.write(hashed)
+            atomic_write(self.filepath, hashed.encode())
             return True
         
         except IOError:
@@ -0,0 +1,230 @@
+import json
+import os
+import struct
+import threading
+from cryptography.fernet import InvalidToken
+from ..interfaces.vault_repository_interface import IIncrementalVaultRepository
+from ..interfaces.data_migrator_interface import IDataMigrator
+from ..interfaces.encryption_interface import IDataEncryptor
+from ..interfaces.record_serializer_interface import IRecordSerializer
+from ..interfaces.compression_codec_interface import ICompressionCodec
+from ..utils.atomic_file import atomic_write, atomic_writer
+from ..utils.profiling import profiler
+from .json_repository import JsonRepository
+
+FRAME_HEADER = struct.Struct(">I")
+
+
+class JournaledJsonRepository(JsonRepository, IIncrementalVaultRepository):
+    """
+    JsonRepository variant that keeps an append-only encrypted journal next to the snapshot.
+    Each change appends one authenticated record; loading replays the journal over the snapshot.
+    Once the journal crosses a record or size threshold it is folded into a new snapshot
+    on a background thread.
+    In strict durability mode every append is fsynced; otherwise the journal is fsynced on flush.
+    A torn final frame left by a crash is skipped on load and cut off before the next append.
+    """
+
+    def __init__(self, filepath: str, encryptor: IDataEncryptor, migrator: IDataMigrator = None,
+                 max_journal_records: int = 500, max_journal_bytes: int = 1024 * 1024,
+                 serializer: IRecordSerializer = None, codec: ICompressionCodec = None, durability: str = "strict"):
+        super().__init__(filepath, encryptor, migrator, serializer, codec, durability)
+        self.journal_path = filepath + ".journal"
+        self.max_journal_records = max_journal_records
+        self.max_journal_bytes = max_journal_bytes
+
+        self._records = {}
+        self._journal_records = 0
+        self._lock = threading.RLock()
+        self._compaction = None
+        self._compaction_error = None
+        self._journal_unsynced = False
+        self._torn_offset = None
+
+    def sibling(self, filepath: str) -> "JournaledJsonRepository":
+        return self.__class__(filepath, self.encryptor, self.migrator, self.max_journal_records, self.max_journal_bytes,
+                              self.serializer, self.codec, self.writer.mode)
+
+    def _read_journal(self, password: str) -> list[dict]:
+        try:
+            with open(self.journal_path, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        offset = 0
+
+        while offset + FRAME_HEADER.size <= len(raw):
+            (length,) = FRAME_HEADER.unpack_from(raw, offset)
+            start = offset + FRAME_HEADER.size
+
+            if start + length > len(raw):
+                break
+
+            try:
+                entry = self.encryptor.decrypt(raw[start:start + length], password)
+            except InvalidToken:
+                raise ValueError("Failed to decrypt vault journal: Bad password or corrupt file.")
+
+            entries.append(json.loads(entry))
+            offset = start + length
+
+        # Remember where the valid frames end, so the next append does not land after a torn one.
+        self._torn_offset = offset if offset < len(raw) else None
+        return entries
+
+    def _load_records(self, password: str) -> dict:
+        self.flush()
+
+        with self._lock:
+            records = super()._load_records(password)
+            entries = self._read_journal(password)
+
+            for entry in entries:
+                self._apply(records, entry)
+
+            self._records = dict(records)
+            self._journal_records = len(entries)
+
+            return records
+
+    @staticmethod
+    def _apply(records: dict, entry: dict):
+        if entry["op"] == "put":
+            records[entry["key"]] = entry["record"]
+        else:
+            records.pop(entry["key"], None)
+
+    def _journal_size(self) -> int:
+        try:
+            return os.path.getsize(self.journal_path)
+        except OSError:
+            return 0
+
+    def save_changes(self, changes: dict, password: str) -> None:
+        entries = []
+        frames = []
+
+        for key, record in changes.items():
+            if record is None:
+                entry = {"op": "del", "key": key}
+            else:
+                entry = {"op": "put", "key": key, "record": record}
+
+            token = self.encryptor.encrypt(json.dumps(entry), password)
+            entries.append(entry)
+            frames.append(FRAME_HEADER.pack(len(token)) + token)
+
+        with profiler.phase("repository.journal_write"), self._lock:
+            with open(self.journal_path, 'ab') as f:
+                if self._torn_offset is not None:
+                    f.truncate(self._torn_offset)
+                    self._torn_offset = None
+                f.write(b"".join(frames))
+                f.flush()
+                if self.writer.mode == "strict":
+                    os.fsync(f.fileno())
+                else:
+                    self._journal_unsynced = True
+
+            for entry in entries:
+                self._apply(self._records, entry)
+
+            self._journal_records += len(frames)
+
+            if self._needs_compaction():
+                self._start_compaction(password)
+
+    def _needs_compaction(self) -> bool:
+        if self._compaction is not None and self._compaction.is_alive():
+            return False
+
+        return (self._journal_records >= self.max_journal_records
+                or self._journal_size() >= self.max_journal_bytes)
+
+    def _start_compaction(self, password: str):
+        self._compaction = threading.Thread(target=self._run_compaction, args=(password,), name="vault-compaction")
+        self._compaction.start()
+
+    def _run_compaction(self, password: str):
+        try:
+            self.compact(password)
+        except Exception as e:
+            # The journal is still intact, so nothing is lost; keep the failure for take_write_error().
+            with self._lock:
+                self._compaction_error = e
+
+    def compact(self, password: str) -> None:
+        with self._lock:
+            records = dict(self._records)
+            folded_bytes = self._journal_size()
+            folded_records = self._journal_records
+
+        temp_path = self.filepath + ".compact"
+        try:
+            with open(temp_path, 'wb') as f:
+                self._write_records(f, records, password)
+                f.flush()
+                os.fsync(f.fileno())
+
+            with self._lock:
+                os.replace(temp_path, self.filepath)
+
+                try:
+                    with open(self.journal_path, 'rb') as f:
+                        f.seek(folded_bytes)
+                        tail = f.read()
+                except FileNotFoundError:
+                    tail = b""
+
+                if tail:
+                    atomic_write(self.journal_path, tail)
+                elif os.path.exists(self.journal_path):
+                    os.remove(self.journal_path)
+
+                self._journal_records -= folded_records
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def flush(self) -> None:
+        compaction = self._compaction
+        if compaction is not None and compaction is not threading.current_thread():
+            compaction.join()
+
+        with self._lock:
+            if self._journal_unsynced and os.path.exists(self.journal_path):
+                with open(self.journal_path, 'rb') as f:
+                    os.fsync(f.fileno())
+            self._journal_unsynced = False
+
+        super().flush()
+
+    def take_write_error(self) -> BaseException | None:
+        with self._lock:
+            error, self._compaction_error = self._compaction_error, None
+        return super().take_write_error() or error
+
+    def rotate_key(self, old_password: str, new_password: str) -> None:
+        self.flush()
+
+        if os.path.exists(self.journal_path):
+            records = self._load_records(old_password)
+            self.save_data(records, old_password)
+
+        super().rotate_key(old_password, new_password)
+
+    def save_data(self, data: dict, password: str) -> None:
+        self.flush()
+
+        with self._lock:
+            with atomic_writer(self.filepath) as f:
+                self._write_records(f, data, password)
+
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+
+            self._records = dict(data)
+            self._journal_records = 0
+            self._torn_offset = None
@@ -1,55 +1,133 @@
-import json
-import os
-import glob
+from typing import BinaryIO, Iterator
 from cryptography.fernet import InvalidToken
 from ..interfaces.vault_repository_interface import IVaultRepository
 from ..interfaces.data_migrator_interface import IDataMigrator
 from ..interfaces.encryption_interface import IDataEncryptor
-from ..models.credential import Credential
+from ..interfaces.record_serializer_interface import IRecordSerializer
+from ..models.credential_map import CredentialMap
+from ..utils.atomic_file import atomic_write, atomic_writer
+from ..interfaces.compression_codec_interface import ICompressionCodec
+from ..utils.compression import NoCompression
+from ..utils.encryptors import read_head
+from ..utils.profiling import profiler
+from ..utils.serializers import JsonLinesSerializer
+from ..utils.vault_payload import read_payload, write_payload
+from .write_behind import WriteBehindWriter
 
 class JsonRepository(IVaultRepository):
     """
     Responsible for reading and writing vault data to a JSON file.
     Supports encryption, decryption, and migration of data via injected services.
+    Records go through the injected serializer (JSON lines by default), an optional
+    compression codec and the encryptor's segmented stream, so saving and loading never
+    hold the serialised vault in memory. The vault header names the record format and
+    codec, so files written with any known combination still load.
+
+    Snapshots are written to a temporary file, fsynced and renamed over the vault, at the
+    times the durability mode allows (see WriteBehindWriter).
     """
 
+    FILE_EXTENSION = ".json"
+    LEGACY_EXTENSIONS = ()
 
-    def __init__(self, filepath: str, encryptor: IDataEncryptor, migrator: IDataMigrator = None):
+    def __init__(self, filepath: str, encryptor: IDataEncryptor, migrator: IDataMigrator = None,
+                 serializer: IRecordSerializer = None, codec: ICompressionCodec = None, durability: str = "strict"):
         self.filepath = filepath
         self.encryptor = encryptor
         self.migrator = migrator
+        self.serializer = serializer or JsonLinesSerializer()
+        self.codec = codec or NoCompression()
+        self.writer = WriteBehindWriter(self._write_snapshot, durability)
+
+    def sibling(self, filepath: str) -> "JsonRepository":
+        return self.__class__(filepath, self.encryptor, self.migrator, self.serializer, self.codec, self.writer.mode)
+
+    def _upgrade_legacy(self, password: str) -> None:
+        if not self.migrator:
+            return
 
-    def load_data(self, password: str) -> dict:
         try:
             with open(self.filepath, 'rb') as f:
-                encrypted_data = f.read()
+                head = read_head(f)
+                if not self.migrator.needs_upgrade(head):
+                    return
+                raw = head + f.read()
+        except (IOError, FileNotFoundError):
+            return
 
-                if not encrypted_data:
-                    return {}
-                
-                data_str = self.encryptor.decrypt(encrypted_data, password)
-                data = json.loads(data_str)
+        try:
+            upgraded = self.migrator.upgrade(raw, password)
+        except InvalidToken:
+            raise ValueError("Failed to decrypt vault: Bad password or corrupt file.")
 
-                if self.migrator:
-                    data = self.migrator.migrate(data)
-                
-                for key, value in data.items():
-                    data[key] = Credential(value["service_name"], value["username"], value["password"])
+        atomic_write(self.filepath, upgraded)
 
-                return data
+    def _iter_records(self, password: str) -> Iterator[tuple[str, dict]]:
+        self.writer.flush()
+        self._upgrade_legacy(password)
 
+        try:
+            f = open(self.filepath, 'rb')
         except (IOError, FileNotFoundError):
-            return {}
-        
-        except InvalidToken:
-            raise ValueError("Failed to decrypt vault: Bad password or corrupt file.")
+            return
+
+        with f:
+            if not f.read(1):
+                return
+            f.seek(0)
+
+            try:
+                yield from read_payload(self.encryptor, f, password)
+            except InvalidToken:
+                raise ValueError("Failed to decrypt vault: Bad password or corrupt file.")
+
+    def _load_records(self, password: str) -> dict:
+        data = dict(self._iter_records(password))
+
+        if self.migrator:
+            data = self.migrator.migrate(data)
+
+        return data
+
+    def _write_records(self, target: BinaryIO, data: dict, password: str) -> None:
+        write_payload(self.encryptor, data, password, target, self.serializer, self.codec)
+
+    def load_data(self, password: str) -> dict:
+        with profiler.phase("repository.load"):
+            return CredentialMap(self._load_records(password))
+
+    def _write_snapshot(self, data: dict, password: str) -> None:
+        with profiler.phase("repository.write"), atomic_writer(self.filepath) as f:
+            self._write_records(f, data, password)
 
     def save_data(self, data: dict, password: str) -> None:
-        json_str = json.dumps(data)
-        encrypted_data = self.encryptor.encrypt(json_str, password)
+        self.writer.submit(data, password)
+
+    def flush(self) -> None:
+        self.writer.flush()
 
-        with open(self.filepath, 'wb') as f:
-            f.write(encrypted_data)
+    def take_write_error(self) -> BaseException | None:
+        return self.writer.take_error()
 
     def rotate_encryption(self, data: dict, new_password: str) -> None:
         self.save_data(data, new_password)
+
+    def rotate_key(self, old_password: str, new_password: str) -> None:
+        self.writer.flush()
+        self._upgrade_legacy(old_password)
+
+        try:
+            source = open(self.filepath, 'rb')
+        except (IOError, FileNotFoundError):
+            return
+
+        with source:
+            if not source.read(1):
+                return
+            source.seek(0)
+
+            try:
+                with atomic_writer(self.filepath) as target:
+                    self.encryptor.rewrap_stream(source, target, old_password, new_password)
+            except InvalidToken:
+                raise ValueError("Failed to decrypt vault: Bad password or corrupt file.")
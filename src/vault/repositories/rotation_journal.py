@@ -0,0 +1,56 @@
+import json
+import os
+import threading
+from ..utils.atomic_file import atomic_write
+
+
+class RotationJournal:
+    """
+    Records which vault files have already been moved to a new master password,
+    so an interrupted rotation can resume with the remaining vaults only.
+    The journal keeps a verifier encrypted under the new password rather than the password itself.
+    """
+
+    def __init__(self, data_dir: str):
+        self.filepath = os.path.join(data_dir, "rotation.journal")
+        self._lock = threading.Lock()
+        self._state = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.filepath)
+
+    def load(self) -> dict | None:
+        try:
+            with open(self.filepath, 'r') as f:
+                self._state = json.load(f)
+        except (IOError, json.JSONDecodeError):
+            self._state = None
+
+        return self._state
+
+    def verifier(self) -> str | None:
+        if not self._state:
+            return None
+        return self._state.get("verifier")
+
+    def start(self, verifier: str):
+        self._state = {"verifier": verifier, "completed": []}
+        self._write()
+
+    def completed(self) -> set[str]:
+        if not self._state:
+            return set()
+        return set(self._state["completed"])
+
+    def mark_completed(self, filename: str):
+        with self._lock:
+            self._state["completed"].append(filename)
+            self._write()
+
+    def clear(self):
+        self._state = None
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
+
+    def _write(self):
+        atomic_write(self.filepath, json.dumps(self._state).encode('utf-8'))
@@ -0,0 +1,213 @@
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+from contextlib import closing
+from cryptography.fernet import Fernet, InvalidToken
+from ..interfaces.vault_repository_interface import IIncrementalVaultRepository, IVaultRepository
+from ..interfaces.data_migrator_interface import IDataMigrator
+from ..interfaces.encryption_interface import IDataEncryptor
+from ..models.credential_map import CredentialMap
+from ..utils.profiling import profiler
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value BLOB);
+    CREATE TABLE IF NOT EXISTS credentials (id TEXT PRIMARY KEY, record BLOB NOT NULL);
+"""
+MIGRATED_SUFFIX = ".migrated"
+
+
+class SqliteRepository(IIncrementalVaultRepository):
+    """
+    Stores each credential as its own row in an SQLite database, encrypted on its own
+    with a random data key. The data key is wrapped under the master password by the
+    encryptor and kept in the meta table, so it is unwrapped once per session and a
+    password change rewrites that single value. Rows are keyed by an HMAC of the service
+    key rather than the name itself, so the database does not reveal which services it holds.
+
+    When the database does not exist yet but the legacy JSON vault does, the first load
+    copies every record over in one transaction, checks each one reads back unchanged and
+    only then renames the JSON files to <name>.json.migrated.
+    """
+
+    FILE_EXTENSION = ".db"
+    LEGACY_EXTENSIONS = (".json",)
+
+    def __init__(self, filepath: str, encryptor: IDataEncryptor, migrator: IDataMigrator = None,
+                 legacy_repository: IVaultRepository = None):
+        self.filepath = filepath
+        self.encryptor = encryptor
+        self.migrator = migrator
+        self.legacy_repository = legacy_repository
+
+        self._session = None
+
+    def sibling(self, filepath: str) -> "SqliteRepository":
+        legacy = None
+        if self.legacy_repository is not None:
+            legacy = self.legacy_repository.sibling(os.path.splitext(filepath)[0] + self.legacy_repository.FILE_EXTENSION)
+
+        return self.__class__(filepath, self.encryptor, self.migrator, legacy)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.filepath, timeout=10, isolation_level=None)
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _legacy_exists(self) -> bool:
+        return self.legacy_repository is not None and os.path.exists(self.legacy_repository.filepath)
+
+    def _read_wrapped_key(self, connection: sqlite3.Connection) -> bytes | None:
+        row = connection.execute("SELECT value FROM meta WHERE name = 'data_key'").fetchone()
+        return row[0] if row else None
+
+    def _session_key(self, connection: sqlite3.Connection, password: str, create: bool = False) -> bytes | None:
+        if self._session is not None and self._session[0] == password:
+            return self._session[1]
+
+        wrapped = self._read_wrapped_key(connection)
+
+        if wrapped is None:
+            if not create:
+                return None
+            data_key = Fernet.generate_key()
+            connection.execute(
+                "INSERT INTO meta (name, value) VALUES ('data_key', ?)", (self.encryptor.encrypt(data_key.decode('ascii'), password),)
+            )
+        else:
+            try:
+                data_key = self.encryptor.decrypt(wrapped, password).encode('ascii')
+            except InvalidToken:
+                raise ValueError("Failed to decrypt vault: Bad password or corrupt file.")
+
+        self._session = (password, data_key)
+        return data_key
+
+    @staticmethod
+    def _row_id(data_key: bytes, key: str) -> str:
+        return hmac.new(data_key, b"row-id:" + key.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _seal(data_key: bytes, key: str, record: dict) -> bytes:
+        return Fernet(data_key).encrypt(json.dumps({"key": key, "record": record}).encode('utf-8'))
+
+    def _migrate_legacy(self, password: str):
+        legacy = self.legacy_repository
+        records = dict(legacy.load_data(password).records())
+
+        self.save_data(records, password)
+
+        if self._load_records(password) != records:
+            # Drop the copy so the next load retries the migration from the untouched source.
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(self.filepath + suffix):
+                    os.remove(self.filepath + suffix)
+            raise ValueError("Vault migration to SQLite could not be verified.")
+
+        # Keep the verified source under a new name instead of deleting it.
+        for path in (getattr(legacy, "journal_path", None), legacy.filepath):
+            if path and os.path.exists(path):
+                os.replace(path, path + MIGRATED_SUFFIX)
+
+    def _load_records(self, password: str) -> dict:
+        with closing(self._connect()) as connection:
+            data_key = self._session_key(connection, password)
+            if data_key is None:
+                return {}
+
+            fernet = Fernet(data_key)
+            records = {}
+
+            try:
+                for (sealed,) in connection.execute("SELECT record FROM credentials"):
+                    entry = json.loads(fernet.decrypt(sealed))
+                    records[entry["key"]] = entry["record"]
+            except InvalidToken:
+                raise ValueError("Failed to decrypt vault: Bad password or corrupt file.")
+
+        if self.migrator:
+            records = self.migrator.migrate(records)
+
+        return records
+
+    def load_data(self, password: str) -> dict:
+        if not os.path.exists(self.filepath) and self._legacy_exists():
+            self._migrate_legacy(password)
+
+        with profiler.phase("repository.load"):
+            return CredentialMap(self._load_records(password))
+
+    def save_data(self, data: dict, password: str) -> None:
+        with profiler.phase("repository.write"), closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                data_key = self._session_key(connection, password, create=True)
+                connection.execute("DELETE FROM credentials")
+                connection.executemany(
+                    "INSERT INTO credentials (id, record) VALUES (?, ?)",
+                    [(self._row_id(data_key, key), self._seal(data_key, key, record)) for key, record in data.items()]
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def save_changes(self, changes: dict, password: str) -> None:
+        with profiler.phase("repository.write"), closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                data_key = self._session_key(connection, password, create=True)
+
+                for key, record in changes.items():
+                    row_id = self._row_id(data_key, key)
+                    if record is None:
+                        connection.execute("DELETE FROM credentials WHERE id = ?", (row_id,))
+                    else:
+                        connection.execute(
+                            "INSERT OR REPLACE INTO credentials (id, record) VALUES (?, ?)",
+                            (row_id, self._seal(data_key, key, record))
+                        )
+
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def flush(self) -> None:
+        pass
+
+    def take_write_error(self) -> BaseException | None:
+        return None
+
+    def rotate_encryption(self, data: dict, new_password: str) -> None:
+        with closing(self._connect()) as connection:
+            connection.execute("DELETE FROM meta WHERE name = 'data_key'")
+
+        self._session = None
+        self.save_data(data, new_password)
+
+    def rotate_key(self, old_password: str, new_password: str) -> None:
+        if not os.path.exists(self.filepath):
+            if self._legacy_exists():
+                self.legacy_repository.rotate_key(old_password, new_password)
+            return
+
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                wrapped = self._read_wrapped_key(connection)
+                if wrapped is not None:
+                    try:
+                        rewrapped = self.encryptor.rewrap(wrapped, old_password, new_password)
+                    except InvalidToken:
+                        raise ValueError("Failed to decrypt vault: Bad password or corrupt file.")
+
+                    connection.execute("UPDATE meta SET value = ? WHERE name = 'data_key'", (rewrapped,))
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+        if self._session is not None:
+            self._session = (new_password, self._session[1])
@@ -0,0 +1,132 @@
+import atexit
+import threading
+import time
+from typing import Callable
+
+DURABILITY_MODES = ("strict", "batched", "deferred")
+MAX_BACKGROUND_RETRIES = 5
+MAX_RETRY_DELAY = 60.0
+
+
+class WriteBehindWriter:
+    """
+    Decides when a repository's snapshot writes reach the disk.
+
+    strict writes every save before returning. batched keeps only the newest pending
+    snapshot and writes it once batch_size saves have been coalesced, or batch_interval
+    seconds after the first of them. deferred leaves every write to a background thread,
+    which writes the newest snapshot deferred_interval seconds after the vault became dirty.
+
+    flush() writes any pending snapshot right away. Repositories call it before reading,
+    and it also runs at exit, so a pending save is never silently dropped.
+
+    A failed background write is kept for take_error() instead of being printed from the
+    thread, and retried with a doubling delay up to MAX_BACKGROUND_RETRIES times. After
+    that the snapshot waits for the next save or flush.
+    """
+
+    def __init__(self, write: Callable[[dict, str], None], mode: str = "strict", batch_size: int = 32,
+                 batch_interval: float = 1.0, deferred_interval: float = 5.0):
+        if mode not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {mode}")
+
+        self.mode = mode
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.deferred_interval = deferred_interval
+
+        self._write = write
+        self._pending = None
+        self._pending_count = 0
+        self._dirty_since = None
+        self._failures = 0
+        self._error = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._worker = None
+
+        if mode != "strict":
+            atexit.register(self.flush)
+
+    def submit(self, data: dict, password: str) -> None:
+        if self.mode == "strict":
+            with self._write_lock:
+                self._write(data, password)
+            return
+
+        with self._lock:
+            self._pending = (data, password)
+            self._pending_count += 1
+            self._failures = 0
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+
+            batch_full = self.mode == "batched" and self._pending_count >= self.batch_size
+
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="vault-write-behind", daemon=True)
+                self._worker.start()
+            self._wakeup.notify()
+
+        if batch_full:
+            self.flush()
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return self._pending is not None
+
+    def take_error(self) -> BaseException | None:
+        """
+        Returns the last background write failure not yet reported, if any, and clears it.
+        """
+        with self._lock:
+            error, self._error = self._error, None
+            return error
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = None
+                self._pending_count = 0
+                self._dirty_since = None
+
+            if pending is None:
+                return
+
+            try:
+                self._write(*pending)
+                with self._lock:
+                    self._failures = 0
+                    self._error = None
+            except BaseException:
+                with self._lock:
+                    # Put the snapshot back unless a newer one arrived, so the next flush retries it.
+                    if self._pending is None:
+                        self._pending = pending
+                        self._pending_count = 1
+                        self._dirty_since = time.monotonic()
+                raise
+
+    def _delay(self) -> float:
+        delay = self.batch_interval if self.mode == "batched" else self.deferred_interval
+        return min(delay * 2 ** self._failures, max(delay, MAX_RETRY_DELAY)) if self._failures else delay
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._pending is None or self._failures >= MAX_BACKGROUND_RETRIES:
+                    self._wakeup.wait()
+
+                remaining = self._dirty_since + self._delay() - time.monotonic()
+                if remaining > 0:
+                    self._wakeup.wait(remaining)
+                    continue
+
+            try:
+                self.flush()
+            except Exception as e:
+                with self._lock:
+                    self._failures += 1
+                    self._error = e
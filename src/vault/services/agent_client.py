@@ -0,0 +1,128 @@
+import os
+import socket
+from contextlib import nullcontext
+from typing import Optional, Dict, List
+from ..interfaces.vault_service_interface import IVaultService
+from ..models.credential import Credential
+from ..models.search_result import SearchResult
+from ..utils.profiling import profiler
+from .agent_protocol import AgentError, encode_value, decode_result, send_message, receive_message
+
+
+class AgentClient:
+    """
+    Sends requests to a running unlock agent over its Unix domain socket.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def request(self, message: dict):
+        if not hasattr(socket, "AF_UNIX"):
+            raise AgentError("The unlock agent is not supported on this platform.")
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                send_message(sock, message)
+                response = receive_message(sock)
+        except OSError as e:
+            raise AgentError(f"Unlock agent unavailable: {e}")
+
+        if not response.get("ok"):
+            if response.get("type") == "ValueError":
+                raise ValueError(response.get("error"))
+            raise AgentError(response.get("error", "Agent request failed."))
+
+        return response.get("result")
+
+    def status(self) -> dict | None:
+        if not os.path.exists(self.socket_path):
+            return None
+
+        try:
+            return self.request({"method": "ping"})
+        except AgentError:
+            return None
+
+    def is_running(self) -> bool:
+        return self.status() is not None
+
+    def stop(self) -> bool:
+        try:
+            return bool(self.request({"method": "stop"}))
+        except AgentError:
+            return False
+
+    def call(self, vault_path: str, method: str, *args, **kwargs):
+        with profiler.phase("agent.call"):
+            result = self.request({
+                "method": method,
+                "vault": vault_path,
+                "args": encode_value(list(args)),
+                "kwargs": encode_value(kwargs),
+            })
+        return decode_result(method, result)
+
+
+class AgentVaultService(IVaultService):
+    """
+    IVaultService implementation that forwards every call to the unlock agent,
+    letting controllers work unchanged against a vault the agent holds open.
+    """
+
+    def __init__(self, client: AgentClient, vault_path: str):
+        self.client = client
+        self.vault_path = vault_path
+
+    def add_credential(self, credential: Credential) -> bool:
+        return self.client.call(self.vault_path, "add_credential", credential)
+
+    def count_credentials(self) -> int:
+        return self.client.call(self.vault_path, "count_credentials")
+
+    def add_credentials(self, credentials: List[Credential]) -> List[str]:
+        return list(self.client.call(self.vault_path, "add_credentials", credentials))
+
+    def delete_credentials(self, service_names: List[str]) -> List[str]:
+        return list(self.client.call(self.vault_path, "delete_credentials", service_names))
+
+    def list_all_credentials(self) -> Dict[str, Credential]:
+        return self.client.call(self.vault_path, "list_all_credentials")
+
+    def get_credential(self, service_name: str) -> Optional[Credential]:
+        return self.client.call(self.vault_path, "get_credential", service_name)
+
+    def update_credential(self, credential: Credential) -> bool:
+        return self.client.call(self.vault_path, "update_credential", credential)
+
+    def delete_credential(self, service_name: str) -> bool:
+        return self.client.call(self.vault_path, "delete_credential", service_name)
+
+    def search_credentials(self, query: str) -> Dict[str, Credential]:
+        return self.client.call(self.vault_path, "search_credentials", query)
+
+    def rank_credentials(self, query: str, limit: Optional[int] = None, offset: int = 0, min_score: int = 61) -> List[SearchResult]:
+        return self.client.call(self.vault_path, "rank_credentials", query, limit=limit, offset=offset, min_score=min_score)
+
+    def change_master_password(self, new_password: str, progress=None, max_workers: int | None = None) -> tuple[int, list[str]]:
+        success_count, errors = self.client.call(self.vault_path, "change_master_password", new_password, max_workers=max_workers)
+        return success_count, list(errors)
+
+    def has_pending_rotation(self) -> bool:
+        return self.client.call(self.vault_path, "has_pending_rotation")
+
+    def import_credentials(self, new_data: dict) -> tuple[bool, int]:
+        return self.client.call(self.vault_path, "import_credentials", new_data)
+
+    def flush(self) -> None:
+        self.client.call(self.vault_path, "flush")
+
+    def take_write_error(self) -> Optional[str]:
+        return self.client.call(self.vault_path, "take_write_error")
+
+    def transaction(self):
+        # Every agent request is applied on its own, so calls cannot be grouped from here.
+        return nullcontext()
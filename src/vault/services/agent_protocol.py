@@ -0,0 +1,90 @@
+"""
+Wire format shared by the unlock agent and its clients.
+Each connection carries one newline-terminated JSON request and one JSON response.
+"""
+import json
+from collections.abc import Mapping
+from ..models.credential import Credential
+from ..models.search_result import SearchResult
+
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+VAULT_METHODS = {
+    "add_credential",
+    "add_credentials",
+    "list_all_credentials",
+    "count_credentials",
+    "get_credential",
+    "update_credential",
+    "delete_credential",
+    "delete_credentials",
+    "search_credentials",
+    "rank_credentials",
+    "change_master_password",
+    "has_pending_rotation",
+    "import_credentials",
+    "flush",
+    "take_write_error",
+}
+
+
+class AgentError(Exception):
+    """
+    Raised when the agent cannot be reached or rejects a request.
+    """
+
+
+def encode_value(value):
+    if isinstance(value, Credential):
+        return value.to_dict()
+    if isinstance(value, SearchResult):
+        return {"key": value.key, "credential": value.credential.to_dict(), "score": value.score}
+    if isinstance(value, Mapping):
+        return {key: encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    return value
+
+
+def decode_credential(data: dict | None) -> Credential | None:
+    if data is None:
+        return None
+    return Credential(data["service_name"], data["username"], data["password"])
+
+
+def decode_result(method: str, value):
+    if method == "get_credential":
+        return decode_credential(value)
+    if method in ("list_all_credentials", "search_credentials"):
+        return {key: decode_credential(item) for key, item in value.items()}
+    if method == "rank_credentials":
+        return [SearchResult(item["key"], decode_credential(item["credential"]), item["score"]) for item in value]
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def send_message(sock, message: dict):
+    sock.sendall(json.dumps(message).encode('utf-8') + b"\n")
+
+
+def receive_message(sock) -> dict:
+    chunks = []
+    received = 0
+
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+
+        chunks.append(chunk)
+        received += len(chunk)
+        if chunk.endswith(b"\n"):
+            break
+        if received > MAX_MESSAGE_BYTES:
+            raise AgentError("Agent message too large.")
+
+    if not chunks:
+        raise AgentError("Agent closed the connection.")
+
+    return json.loads(b"".join(chunks))
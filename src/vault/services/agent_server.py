@@ -0,0 +1,185 @@
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from ..models.credential import Credential
+from .agent_protocol import VAULT_METHODS, encode_value, send_message, receive_message
+
+
+class _AgentRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        agent = self.server.agent
+
+        if not agent.is_trusted_peer(self.request):
+            send_message(self.request, {"ok": False, "error": "Permission denied.", "type": "PermissionError"})
+            return
+
+        try:
+            request = receive_message(self.request)
+            result = agent.dispatch(request)
+            response = {"ok": True, "result": encode_value(result)}
+        except Exception as e:
+            response = {"ok": False, "error": str(e), "type": type(e).__name__}
+
+        send_message(self.request, response)
+
+
+class _AgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class VaultAgent:
+    """
+    Holds unlocked vaults in memory and serves them over a Unix domain socket,
+    so one-shot commands can skip key derivation and decryption.
+    The socket is only accessible to the owning user, and the agent wipes its state
+    and exits once its time-to-live has passed.
+    """
+
+    def __init__(self, socket_path: str, password: str, service_factory, ttl: int):
+        self.socket_path = socket_path
+        self.service_factory = service_factory
+        self.ttl = ttl
+        self.expires_at = time.time() + ttl
+
+        self._password = password
+        self._services = {}
+        self._signatures = {}
+        self._write_errors = {}
+        self._unsaved = set()
+        self._lock = threading.Lock()
+        self._server = None
+
+    @staticmethod
+    def _file_signature(vault_path: str) -> tuple:
+        signature = []
+        for path in (vault_path, vault_path + ".journal", os.path.splitext(vault_path)[0] + ".db"):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def is_trusted_peer(self, connection) -> bool:
+        if not hasattr(socket, "SO_PEERCRED"):
+            return True
+
+        credentials = connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        _, uid, _ = struct.unpack("3i", credentials)
+        return uid == os.getuid()
+
+    def _service_for(self, vault_path: str):
+        signature = self._file_signature(vault_path)
+
+        if vault_path in self._services and self._signatures.get(vault_path) != signature:
+            if not self._flush_stale(vault_path, self._services[vault_path]):
+                # Reloading now would drop the unsaved changes; keep serving them and retry on the next request.
+                return self._services[vault_path]
+            del self._services[vault_path]
+
+        if vault_path not in self._services:
+            self._services[vault_path] = self.service_factory(vault_path, self._password)
+
+        return self._services[vault_path]
+
+    def _flush_stale(self, vault_path: str, service) -> bool:
+        # A batched or deferred save may still be pending; write it before the reload reads the file.
+        try:
+            service.flush()
+        except Exception as e:
+            self._write_errors[vault_path] = str(e)
+            self._unsaved.add(vault_path)
+            return False
+
+        self._unsaved.discard(vault_path)
+        error = service.take_write_error()
+        if error:
+            self._write_errors[vault_path] = error
+        return True
+
+    def dispatch(self, request: dict):
+        method = request.get("method")
+
+        if method == "ping":
+            return {"pid": os.getpid(), "expires_in": int(self.expires_at - time.time())}
+
+        if method == "stop":
+            threading.Thread(target=self.shutdown).start()
+            return True
+
+        if method not in VAULT_METHODS:
+            raise ValueError(f"Unsupported agent request: {method}")
+
+        vault_path = request["vault"]
+        args = list(request.get("args", []))
+        kwargs = dict(request.get("kwargs", {}))
+
+        if method in ("add_credential", "update_credential"):
+            args[0] = Credential(args[0]["service_name"], args[0]["username"], args[0]["password"])
+        elif method == "add_credentials":
+            args[0] = [Credential(item["service_name"], item["username"], item["password"]) for item in args[0]]
+
+        with self._lock:
+            service = self._service_for(vault_path)
+            if method == "take_write_error" and vault_path in self._write_errors:
+                return self._write_errors.pop(vault_path)
+
+            result = getattr(service, method)(*args, **kwargs)
+
+            if method == "change_master_password":
+                self._password = service.password
+                self._services.clear()
+                self._signatures.clear()
+                self._unsaved.clear()
+            elif vault_path not in self._unsaved:
+                self._signatures[vault_path] = self._file_signature(vault_path)
+
+        return result
+
+    def serve(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = _AgentServer(self.socket_path, _AgentRequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+        os.chmod(self.socket_path, 0o600)
+        self._server.agent = self
+
+        timer = threading.Timer(max(self.expires_at - time.time(), 0), self.shutdown)
+        timer.daemon = True
+        timer.start()
+
+        try:
+            self._server.serve_forever(poll_interval=0.5)
+        finally:
+            timer.cancel()
+            self._server.server_close()
+            self._wipe()
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _wipe(self):
+        with self._lock:
+            for service in self._services.values():
+                try:
+                    service.flush()
+                except Exception:
+                    pass
+
+            self._password = None
+            self._services.clear()
+            self._signatures.clear()
+            self._unsaved.clear()
+            self._write_errors.clear()
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
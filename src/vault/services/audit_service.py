@@ -1,41 +1,328 @@
-import os 
+import atexit
+import glob
+import gzip
+import io
+import os
 import re
+import shutil
+import threading
+import time
 import datetime
+from collections import deque
+from ..repositories.audit_index import AuditIndex
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+TAIL_BLOCK_SIZE = 64 * 1024
+READ_GAP = 64 * 1024
+READ_WINDOW = 4 * 1024 * 1024
+LOG_PATTERN = re.compile(r"\[(.*?)\] (.*?): (.*)")
+
 
 class AuditService:
-    def __init__(self, data_dir: str):
+    """
+    Appends audit events to audit.log and reads them back.
+
+    Events are buffered and written with a single O_APPEND write once the buffer passes
+    flush_bytes, flush_interval seconds after the first buffered event, and at exit, so
+    concurrent processes only ever interleave whole lines. Once the live file grows past
+    max_bytes it is renamed and gzipped into an audit.log.<time_ns>.gz segment. Writers hold
+    a shared flock while appending and the rotation takes it exclusively, so no process
+    keeps appending to a file that is being compressed.
+
+    query_logs brings the AuditIndex sidecar up to date before it reads (as does rotation),
+    then reads only the byte ranges for the requested action and days; writing stays
+    clear of the index. Observers added with
+    add_observer are called with each event's action and details as it is logged.
+    """
+
+    def __init__(self, data_dir: str, flush_bytes: int = 64 * 1024, flush_interval: float = 1.0,
+                 max_bytes: int = 10 * 1024 * 1024):
         self.log_file = os.path.join(data_dir, "audit.log")
-    
+        self.index = AuditIndex(data_dir)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._fd = None
+        self._timer = None
+        self._lock = threading.RLock()
+        self._observers = []
+
+        atexit.register(self.close)
+
+    def add_observer(self, callback):
+        self._observers.append(callback)
+
     def log_event(self, action: str, details: str = ""):
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        entry = f"[{timestamp}] {action.upper()}: {details}\n"
+        entry = f"[{timestamp}] {action.upper()}: {details}\n".encode()
+
+        for observer in self._observers:
+            observer(action.upper(), details)
+
+        with self._lock:
+            self._buffer.append(entry)
+            self._buffered_bytes += len(entry)
+
+            if self._buffered_bytes >= self.flush_bytes:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _open(self) -> int:
+        if self._fd is not None:
+            try:
+                if os.fstat(self._fd).st_ino == os.stat(self.log_file).st_ino:
+                    return self._fd
+            except FileNotFoundError:
+                pass
+
+            os.close(self._fd)
+
+        self._fd = os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+        return self._fd
+
+    def _locked_fd(self) -> int:
+        while True:
+            fd = self._open()
+            if fcntl is None:
+                return fd
 
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            try:
+                if os.fstat(fd).st_ino == os.stat(self.log_file).st_ino:
+                    return fd
+            except FileNotFoundError:
+                pass
+
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if not self._buffer:
+                return
+
+            data = b"".join(self._buffer)
+            self._buffer = []
+            self._buffered_bytes = 0
+
+            try:
+                fd = self._locked_fd()
+                try:
+                    view = memoryview(data)
+                    while view:
+                        view = view[os.write(fd, view):]
+                    size = os.fstat(fd).st_size
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+
+                if size >= self.max_bytes:
+                    self.rotate()
+            except Exception as e:
+                print(f"Failed to write audit log: {e}")
+
+    def _update_index(self):
+        # The index only mirrors the log, so a failed update is retried by the next catch-up.
         try:
-            with open(self.log_file, "a") as f:
-                f.write(entry)
-        except Exception as e:
-            print(f"Failed to write audit log: {e}")
-    
+            self.index.catch_up(self.log_file, self.segments())
+        except Exception:
+            pass
+
+    def rotate(self):
+        """
+        Moves the live log into a new compressed segment.
+        """
+        with self._lock:
+            fd = self._open()
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+
+            try:
+                if os.fstat(fd).st_ino != os.stat(self.log_file).st_ino or os.fstat(fd).st_size == 0:
+                    return
+
+                self._update_index()
+
+                segment = f"{self.log_file}.{time.time_ns():020d}"
+                os.rename(self.log_file, segment)
+
+                try:
+                    self.index.rename_live_file(os.path.basename(segment) + ".gz")
+                except Exception:
+                    # Left alone, the live file's entry would keep the segment's ranges; rebuild instead.
+                    self.index.reset()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+
+            with open(segment, "rb") as source, gzip.open(segment + ".gz.tmp", "wb") as target:
+                shutil.copyfileobj(source, target)
+
+            os.replace(segment + ".gz.tmp", segment + ".gz")
+            os.remove(segment)
+
+    def close(self):
+        self.flush()
+
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def segments(self) -> list[str]:
+        """
+        Returns the rotated segments, oldest first.
+        """
+        return sorted(glob.glob(glob.escape(self.log_file) + ".*[0-9].gz"))
+
+    @staticmethod
+    def _tail_lines(path: str, limit: int) -> list[str]:
+        """
+        Returns the same lines as readlines()[-limit:] while reading only the end of the file.
+        Blocks are read backwards until they hold more than limit line breaks; every line after
+        the first (possibly partial) one then splits exactly as it would in the whole file.
+        """
+        with open(path, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            blocks = []
+            newlines = 0
+            returns = 0
+
+            while position > 0 and max(newlines, returns) <= limit:
+                size = min(TAIL_BLOCK_SIZE, position)
+                position -= size
+                f.seek(position)
+                block = f.read(size)
+
+                blocks.append(block)
+                newlines += block.count(b"\n")
+                returns += block.count(b"\r")
+
+        tail = b"".join(reversed(blocks))
+        # The first block may start inside a multibyte character; it only affects the partial first line, which is dropped.
+        lines = io.TextIOWrapper(io.BytesIO(tail), encoding="utf-8", errors="replace").readlines()
+        return lines[-limit:]
+
+    @staticmethod
+    def _segment_lines(path: str, limit: int | None = None) -> list[str]:
+        with io.TextIOWrapper(gzip.open(path, "rb")) as f:
+            return list(f) if limit is None else list(deque(f, maxlen=limit))
+
+    def _read_lines(self, limit: int) -> list[str]:
+        self.flush()
+
+        if limit <= 0:
+            lines = []
+            for segment in self.segments():
+                lines.extend(self._segment_lines(segment))
+            if os.path.exists(self.log_file):
+                with open(self.log_file, "r") as f:
+                    lines.extend(f.readlines())
+            return lines[-limit:]
+
+        lines = self._tail_lines(self.log_file, limit) if os.path.exists(self.log_file) else []
+
+        for segment in reversed(self.segments()):
+            if len(lines) >= limit:
+                break
+            lines = self._segment_lines(segment, limit - len(lines)) + lines
+
+        return lines
+
+    @staticmethod
+    def _parse_line(line: str) -> dict | None:
+        match = LOG_PATTERN.match(line.strip())
+        if not match:
+            return None
+
+        return {
+            "timestamp": match.group(1),
+            "action": match.group(2),
+            "details": match.group(3)
+        }
+
     def get_parsed_logs(self, limit: int = 20) -> list[dict]:
-        if not os.path.exists(self.log_file):
-            return []
-        
         results = []
         try:
-            with open(self.log_file, "r") as f:
-                lines = f.readlines()
-                
-            pattern = re.compile(r"\[(.*?)\] (.*?): (.*)")
-
-            for line in lines[-limit:]:
-                match = pattern.match(line.strip())
-                if match:
-                    results.append({
-                        "timestamp": match.group(1),
-                        "action": match.group(2),
-                        "details": match.group(3)
-                    })
+            lines = self._read_lines(limit)
+
+            for line in lines:
+                entry = self._parse_line(line)
+                if entry:
+                    results.append(entry)
             return results
         except Exception:
             return []
-    
\ No newline at end of file
+
+    def _read_ranges(self, name: str, ranges: list[tuple[int, int]]):
+        path = os.path.join(os.path.dirname(self.log_file), name)
+        opener = gzip.open if name.endswith(".gz") else open
+
+        try:
+            with opener(path, "rb") as f:
+                for window_start, window_end, members in self._read_windows(ranges):
+                    f.seek(window_start)
+                    window = f.read(window_end - window_start)
+
+                    for start, end in members:
+                        yield from window[start - window_start:end - window_start].decode(errors="replace").split("\n")[:-1]
+        except FileNotFoundError:
+            return
+
+    @staticmethod
+    def _read_windows(ranges: list[tuple[int, int]]):
+        # Nearby ranges are served from one read instead of a seek and read each.
+        members = []
+        for start, end in ranges:
+            if members and (start - members[-1][1] > READ_GAP or end - members[0][0] > READ_WINDOW):
+                yield members[0][0], members[-1][1], members
+                members = []
+            members.append((start, end))
+
+        if members:
+            yield members[0][0], members[-1][1], members
+
+    def query_logs(self, action: str | None = None, since: str | None = None, until: str | None = None,
+                   contains: str | None = None, limit: int | None = None) -> list[dict]:
+        """
+        Returns entries matching every given filter, oldest first; limit keeps the newest matches.
+        since and until are inclusive YYYY-MM-DD days and contains matches the details case-insensitively.
+        """
+        self.flush()
+        self._update_index()
+
+        wanted_action = action.upper() if action else None
+        needle = contains.lower() if contains else None
+        results = deque(maxlen=limit) if limit else []
+
+        try:
+            for name, ranges in self.index.ranges(action, since, until).items():
+                for line in self._read_ranges(name, ranges):
+                    entry = self._parse_line(line)
+                    if not entry:
+                        continue
+
+                    day = entry["timestamp"][:10]
+                    if ((wanted_action and entry["action"] != wanted_action)
+                            or (since and day < since) or (until and day > until)
+                            or (needle and needle not in entry["details"].lower())):
+                        continue
+
+                    results.append(entry)
+        except Exception:
+            return []
+
+        return list(results)
@@ -1,5 +1,6 @@
 from ..interfaces.encryption_interface import IPasswordHasher
 from ..interfaces.master_hash_repository_interface import IMasterHashRepository
+from ..utils.profiling import profiler
 
 
 class AuthenticationService:
@@ -7,6 +8,8 @@ class AuthenticationService:
     Handles master password verification and creation.
     Delegates hashing to an injected IPasswordHasher implementation.
     Delegates storage to an IMasterHashRepository implementation.
+    A hash made with other than the hasher's configured KDF is replaced after the next
+    successful login, since that is the only time the password is at hand.
     """
 
     def __init__(self, repo: IMasterHashRepository, hasher: IPasswordHasher):
@@ -14,7 +17,8 @@ class AuthenticationService:
         self.hasher = hasher
 
     def create_master_hash(self, password: str) -> bool:
-        hashed = self.hasher.hash_password(password)
+        with profiler.phase("auth.hash_password"):
+            hashed = self.hasher.hash_password(password)
         return self.repo.save_hash(hashed)
 
     def verify_password(self, password_attempt: str) -> bool:
@@ -22,7 +26,13 @@ class AuthenticationService:
         if stored_hash is None:
             return False
 
-        return self.hasher.verify_password(password_attempt, stored_hash)
+        with profiler.phase("auth.verify_password"):
+            verified = self.hasher.verify_password(password_attempt, stored_hash)
+
+        if verified and self.hasher.needs_rehash(stored_hash):
+            self.create_master_hash(password_attempt)
+
+        return verified
 
     def is_first_time_setup(self) -> bool:
         return self.repo.load_hash() is None
\ No newline at end of file
@@ -14,7 +14,14 @@ class ConfigurationService:
         self._config_cache = None
         
         self.defaults = {
-            "active_vault": os.path.join(data_dir, "credentials.json")
+            "active_vault": os.path.join(data_dir, "credentials.json"),
+            "repository": "json",
+            "vault_format": "jsonl",
+            "compression": "none",
+            "durability": "strict",
+            "agent_ttl": 900,
+            "metrics_file": None,
+            "kdf": None
         }
 
     def _load_config(self):
@@ -51,6 +58,39 @@ class ConfigurationService:
         config = self._load_config()
         return config.get("active_vault", self.defaults["active_vault"])
 
+    def get_repository_type(self):
+        config = self._load_config()
+        return config.get("repository", self.defaults["repository"])
+
+    def get_vault_format(self):
+        config = self._load_config()
+        return config.get("vault_format", self.defaults["vault_format"])
+
+    def get_compression(self):
+        config = self._load_config()
+        return config.get("compression", self.defaults["compression"])
+
+    def get_durability(self):
+        config = self._load_config()
+        return config.get("durability", self.defaults["durability"])
+
+    def get_agent_ttl(self):
+        config = self._load_config()
+        return int(config.get("agent_ttl", self.defaults["agent_ttl"]))
+
+    def get_metrics_file(self):
+        config = self._load_config()
+        return config.get("metrics_file", self.defaults["metrics_file"])
+
+    def get_kdf(self):
+        config = self._load_config()
+        return config.get("kdf", self.defaults["kdf"])
+
+    def set_kdf(self, params: dict) -> bool:
+        config = dict(self._load_config())
+        config["kdf"] = params
+        return self._save_config(config)
+
     def set_active_vault(self, vault_name):
         config = self._load_config()
         
@@ -0,0 +1,170 @@
+import atexit
+import os
+import re
+import threading
+import time
+from ..utils.atomic_file import atomic_writer
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+KDF_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Profiler phases that derive a key from the master password, by the operation label they get.
+KDF_PHASES = {
+    "encryptor.kdf": "vault_key",
+    "auth.hash_password": "hash_master",
+    "auth.verify_password": "verify_master",
+}
+
+METRICS = {
+    "vault_events_total": ("counter", "Audit events logged by the vault, by action."),
+    "vault_kdf_duration_seconds": ("histogram", "Time spent deriving keys from the master password."),
+    "vault_credentials": ("gauge", "Credentials in the vault when a command last finished."),
+    "vault_file_bytes": ("gauge", "Size of the vault file when a command last finished."),
+    "vault_last_run_timestamp_seconds": ("gauge", "When a vault command last finished."),
+}
+
+SAMPLE_PATTERN = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$")
+
+
+def format_labels(**labels) -> str:
+    escaped = {name: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for name, value in labels.items()}
+    return ",".join(f'{name}="{value}"' for name, value in escaped.items())
+
+
+def format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def family_of(sample: str) -> str | None:
+    if sample in METRICS:
+        return sample
+
+    for suffix in ("_bucket", "_sum", "_count"):
+        base = sample[:-len(suffix)]
+        if sample.endswith(suffix) and METRICS.get(base, ("",))[0] == "histogram":
+            return base
+
+    return None
+
+
+class MetricsService:
+    """
+    Collects vault metrics in memory and merges them into a Prometheus textfile-collector
+    file at exit, for a local node exporter to scrape.
+
+    Events arrive from the AuditService and key derivation timings from the profiler's
+    observers, so recording one is a dictionary update. Counters and histograms are added
+    to the ones already in the file, which makes them totals across every run; gauges
+    replace theirs. The file is rewritten atomically under a lock on a sidecar file, so
+    concurrent commands neither lose each other's counts nor expose a partial file.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._counters: dict[tuple[str, str], float] = {}
+        self._gauges: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+        atexit.register(self.flush)
+
+    def attach(self, audit_service, profiler):
+        audit_service.add_observer(self.record_event)
+        profiler.add_observer(KDF_PHASES, self.record_phase)
+
+    def record_event(self, action: str, details: str = ""):
+        self.inc("vault_events_total", action=action)
+
+    def record_phase(self, name: str, seconds: float):
+        self.observe("vault_kdf_duration_seconds", seconds, operation=KDF_PHASES[name])
+
+    def record_vault(self, vault_path: str, credential_count: int):
+        vault = os.path.splitext(os.path.basename(vault_path))[0]
+        self.set("vault_credentials", credential_count, vault=vault)
+        if os.path.exists(vault_path):
+            self.set("vault_file_bytes", os.path.getsize(vault_path), vault=vault)
+        self.set("vault_last_run_timestamp_seconds", time.time())
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = (name, format_labels(**labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges[(name, format_labels(**labels))] = value
+
+    def observe(self, name: str, value: float, **labels):
+        plain = format_labels(**labels)
+        prefix = plain + "," if plain else ""
+
+        with self._lock:
+            # Buckets are cumulative, so a value lands in every bucket at or above it.
+            for bound in KDF_BUCKETS:
+                key = (f"{name}_bucket", f'{prefix}le="{bound}"')
+                self._counters[key] = self._counters.get(key, 0) + (value <= bound)
+
+            for key, amount in (((f"{name}_bucket", f'{prefix}le="+Inf"'), 1),
+                                ((f"{name}_sum", plain), value),
+                                ((f"{name}_count", plain), 1)):
+                self._counters[key] = self._counters.get(key, 0) + amount
+
+    def flush(self):
+        with self._lock:
+            if not self._counters and not self._gauges:
+                return
+
+            counters, gauges = self._counters, self._gauges
+            self._counters, self._gauges = {}, {}
+
+        try:
+            with open(self.filepath + ".lock", "a") as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+
+                samples = self._read_samples()
+                for key, amount in counters.items():
+                    samples[key] = samples.get(key, 0) + amount
+                samples.update(gauges)
+
+                self._write_samples(samples)
+
+        except OSError:
+            # Metrics are best effort; a missing or read-only collector directory must not fail a command.
+            pass
+
+    def _read_samples(self) -> dict[tuple[str, str], float]:
+        samples = {}
+        try:
+            with open(self.filepath) as f:
+                for line in f:
+                    match = SAMPLE_PATTERN.match(line.strip())
+                    if match and family_of(match.group(1)):
+                        samples[(match.group(1), match.group(2) or "")] = float(match.group(3))
+        except FileNotFoundError:
+            pass
+
+        return samples
+
+    def _write_samples(self, samples: dict[tuple[str, str], float]):
+        lines = []
+        for family, (kind, help_text) in METRICS.items():
+            series = [(key, value) for key, value in samples.items() if family_of(key[0]) == family]
+            if not series:
+                continue
+
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            for (sample, labels), value in series:
+                lines.append(f"{sample}{{{labels}}} {format_value(value)}" if labels else f"{sample} {format_value(value)}")
+
+        # The collector only reads *.prom files, so the temporary file must not end in .prom.
+        with atomic_writer(self.filepath, fsync=False, suffix=".tmp") as f:
+            if hasattr(os, "fchmod"):
+                os.fchmod(f.fileno(), 0o644)
+            f.write(("\n".join(lines) + "\n").encode())
@@ -1,9 +1,20 @@
 import os
 import glob
-from ..interfaces.vault_repository_interface import IVaultRepository
+import base64
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from cryptography.fernet import InvalidToken
+from ..interfaces.vault_repository_interface import IVaultRepository, IIncrementalVaultRepository
 from ..interfaces.vault_service_interface import IVaultService
 from ..models.credential import Credential
-from thefuzz import fuzz
+from ..models.search_result import SearchResult
+from ..repositories.rotation_journal import RotationJournal
+from ..utils.profiling import profiler
+from ..utils.search_index import ServiceNameIndex
+
+ROTATION_VERIFIER = "credential-vault-rotation"
+SEARCH_THRESHOLD = 60
+DEFAULT_MIN_SCORE = SEARCH_THRESHOLD + 1
 
 
 class VaultService(IVaultService):
@@ -16,27 +27,90 @@ class VaultService(IVaultService):
     def __init__(self, repository: IVaultRepository, master_password: str):
         self.repo = repository
         self.password = master_password
-        self.credentials = self.repo.load_data(self.password)
+        with profiler.phase("vault.load"):
+            self.credentials = self.repo.load_data(self.password)
+        self._search_index = None
+        self._transaction = None
+
+    @property
+    def search_index(self) -> ServiceNameIndex:
+        if self._search_index is None:
+            with profiler.phase("vault.index"):
+                self._search_index = ServiceNameIndex({key: record["service_name"] for key, record in self.credentials.records()})
+        return self._search_index
+
+    def _index_credential(self, key: str, credential: Credential | None):
+        if self._search_index is None:
+            return
+
+        if credential is None:
+            self._search_index.remove(key)
+        else:
+            self._search_index.add(key, credential.service_name)
+
+    def _remember(self, key: str):
+        if self._transaction is not None and key not in self._transaction:
+            credential = self.credentials.get(key)
+            self._transaction[key] = credential.to_dict() if credential else None
+
+    def _restore(self, originals: dict):
+        for key, record in originals.items():
+            if record is None:
+                self.credentials.pop(key, None)
+                self._index_credential(key, None)
+            else:
+                self.credentials[key] = Credential(record["service_name"], record["username"], record["password"])
+                self._index_credential(key, self.credentials[key])
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups changes into a single save. Inside the block, adds, updates, deletes and
+        imports only change memory; the vault is saved once when the outermost block
+        exits. If the block (or that save) raises, every credential it touched is put
+        back as it was.
+        """
+        if self._transaction is not None:
+            yield
+            return
 
-    def _save_credentials(self):
-        export_data = {}
-        for key, credential in self.credentials.items():
-            export_data[key] = {
-                "service_name": credential.service_name,
-                "username": credential.username,
-                "password": credential.password
-            }
+        originals = self._transaction = {}
+        try:
+            yield
+            self._transaction = None
+            if originals:
+                self._save_credentials(list(originals))
+        except BaseException:
+            self._transaction = None
+            self._restore(originals)
+            raise
 
-        self.repo.save_data(export_data, self.password)
+    def _save_credentials(self, changed_keys: list[str] | None = None):
+        if self._transaction is not None:
+            return
+
+        with profiler.phase("vault.save"):
+            if changed_keys is not None and isinstance(self.repo, IIncrementalVaultRepository):
+                changes = {}
+                for key in changed_keys:
+                    credential = self.credentials.get(key)
+                    changes[key] = credential.to_dict() if credential else None
+
+                self.repo.save_changes(changes, self.password)
+                return
+
+            self.repo.save_data(dict(self.credentials.records()), self.password)
 
     def add_credential(self, credential: Credential):
         key = credential.service_name.lower()
         if key in self.credentials:
             return False
         
+        self._remember(key)
         self.credentials[key] = credential
+        self._index_credential(key, credential)
 
-        self._save_credentials()
+        self._save_credentials([key])
         return True
 
     def get_credential(self, service):
@@ -46,20 +120,27 @@ class VaultService(IVaultService):
     def list_all_credentials(self):
         return self.credentials
 
+    def count_credentials(self) -> int:
+        return len(self.credentials)
+
     def delete_credential(self, service):
         key = service.lower()
+        if key not in self.credentials:
+            return False
 
-        if self.credentials.pop(key, None):
-            self._save_credentials()
-            return True
-        
-        return False
+        self._remember(key)
+        del self.credentials[key]
+        self._index_credential(key, None)
+
+        self._save_credentials([key])
+        return True
 
     def update_credential(self, credential: Credential):
         key = credential.service_name.lower()
         if key not in self.credentials:
             return False
         
+        self._remember(key)
         cred = self.credentials[key]
 
         if credential.username:
@@ -67,80 +148,165 @@ class VaultService(IVaultService):
         if credential.password:
             cred.password = credential.password
 
-        self._save_credentials()
+        self._save_credentials([key])
         return True
 
+    def add_credentials(self, credentials: list[Credential]) -> list[str]:
+        with self.transaction():
+            return [credential.service_name for credential in credentials if self.add_credential(credential)]
+
+    def delete_credentials(self, services: list[str]) -> list[str]:
+        with self.transaction():
+            return [service for service in services if self.delete_credential(service)]
+
     def search_credentials(self, query):
         matches = {}
         
-        for service, credential in self.credentials.items():
-            score = fuzz.partial_ratio(query.lower(), credential.service_name.lower())
-
-            if score > 60:
-                matches[service] = credential
+        index = self.search_index
+        with profiler.phase("vault.search"):
+            for service in index.search(query, SEARCH_THRESHOLD):
+                matches[service] = self.credentials[service]
 
         return matches
 
-    def change_master_password(self, new_password) -> tuple[int, list[str]]:
+    def rank_credentials(self, query: str, limit: int | None = None, offset: int = 0,
+                         min_score: int = DEFAULT_MIN_SCORE) -> list[SearchResult]:
+        index = self.search_index
+        with profiler.phase("vault.search"):
+            ranked = index.rank(query, min_score - 1, None if limit is None else offset + limit)
+
+        return [SearchResult(key, self.credentials[key], score) for key, score in ranked[offset:]]
+
+    def _vault_files(self, data_dir: str) -> list[str]:
+        # Vaults still in a legacy format are listed under the name the repository will give them.
+        extension = getattr(self.repo, "FILE_EXTENSION", ".json")
+        stems = set()
+
+        for suffix in (extension, *getattr(self.repo, "LEGACY_EXTENSIONS", ())):
+            for path in glob.glob(os.path.join(data_dir, "*" + suffix)):
+                if os.path.basename(path) != "config.json":
+                    stems.add(path[:-len(suffix)])
+
+        return [stem + extension for stem in sorted(stems)]
+
+    def _open_rotation_journal(self, data_dir: str, new_password: str) -> RotationJournal:
+        journal = RotationJournal(data_dir)
+        encryptor = self.repo.encryptor
+
+        if journal.load():
+            try:
+                verifier = base64.b64decode(journal.verifier())
+                matches = encryptor.decrypt(verifier, new_password) == ROTATION_VERIFIER
+            except (InvalidToken, ValueError, TypeError):
+                matches = False
+
+            if not matches:
+                raise ValueError("An interrupted password change to a different new password is pending.")
+            return journal
+
+        verifier = encryptor.encrypt(ROTATION_VERIFIER, new_password)
+        journal.start(base64.b64encode(verifier).decode('ascii'))
+        return journal
+
+    def _rotate_vault(self, file_path: str, new_password: str, journal: RotationJournal):
+        temp_repo = self.repo.sibling(file_path)
+        temp_repo.rotate_key(self.password, new_password)
+        journal.mark_completed(os.path.basename(file_path))
+
+    def has_pending_rotation(self) -> bool:
+        return RotationJournal(os.path.dirname(self.repo.filepath)).exists()
+
+    def change_master_password(self, new_password, progress=None, max_workers=None) -> tuple[int, list[str]]:
+        """
+        Re-wraps every vault in the data directory under the new password on a worker pool.
+        Completed vaults are recorded in a rotation journal, so running the same change
+        again after an interruption only processes the rest. The active vault goes last,
+        which keeps it readable with the current password until everything else is done.
+
+        If any vault fails, the active one is left alone, the journal is kept and the
+        current password stays in use, so the change can be retried for the rest.
+        """
+        self.repo.flush()
+
         current_vault_path = self.repo.filepath
         data_dir = os.path.dirname(current_vault_path)
+        current_filename = os.path.basename(current_vault_path)
+
+        journal = self._open_rotation_journal(data_dir, new_password)
+        completed = journal.completed()
 
-        all_files = glob.glob(os.path.join(data_dir, "*.json"))
+        all_files = self._vault_files(data_dir)
+        pending = [path for path in all_files if os.path.basename(path) not in completed]
+        others = [path for path in pending if os.path.basename(path) != current_filename]
+        active = [path for path in pending if os.path.basename(path) == current_filename]
 
-        success_count = 0
+        total = len(all_files)
+        success_count = total - len(pending)
         errors = []
-        
-        for file_path in all_files:
-            filename = os.path.basename(file_path)
 
-            if filename == "config.json":
-                continue
+        def finish(file_path, future):
+            nonlocal success_count
+            filename = os.path.basename(file_path)
 
             try:
-                temp_repo = self.repo.__class__(
-                    filepath=file_path, 
-                    encryptor=self.repo.encryptor,
-                    migrator=getattr(self.repo, 'migrator', None) 
-                )
-
-                data = temp_repo.load_data(self.password)
-
-                export_data = {}
-                for k, cred in data.items():
-                    export_data[k] = {
-                        "service_name": cred.service_name,
-                        "username": cred.username,
-                        "password": cred.password
-                    }
-                
-                temp_repo.save_data(export_data, new_password)
-                
+                future.result()
                 success_count += 1
-
             except Exception as e:
                 errors.append(f"{filename} (Sync failed): {e}")
 
+            if progress:
+                progress(success_count + len(errors), total, filename)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vault-rotation")
+        try:
+            futures = {executor.submit(self._rotate_vault, path, new_password, journal): path for path in others}
+            for future in as_completed(futures):
+                finish(futures[future], future)
+
+            if not errors:
+                for path in active:
+                    finish(path, executor.submit(self._rotate_vault, path, new_password, journal))
+
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if errors:
+            return success_count, errors
+
+        journal.clear()
+        self.repo.encryptor.rekey(self.password)
         self.password = new_password
 
         return success_count, errors
     
+    def flush(self):
+        self.repo.flush()
+
+    def take_write_error(self) -> str | None:
+        error = self.repo.take_write_error()
+        return str(error) if error is not None else None
+
     def import_credentials(self, new_data: dict) -> tuple[bool, int]:
         count = 0
+        imported_keys = []
 
         for key, details in new_data.items():
             if isinstance(details, dict) and 'username' in details and 'password' in details:
                 service_name = details.get('service_name', key) 
                 
+                self._remember(key)
                 self.credentials[key] = Credential(
                     service_name=service_name,
                     username=details['username'],
                     password=details['password']
                 )
+                self._index_credential(key, self.credentials[key])
 
+                imported_keys.append(key)
                 count+=1
 
         if count > 0:
-            self._save_credentials()
+            self._save_credentials(imported_keys)
             return True, count
         return False, 0
 
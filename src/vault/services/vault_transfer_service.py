@@ -1,29 +1,136 @@
-import json
+import io
+import os
+import time
+from ..models.credential import Credential
+from ..models.credential_map import CredentialMap
+from ..models.import_summary import ImportSummary
+from ..utils.atomic_file import atomic_writer
+from ..utils.export_writers import get_writer, select_fields
+from ..utils.import_readers import detect_format, get_reader
 from ..interfaces.vault_service_interface import IVaultService
 
+IMPORT_CHUNK_SIZE = 1000
+EXPORT_PROGRESS_INTERVAL = 1000
+
+
 class VaultTransferService:
     def __init__(self, vault: IVaultService):
         self.vault = vault
 
-    def export_to_file(self, filepath: str):
+    def _iter_records(self, progress=None):
         data = self.vault.list_all_credentials()
-        export_data = {}
+        # A local vault hands back its stored records directly, without building Credential objects.
+        records = data.records() if isinstance(data, CredentialMap) else ((key, cred.to_dict()) for key, cred in data.items())
+        total = len(data)
+
+        for done, item in enumerate(records, 1):
+            yield item
+            if progress and (done % EXPORT_PROGRESS_INTERVAL == 0 or done == total):
+                progress(done, total, "credentials")
 
-        for key, cred in data.items():
-            export_data[key] = {
-                "service_name": cred.service_name,
-                "username": cred.username,
-                "password": cred.password
-            }
+    def export_to_file(self, filepath: str, file_format: str | None = None, fields=None, progress=None) -> bool:
+        """
+        Streams the vault into a JSON, NDJSON or CSV file, record by record, optionally
+        limited to some fields. The file is written beside the target and renamed into
+        place, so a failed export never leaves a partial file behind.
+        """
+        writer = get_writer(file_format or detect_format(filepath))
+        fields = select_fields(fields)
 
-        with open(filepath, 'w') as f:
-            json.dump(export_data, f, indent=4)
+        with atomic_writer(filepath, fsync=False) as f:
+            stream = io.TextIOWrapper(f, encoding='utf-8', newline='')
+            writer(self._iter_records(progress), stream, fields)
+            stream.flush()
+            stream.detach()
             
         return True
 
-    def import_from_file(self, filepath: str):
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+    @staticmethod
+    def _normalise(key: str | None, details) -> tuple[str, dict] | None:
+        if not isinstance(details, dict):
+            return None
+
+        service_name = details.get('service_name') or key
+        username = details.get('username')
+        password = details.get('password')
+
+        if not isinstance(service_name, str) or not service_name.strip():
+            return None
+        if not isinstance(username, str) or not isinstance(password, str):
+            return None
+
+        record = {"service_name": service_name, "username": username, "password": password}
+        return key if key is not None else service_name.lower(), record
+
+    def read_credentials(self, filepath: str, file_format: str | None = None) -> list[Credential]:
+        reader = get_reader(file_format or detect_format(filepath))
+        credentials = []
+
+        with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+            for key, details in reader(f):
+                entry = self._normalise(key, details)
+                if entry:
+                    record = entry[1]
+                    credentials.append(Credential(record["service_name"], record["username"], record["password"]))
+
+        return credentials
+
+    def import_from_file(self, filepath: str, file_format: str | None = None, chunk_size: int = IMPORT_CHUNK_SIZE,
+                         progress=None, dry_run: bool = False) -> ImportSummary:
+        """
+        Streams records from a JSON, NDJSON or CSV file into the vault chunk_size at a time.
+        Each chunk is imported in its own transaction, so a chunk is saved whole or not at all
+        and memory stays bounded by the chunk; if the file turns out to be broken part way,
+        the chunks before the error stay imported. Besides the current chunk only the keys
+        read from the file are held, and each new key is checked against the vault on its own.
+        progress, if given, is called as progress(kib_read, kib_total, label) after every
+        chunk. A dry run parses and validates the whole file and counts conflicts without
+        changing the vault.
+        """
+        reader = get_reader(file_format or detect_format(filepath))
+        summary = ImportSummary(dry_run=dry_run)
+        seen = set()
+        total_kib = -(-os.path.getsize(filepath) // 1024)
+        start = time.perf_counter()
+        chunk = {}
+
+        def report(f):
+            summary.elapsed = time.perf_counter() - start
+            if progress:
+                done_kib = min(-(-f.buffer.tell() // 1024), total_kib)
+                progress(done_kib, total_kib, f"KiB  {summary.imported:,} records, {summary.rate:,.0f}/s")
+
+        def commit():
+            with self.vault.transaction():
+                self.vault.import_credentials(chunk)
+
+        with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+            for key, details in reader(f):
+                entry = self._normalise(key, details)
+                if entry is None:
+                    summary.invalid += 1
+                    continue
+
+                key, record = entry
+                if key in seen or self.vault.get_credential(key) is not None:
+                    summary.conflicts += 1
+                seen.add(key)
+                summary.imported += 1
+
+                if not dry_run:
+                    chunk[key] = record
+
+                if (summary.imported + summary.invalid) % chunk_size == 0:
+                    if chunk:
+                        commit()
+                        chunk = {}
+                    report(f)
+
+            if chunk:
+                commit()
+
+        summary.elapsed = time.perf_counter() - start
+        if progress:
+            progress(total_kib, total_kib, f"KiB  {summary.imported:,} records, {summary.rate:,.0f}/s")
 
-        success, count = self.vault.import_credentials(data)
-        return success, count
+        return summary
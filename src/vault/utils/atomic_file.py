@@ -0,0 +1,47 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+
+@contextmanager
+def atomic_writer(filepath: str, fsync: bool = True, suffix: str | None = None) -> Iterator[BinaryIO]:
+    """
+    Yields a file in the same directory as filepath and renames it over filepath once the
+    block completes, so readers only ever see the old or the new contents. If the block
+    raises, the temporary file is removed and filepath is left alone. The temporary file
+    is named after filepath unless suffix is given.
+    """
+    directory = os.path.dirname(filepath) or "."
+    suffix = os.path.basename(filepath) if suffix is None else suffix
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=suffix)
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+
+        os.replace(temp_path, filepath)
+
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def atomic_write(filepath: str, data: bytes, fsync: bool = True) -> None:
+    """
+    Writes data to a temporary file in the same directory and renames it over filepath,
+    so readers only ever see the old or the new contents.
+    """
+    with atomic_writer(filepath, fsync) as f:
+        f.write(data)
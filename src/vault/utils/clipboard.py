@@ -1,5 +1,7 @@
-import pyperclip
 from ..interfaces.user_io_interface import IClipboard
+from .lazy_import import lazy_import
+
+pyperclip = lazy_import("pyperclip")
 
 class SystemClipboard(IClipboard):
     def copy_to_clipboard(self, text: str):
@@ -7,4 +9,3 @@ class SystemClipboard(IClipboard):
 
     def clear_clipboard(self):
         return pyperclip.copy("")
-
@@ -0,0 +1,120 @@
+import lzma
+import zlib
+from abc import abstractmethod
+from typing import Iterable, Iterator
+from ..interfaces.compression_codec_interface import ICompressionCodec
+from .profiling import profiler
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+
+class NoCompression(ICompressionCodec):
+    NAME = "none"
+
+    def compress(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        return iter(chunks)
+
+    def decompress(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        return iter(chunks)
+
+
+class _StreamingCodec(ICompressionCodec):
+    """
+    Runs chunks through a compressor or decompressor object one at a time, so only the
+    current chunk and the codec's own window are held in memory.
+    """
+
+    @abstractmethod
+    def _compressor(self):
+        pass
+
+    @abstractmethod
+    def _decompressor(self):
+        pass
+
+    def compress(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = self._compressor()
+
+        for chunk in chunks:
+            with profiler.phase("payload.compress"):
+                compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+
+        with profiler.phase("payload.compress"):
+            compressed = compressor.flush()
+        yield compressed
+
+    def decompress(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        decompressor = self._decompressor()
+
+        for chunk in chunks:
+            with profiler.phase("payload.decompress"):
+                decompressed = decompressor.decompress(chunk)
+            if decompressed:
+                yield decompressed
+
+        if not decompressor.eof:
+            raise ValueError(f"{self.NAME} stream ends before its end marker.")
+
+
+class ZlibCodec(_StreamingCodec):
+    NAME = "zlib"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def _compressor(self):
+        return zlib.compressobj(self.level)
+
+    def _decompressor(self):
+        return zlib.decompressobj()
+
+
+class LzmaCodec(_StreamingCodec):
+    NAME = "lzma"
+
+    def __init__(self, preset: int = 6):
+        self.preset = preset
+
+    def _compressor(self):
+        return lzma.LZMACompressor(preset=self.preset)
+
+    def _decompressor(self):
+        return lzma.LZMADecompressor()
+
+
+class ZstdCodec(_StreamingCodec):
+    """
+    Needs the standard library's compression.zstd module (Python 3.14 and later).
+    """
+
+    NAME = "zstd"
+
+    def __init__(self, level: int = 3):
+        if zstd is None:
+            raise ValueError("zstd compression needs Python 3.14 or later.")
+        self.level = level
+
+    def _compressor(self):
+        return zstd.ZstdCompressor(level=self.level)
+
+    def _decompressor(self):
+        return zstd.ZstdDecompressor()
+
+
+CODECS = {codec.NAME: codec for codec in (NoCompression, ZlibCodec, LzmaCodec, ZstdCodec)}
+
+
+def available_codecs() -> list[str]:
+    return [name for name in CODECS if name != ZstdCodec.NAME or zstd is not None]
+
+
+def get_codec(name: str) -> ICompressionCodec:
+    try:
+        return CODECS[name]()
+    except KeyError:
+        raise ValueError(f"Unsupported vault compression: {name}")
@@ -1,75 +1,330 @@
+import io
 import os
 import base64
-import hashlib
 import hmac
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.backends import default_backend
+import json
+import shutil
+import struct
+import threading
+from typing import BinaryIO, Iterable, Iterator
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from ..interfaces.encryption_interface import IDataEncryptor, IPasswordHasher
+from .kdf import DEFAULT_KDF, KDF_FIELDS, derive, format_params, normalise_kdf, parse_params
+from .profiling import profiler
+
+VAULT_MAGIC = b"CVLT"
+VAULT_FORMAT_VERSION = 2
+STREAM_FORMAT_VERSION = 3
+SUPPORTED_VERSIONS = (VAULT_FORMAT_VERSION, STREAM_FORMAT_VERSION)
+ENVELOPE_PREFIX = struct.Struct(">4sBI")
+MAX_HEADER_SIZE = 64 * 1024
+
+SEGMENT_SIZE = 64 * 1024
+SEGMENT_TAG_SIZE = 16
+NONCE_PREFIX_SIZE = 7
+SEGMENT_NONCE = struct.Struct(">IB")
+
+
+def is_envelope(blob: bytes) -> bool:
+    return blob[:len(VAULT_MAGIC)] == VAULT_MAGIC
+
+def envelope_version(blob: bytes) -> int | None:
+    if len(blob) < ENVELOPE_PREFIX.size or not is_envelope(blob):
+        return None
+    return ENVELOPE_PREFIX.unpack_from(blob)[1]
+
+def pack_header(header: dict, version: int = VAULT_FORMAT_VERSION) -> bytes:
+    header_bytes = json.dumps(header, separators=(",", ":")).encode('utf-8')
+    return ENVELOPE_PREFIX.pack(VAULT_MAGIC, version, len(header_bytes)) + header_bytes
+
+def pack_envelope(header: dict, payload: bytes) -> bytes:
+    return pack_header(header) + payload
+
+def read_header(source: BinaryIO) -> tuple[int, dict]:
+    """
+    Reads the envelope prefix and header from source, leaving it positioned at the payload.
+    """
+    prefix = source.read(ENVELOPE_PREFIX.size)
+    version = envelope_version(prefix)
+    if version not in SUPPORTED_VERSIONS:
+        raise InvalidToken
+
+    header_length = ENVELOPE_PREFIX.unpack_from(prefix)[2]
+    header_bytes = source.read(header_length) if header_length <= MAX_HEADER_SIZE else b""
+    if len(header_bytes) != header_length:
+        raise InvalidToken
+
+    try:
+        header = json.loads(header_bytes)
+    except ValueError:
+        raise InvalidToken
+
+    if not isinstance(header, dict):
+        raise InvalidToken
+
+    return version, header
+
+def read_head(source: BinaryIO) -> bytes:
+    """
+    Returns the envelope prefix and header bytes from source, or just the first bytes
+    if it does not start with an envelope.
+    """
+    prefix = source.read(ENVELOPE_PREFIX.size)
+    if envelope_version(prefix) is None:
+        return prefix
+
+    header_length = ENVELOPE_PREFIX.unpack_from(prefix)[2]
+    return prefix + source.read(min(header_length, MAX_HEADER_SIZE))
+
+def payload_info(head: bytes) -> dict | None:
+    """
+    Describes the payload of the envelope starting with head: its record format and the
+    compression applied before encryption. Single-token envelopes hold one uncompressed
+    JSON document; segmented ones record both in their header.
+    """
+    try:
+        version, header = read_header(io.BytesIO(head))
+    except InvalidToken:
+        return None
+
+    if version == VAULT_FORMAT_VERSION:
+        return {"format": "json", "compression": "none"}
+    return {"format": header.get("format", "jsonl"), "compression": header.get("compression", "none")}
+
+def unpack_envelope(blob: bytes) -> tuple[dict, bytes]:
+    source = io.BytesIO(blob)
+    _, header = read_header(source)
+    return header, blob[source.tell():]
+
 
 class FernetDataEncryptor(IDataEncryptor):
     """
     Handles symmetric encryption for the Vault data.
+    The payload is encrypted with a random data key, and only a small header wraps
+    that key under the master-derived key, so a password change rewrites the header alone.
+    Derived keys are cached per (password, salt, KDF parameters) for the lifetime of the
+    encryptor, and saves reuse the salt of the vault last opened with the same password.
+    The header records the KDF and its cost; envelopes are opened with the parameters they
+    record and written with the configured ones, so a vault moves to new settings on its
+    next save.
+
+    encrypt_stream writes the segmented format: the plaintext is cut into SEGMENT_SIZE pieces,
+    each sealed with AES-GCM under a nonce made of a random per-file prefix, the segment
+    counter and a flag that is set only on the last segment. Reordered, dropped or truncated
+    segments fail authentication, and neither side holds more than a segment at a time.
     """
-    def derive_key(self, password: str, salt: bytes) -> bytes:
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-            backend=default_backend()
-        )
-        return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+    def __init__(self, kdf: dict | None = None):
+        self.kdf = normalise_kdf(kdf)
+        self._key_cache: dict[tuple[str, bytes, tuple], bytes] = {}
+        self._session_salts: dict[str, bytes] = {}
+        self._salt_lock = threading.Lock()
 
-    def encrypt(self, data: str, password: str) -> bytes:
-        salt = os.urandom(16)
-        key = self.derive_key(password, salt)
-        f = Fernet(key)
+    def derive_key(self, password: str, salt: bytes, params: dict | None = None) -> bytes:
+        with profiler.phase("encryptor.kdf"):
+            return base64.urlsafe_b64encode(derive(params or self.kdf, password.encode(), salt))
+
+    def _get_key(self, password: str, salt: bytes, params: dict) -> bytes:
+        cache_key = (password, salt, tuple(params.items()))
+        key = self._key_cache.get(cache_key)
+
+        if key is None:
+            key = self.derive_key(password, salt, params)
+            self._key_cache[cache_key] = key
+
+        return key
+
+    def rekey(self, password: str | None = None) -> None:
+        if password is None:
+            self._key_cache.clear()
+            self._session_salts.clear()
+            return
+
+        self._session_salts.pop(password, None)
+        for cache_key in [k for k in self._key_cache if k[0] == password]:
+            del self._key_cache[cache_key]
+
+    def _session_salt(self, password: str) -> bytes:
+        with self._salt_lock:
+            salt = self._session_salts.get(password)
+            if salt is None:
+                salt = os.urandom(16)
+                self._session_salts[password] = salt
+
+        return salt
 
-        encrypted_data = f.encrypt(data.encode('utf-8'))
-        return salt + encrypted_data
+    def _wrap_key(self, data_key: bytes, password: str) -> dict:
+        salt = self._session_salt(password)
+        wrapped_key = Fernet(self._get_key(password, salt, self.kdf)).encrypt(data_key)
 
-    def decrypt(self, encrypted_data_with_salt: bytes, password: str) -> str:
-        salt = encrypted_data_with_salt[:16]
-        key = self.derive_key(password, salt)
+        return {
+            **self.kdf,
+            "salt": base64.b64encode(salt).decode('ascii'),
+            "key": wrapped_key.decode('ascii')
+        }
 
-        f = Fernet(key)
-        encrypted_data = encrypted_data_with_salt[16:]
-        decrypted_data = f.decrypt(encrypted_data)
+    def _unwrap_key(self, header: dict, password: str) -> bytes:
+        try:
+            salt = base64.b64decode(header["salt"])
+            wrapped_key = header["key"].encode('ascii')
+            params = normalise_kdf({field: header[field] for field in KDF_FIELDS if field in header})
+        except (KeyError, ValueError, TypeError, AttributeError):
+            raise InvalidToken
+
+        data_key = Fernet(self._get_key(password, salt, params)).decrypt(wrapped_key)
+
+        self._session_salts[password] = salt
+        return data_key
+
+    def encrypt(self, data: str, password: str) -> bytes:
+        data_key = Fernet.generate_key()
+        payload = Fernet(data_key).encrypt(data.encode('utf-8'))
 
+        return pack_envelope(self._wrap_key(data_key, password), payload)
+
+    def decrypt(self, encrypted_data: bytes, password: str) -> str:
+        decrypted_data = b"".join(self.decrypt_stream(io.BytesIO(encrypted_data), password))
         return decrypted_data.decode('utf-8')
 
+    def rewrap(self, encrypted_data: bytes, old_password: str, new_password: str) -> bytes:
+        target = io.BytesIO()
+        self.rewrap_stream(io.BytesIO(encrypted_data), target, old_password, new_password)
+        return target.getvalue()
+
+    @staticmethod
+    def _segment_nonce(prefix: bytes, index: int, last: bool) -> bytes:
+        return prefix + SEGMENT_NONCE.pack(index, last)
+
+    def encrypt_stream(self, chunks: Iterable[bytes], password: str, target: BinaryIO,
+                       metadata: dict | None = None) -> None:
+        data_key = AESGCM.generate_key(bit_length=256)
+        prefix = os.urandom(NONCE_PREFIX_SIZE)
+        aead = AESGCM(data_key)
+
+        header = self._wrap_key(data_key, password)
+        header.update({
+            "cipher": "aes-256-gcm",
+            "segment_size": SEGMENT_SIZE,
+            "nonce": base64.b64encode(prefix).decode('ascii')
+        })
+        header.update(metadata or {})
+        target.write(pack_header(header, STREAM_FORMAT_VERSION))
+
+        buffer = bytearray()
+        index = 0
+
+        for chunk in chunks:
+            buffer += chunk
+
+            # A full segment is only sealed once more data follows it, so the last one can carry the flag.
+            while len(buffer) > SEGMENT_SIZE:
+                with profiler.phase("encryptor.encrypt"):
+                    sealed = aead.encrypt(self._segment_nonce(prefix, index, False), bytes(buffer[:SEGMENT_SIZE]), None)
+                target.write(sealed)
+                del buffer[:SEGMENT_SIZE]
+                index += 1
+
+        with profiler.phase("encryptor.encrypt"):
+            sealed = aead.encrypt(self._segment_nonce(prefix, index, True), bytes(buffer), None)
+        target.write(sealed)
+
+    def decrypt_stream(self, source: BinaryIO, password: str) -> Iterator[bytes]:
+        """
+        Yields the plaintext of an envelope read from source, one segment at a time.
+        Raises InvalidToken from the iteration if any segment fails to authenticate.
+        """
+        version, header = read_header(source)
+        data_key = self._unwrap_key(header, password)
+
+        if version == VAULT_FORMAT_VERSION:
+            token = source.read()
+            with profiler.phase("encryptor.decrypt"):
+                plaintext = Fernet(data_key).decrypt(token)
+            yield plaintext
+            return
+
+        try:
+            segment_size = int(header["segment_size"]) + SEGMENT_TAG_SIZE
+            prefix = base64.b64decode(header["nonce"])
+        except (KeyError, ValueError, TypeError):
+            raise InvalidToken
+
+        if len(prefix) != NONCE_PREFIX_SIZE or segment_size <= SEGMENT_TAG_SIZE:
+            raise InvalidToken
+
+        aead = AESGCM(data_key)
+        segment = source.read(segment_size)
+        index = 0
+
+        while True:
+            following = source.read(segment_size) if len(segment) == segment_size else b""
+            last = not following
+
+            try:
+                with profiler.phase("encryptor.decrypt"):
+                    plaintext = aead.decrypt(self._segment_nonce(prefix, index, last), segment, None)
+            except (InvalidTag, ValueError):
+                raise InvalidToken
+
+            yield plaintext
+
+            if last:
+                return
+
+            segment = following
+            index += 1
+
+    def rewrap_stream(self, source: BinaryIO, target: BinaryIO, old_password: str, new_password: str) -> None:
+        version, header = read_header(source)
+        data_key = self._unwrap_key(header, old_password)
+
+        for field in KDF_FIELDS:
+            header.pop(field, None)
+        header.update(self._wrap_key(data_key, new_password))
+        target.write(pack_header(header, version))
+        shutil.copyfileobj(source, target)
+
 
 class Pbkdf2PasswordHasher(IPasswordHasher):
     """
     Handles one-way hashing for the Master Password.
+    Hashes are stored as "<kdf>$<parameters>$<salt hex>$<hash hex>", so each one records
+    how it was derived. Bare hex hashes from earlier versions used the default PBKDF2
+    settings; needs_rehash reports those and hashes made with other than the configured KDF.
     """
+    def __init__(self, kdf: dict | None = None):
+        self.kdf = normalise_kdf(kdf)
+
     def hash_password(self, password: str) -> str:
         salt = os.urandom(16)
-        password_hash = hashlib.pbkdf2_hmac(
-            'sha256',
-            password.encode('utf-8'),
-            salt,
-            100000
-        )
+        password_hash = derive(self.kdf, password.encode('utf-8'), salt)
+
+        return f"{self.kdf['kdf']}${format_params(self.kdf)}${salt.hex()}${password_hash.hex()}"
+
+    @staticmethod
+    def _parse(stored_hash: str) -> tuple[dict, bytes, bytes]:
+        if "$" not in stored_hash:
+            stored_bytes = bytes.fromhex(stored_hash)
+            return dict(DEFAULT_KDF), stored_bytes[:16], stored_bytes[16:]
 
-        return (salt + password_hash).hex()
+        name, params, salt, password_hash = stored_hash.split("$")
+        return parse_params(name, params), bytes.fromhex(salt), bytes.fromhex(password_hash)
 
     def verify_password(self, password_attempt: str, stored_hex_hash: str) -> bool:
         try:
-            stored_bytes = bytes.fromhex(stored_hex_hash)
-            salt = stored_bytes[:16]
-            stored_hash = stored_bytes[16:]
-            
-            attempt_hash = hashlib.pbkdf2_hmac(
-                'sha256',
-                password_attempt.encode('utf-8'),
-                salt,
-                100000
-            )
+            params, salt, stored_hash = self._parse(stored_hex_hash)
+            attempt_hash = derive(params, password_attempt.encode('utf-8'), salt, len(stored_hash))
             return hmac.compare_digest(attempt_hash, stored_hash)
         
         except (ValueError, TypeError):
-            return False
\ No newline at end of file
+            return False
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        try:
+            params, _, _ = self._parse(stored_hash)
+        except (ValueError, TypeError):
+            return False
+
+        return "$" not in stored_hash or params != self.kdf
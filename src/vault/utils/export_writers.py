@@ -0,0 +1,60 @@
+"""
+Streaming writers for credential exports. Each writer takes (key, record) pairs and
+writes them one at a time, so an export never builds a second copy of the vault.
+"""
+import csv
+import json
+from typing import Iterable, TextIO
+
+FIELDS = ("service_name", "username", "password")
+
+
+def select_fields(fields: Iterable[str] | None) -> tuple[str, ...]:
+    if not fields:
+        return FIELDS
+
+    fields = tuple(fields)
+    unknown = [field for field in fields if field not in FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown export field: {', '.join(unknown)}")
+    return fields
+
+
+def write_json(records: Iterable[tuple[str, dict]], stream: TextIO, fields: tuple[str, ...] = FIELDS) -> None:
+    # The export layout (keyed by service), compact, one record per line.
+    separator = "\n"
+    stream.write("{")
+
+    for key, record in records:
+        value = json.dumps({field: record[field] for field in fields}, separators=(",", ":"))
+        stream.write(f"{separator}{json.dumps(key)}:{value}")
+        separator = ",\n"
+
+    stream.write("\n}\n")
+
+
+def write_ndjson(records: Iterable[tuple[str, dict]], stream: TextIO, fields: tuple[str, ...] = FIELDS) -> None:
+    for _, record in records:
+        stream.write(json.dumps({field: record[field] for field in fields}, separators=(",", ":")) + "\n")
+
+
+def write_csv(records: Iterable[tuple[str, dict]], stream: TextIO, fields: tuple[str, ...] = FIELDS) -> None:
+    writer = csv.writer(stream)
+    writer.writerow(fields)
+
+    for _, record in records:
+        writer.writerow([record[field] for field in fields])
+
+
+WRITERS = {
+    "json": write_json,
+    "ndjson": write_ndjson,
+    "csv": write_csv,
+}
+
+
+def get_writer(name: str):
+    try:
+        return WRITERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown export format: {name}") from None
@@ -0,0 +1,148 @@
+"""
+Streaming readers for credential import files. Each reader yields (key, details) pairs
+one record at a time, so an import never holds the whole file in memory. key is None
+when the file does not name one (list layouts, NDJSON and CSV rows).
+"""
+import csv
+import json
+import os
+from typing import Iterator, TextIO
+
+READ_CHUNK_SIZE = 64 * 1024
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+# A decode error this close to the end of the buffer may just be a value cut off by the chunk.
+TRUNCATION_MARGIN = 16
+
+CSV_COLUMNS = {
+    "service_name": ("service_name", "service", "name", "title"),
+    "username": ("username", "login_username", "login", "email"),
+    "password": ("password", "login_password"),
+}
+
+
+def iter_ndjson(stream: TextIO) -> Iterator[tuple[str | None, object]]:
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield None, json.loads(line)
+
+
+def iter_csv(stream: TextIO) -> Iterator[tuple[str | None, object]]:
+    reader = csv.reader(stream)
+    header = [name.strip().lower() for name in next(reader, [])]
+
+    # Exports from other managers name the columns differently; take the first alias present.
+    columns = {}
+    for field, aliases in CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in header:
+                columns[field] = header.index(alias)
+                break
+
+    for row in reader:
+        if not any(row):
+            continue
+        yield None, {field: row[index] for field, index in columns.items() if index < len(row)}
+
+
+def iter_json(stream: TextIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[tuple[str | None, object]]:
+    """
+    Incrementally parses a JSON object of records keyed by service (the export layout)
+    or a JSON array of records, decoding one value at a time from a sliding buffer.
+    More data is only read when a value runs off the end of the buffer, so a syntax error
+    fails at once and the buffer never holds more than one value of up to MAX_RECORD_SIZE.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+
+        data = stream.read(chunk_size)
+        if not data:
+            eof = True
+            return False
+
+        buffer = buffer[pos:] + data
+        pos = 0
+        return True
+
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return buffer[pos:pos + 1]
+
+    def expect(chars: str) -> str:
+        nonlocal pos
+        char = peek()
+        if not char or char not in chars:
+            raise ValueError(f"Invalid JSON import file: expected one of {chars!r}, found {char or 'end of file'!r}.")
+        pos += 1
+        return char
+
+    def value():
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                result, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                truncated = e.pos >= len(buffer) - TRUNCATION_MARGIN or e.msg.startswith("Unterminated string")
+                if truncated and len(buffer) - pos <= MAX_RECORD_SIZE and fill():
+                    continue
+                raise ValueError(f"Invalid JSON import file: {e.msg}.") from None
+
+            # A value that stops at the end of the buffer (a number, say) may continue in the next chunk.
+            if end == len(buffer) and fill():
+                continue
+
+            pos = end
+            return result
+
+    opening = expect("{[")
+    closing = "}" if opening == "{" else "]"
+
+    if peek() == closing:
+        return
+
+    while True:
+        if opening == "{":
+            key = value()
+            expect(":")
+            yield key, value()
+        else:
+            yield None, value()
+
+        if expect("," + closing) == closing:
+            return
+
+
+READERS = {
+    "json": iter_json,
+    "ndjson": iter_ndjson,
+    "csv": iter_csv,
+}
+
+EXTENSIONS = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+}
+
+
+def detect_format(filepath: str) -> str:
+    return EXTENSIONS.get(os.path.splitext(filepath)[1].lower(), "json")
+
+
+def get_reader(name: str):
+    try:
+        return READERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown import format: {name}") from None
@@ -0,0 +1,138 @@
+"""
+Password-based key derivation with tunable, recorded parameters. A parameter dict names
+the algorithm under "kdf" alongside its cost settings, and is stored next to every salt
+(in vault envelope headers and the master hash), so files written with older settings
+stay readable after the configured ones change.
+"""
+import hashlib
+import math
+import os
+import time
+
+PBKDF2 = "pbkdf2-sha256"
+SCRYPT = "scrypt"
+
+PARAMETERS = {
+    PBKDF2: {"iterations": 100000},
+    SCRYPT: {"n": 2 ** 15, "r": 8, "p": 1},
+}
+KDF_FIELDS = ("kdf", "iterations", "n", "r", "p")
+LIMITS = {
+    "iterations": (1000, 100000000),
+    "n": (2 ** 10, 2 ** 24),
+    "r": (1, 32),
+    "p": (1, 16),
+}
+MAX_SCRYPT_MEMORY = 1024 * 1024 * 1024
+
+DEFAULT_KDF = {"kdf": PBKDF2, **PARAMETERS[PBKDF2]}
+
+# Calibration never picks settings cheaper than the defaults, even when a slow machine then
+# misses the target; the caller measures the result and reports that case.
+MIN_CALIBRATED = {PBKDF2: 100000, SCRYPT: 2 ** 15}
+CALIBRATION_PROBE_SECONDS = 0.05
+
+
+def normalise_kdf(params: dict | None) -> dict:
+    """
+    Returns the validated parameters for params' algorithm, taking the defaults for any
+    setting it leaves out. Raises ValueError for an unknown algorithm or a cost outside
+    the supported range, which guards against headers that would take hours to derive.
+    """
+    if not params:
+        return dict(DEFAULT_KDF)
+
+    name = params.get("kdf", PBKDF2)
+    if name not in PARAMETERS:
+        raise ValueError(f"Unknown KDF: {name}")
+
+    result = {"kdf": name}
+    for field, default in PARAMETERS[name].items():
+        try:
+            value = int(params.get(field, default))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {name} parameter {field}: {params.get(field)!r}") from None
+
+        low, high = LIMITS[field]
+        if not low <= value <= high:
+            raise ValueError(f"{name} parameter {field} must be between {low} and {high}.")
+        result[field] = value
+
+    if name == SCRYPT:
+        if result["n"] & (result["n"] - 1):
+            raise ValueError("scrypt parameter n must be a power of two.")
+        if scrypt_memory(result["n"], result["r"], result["p"]) > MAX_SCRYPT_MEMORY:
+            raise ValueError("scrypt parameters need more than 1 GiB of memory.")
+
+    return result
+
+
+def scrypt_memory(n: int, r: int, p: int) -> int:
+    return 128 * r * (n + p + 2)
+
+
+def derive(params: dict, password: bytes, salt: bytes, length: int = 32) -> bytes:
+    if params["kdf"] == SCRYPT:
+        n, r, p = params["n"], params["r"], params["p"]
+        return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p,
+                              maxmem=scrypt_memory(n, r, p) + 1024 * 1024, dklen=length)
+
+    return hashlib.pbkdf2_hmac("sha256", password, salt, params["iterations"], length)
+
+
+def format_params(params: dict) -> str:
+    return ",".join(f"{field}={params[field]}" for field in PARAMETERS[params["kdf"]])
+
+
+def parse_params(name: str, text: str) -> dict:
+    try:
+        fields = dict(item.split("=", 1) for item in text.split(",") if item)
+    except ValueError:
+        raise ValueError(f"Invalid KDF parameters: {text!r}") from None
+    return normalise_kdf({"kdf": name, **fields})
+
+
+def _time_derivation(params: dict, rounds: int = 3) -> float:
+    salt = os.urandom(16)
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        derive(params, b"calibration", salt)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure(params: dict) -> float:
+    return _time_derivation(params, rounds=1)
+
+
+def calibrate(algorithm: str = PBKDF2, target_seconds: float = 0.25) -> dict:
+    """
+    Returns parameters for algorithm whose single derivation takes about target_seconds
+    on this machine. PBKDF2 and scrypt both scale linearly with their cost setting, so one
+    timed probe is extrapolated; scrypt's n is rounded down to a power of two.
+    """
+    if algorithm not in PARAMETERS:
+        raise ValueError(f"Unknown KDF: {algorithm}")
+
+    if algorithm == SCRYPT:
+        probe = {"kdf": SCRYPT, "n": 2 ** 14, "r": 8, "p": 1}
+        elapsed = _time_derivation(probe)
+
+        exponent = math.floor(math.log2(max(probe["n"] * target_seconds / elapsed, 1)))
+        n = max(MIN_CALIBRATED[SCRYPT], 2 ** exponent)
+        while scrypt_memory(n, probe["r"], probe["p"]) > MAX_SCRYPT_MEMORY:
+            n //= 2
+        return normalise_kdf({**probe, "n": n})
+
+    # Grow the probe until it runs long enough for the timer to be meaningful.
+    probe = {"kdf": PBKDF2, "iterations": 10000}
+    elapsed = _time_derivation(probe)
+    while elapsed < CALIBRATION_PROBE_SECONDS and probe["iterations"] < LIMITS["iterations"][1] // 4:
+        probe["iterations"] *= 4
+        elapsed = _time_derivation(probe)
+
+    iterations = round(probe["iterations"] * target_seconds / elapsed, -3)
+    iterations = min(max(MIN_CALIBRATED[PBKDF2], int(iterations)), LIMITS["iterations"][1])
+    return normalise_kdf({"kdf": PBKDF2, "iterations": iterations})
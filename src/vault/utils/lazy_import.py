@@ -0,0 +1,22 @@
+import importlib.util
+import sys
+
+
+def lazy_import(name: str):
+    """
+    Returns the named module without executing it; the real import runs on first attribute access.
+    Used for heavy third-party dependencies that only some commands need.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,66 @@
+import io
+import json
+from cryptography.fernet import Fernet
+from ..interfaces.data_migrator_interface import IDataMigrator
+from ..interfaces.encryption_interface import IDataEncryptor
+from ..interfaces.record_serializer_interface import IRecordSerializer
+from ..interfaces.compression_codec_interface import ICompressionCodec
+from .compression import NoCompression
+from .encryptors import is_envelope, payload_info
+from .kdf import DEFAULT_KDF
+from .vault_payload import read_payload, write_payload
+
+
+class EnvelopeFormatMigrator(IDataMigrator):
+    """
+    Upgrades legacy vault files (a 16 byte salt followed by a Fernet token keyed
+    directly from the master password) to the envelope format written by the encryptor.
+
+    Given a serializer, it also rewrites envelopes whose records are stored in another
+    format or compressed with another codec, so a vault switches to the configured
+    payload the first time it is opened.
+    needs_upgrade only needs the envelope prefix and header, not the whole file.
+    """
+
+    LEGACY_SALT_SIZE = 16
+
+    def __init__(self, encryptor: IDataEncryptor, serializer: IRecordSerializer = None,
+                 codec: ICompressionCodec = None):
+        self.encryptor = encryptor
+        self.serializer = serializer
+        self.codec = codec or NoCompression()
+
+    def migrate(self, data: dict) -> dict:
+        return data
+
+    def needs_upgrade(self, raw: bytes) -> bool:
+        if not raw:
+            return False
+        if not is_envelope(raw):
+            return True
+
+        if self.serializer is None:
+            return False
+
+        info = payload_info(raw)
+        return info is not None and (info["format"], info["compression"]) != (self.serializer.FORMAT, self.codec.NAME)
+
+    def upgrade(self, raw: bytes, password: str) -> bytes:
+        if is_envelope(raw):
+            records = dict(read_payload(self.encryptor, io.BytesIO(raw), password))
+            return self._encrypt_records(records, password)
+
+        salt = raw[:self.LEGACY_SALT_SIZE]
+        # Legacy files were always keyed with the original PBKDF2 settings.
+        key = self.encryptor.derive_key(password, salt, DEFAULT_KDF)
+        data = Fernet(key).decrypt(raw[self.LEGACY_SALT_SIZE:])
+
+        if self.serializer is None:
+            return self.encryptor.encrypt(data.decode('utf-8'), password)
+
+        return self._encrypt_records(json.loads(data), password)
+
+    def _encrypt_records(self, records: dict, password: str) -> bytes:
+        target = io.BytesIO()
+        write_payload(self.encryptor, records, password, target, self.serializer, self.codec)
+        return target.getvalue()
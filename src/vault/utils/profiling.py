@@ -0,0 +1,174 @@
+"""
+Lightweight per-phase timers and counters. Instrumented code wraps its phases in
+profiler.phase(name) and bumps counters with profiler.count(name). While the profiler is
+disabled both return immediately, so the instrumentation costs an attribute check.
+
+Observers registered for a phase name are told how long each run of it took whether the
+profiler is enabled or not; phases nobody observes stay on the attribute-check path.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._enter(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._exit(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _ObservedPhase:
+    __slots__ = ("observers", "name", "start")
+
+    def __init__(self, observers: list, name: str):
+        self.observers = observers
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        for observer in self.observers:
+            observer(self.name, elapsed)
+        return False
+
+
+class Profiler:
+    """
+    Accumulates wall time and call counts per named phase on the thread that enabled it.
+    Phases may nest; each one's time is inclusive of the phases it contains, and the
+    report lists them in the order they first ran, indented under the enclosing phase.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.observers: dict[str, list] = {}
+        self.reset()
+
+    def reset(self):
+        self.timings: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.counters: dict[str, int] = {}
+        self.depths: dict[str, int] = {}
+        self._stack: list[str] = []
+        self._thread = None
+        self._started = time.perf_counter()
+        self._stopped = None
+
+    def enable(self):
+        self.reset()
+        self._thread = threading.get_ident()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self._stopped = time.perf_counter()
+
+    def add_observer(self, names, callback):
+        """
+        Calls callback(name, seconds) each time one of the named phases ends, on any thread.
+        """
+        for name in names:
+            self.observers.setdefault(name, []).append(callback)
+
+    def remove_observer(self, callback):
+        for name in list(self.observers):
+            self.observers[name] = [observer for observer in self.observers[name] if observer != callback]
+            if not self.observers[name]:
+                del self.observers[name]
+
+    def phase(self, name: str):
+        # Background writers and timers are left out, so the nesting stays that of the command.
+        if not self.enabled or threading.get_ident() != self._thread:
+            observers = self.observers.get(name)
+            return _ObservedPhase(observers, name) if observers else NULL_PHASE
+        return _Phase(self, name)
+
+    def count(self, name: str, amount: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def _enter(self, name: str):
+        self.depths.setdefault(name, len(self._stack))
+        self.timings.setdefault(name, 0.0)
+        self._stack.append(name)
+
+    def _exit(self, name: str, elapsed: float):
+        self._stack.pop()
+        # A phase re-entered inside itself (a KDF during a nested load, say) only counts once.
+        if name not in self._stack:
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+        for observer in self.observers.get(name, ()):
+            observer(name, elapsed)
+
+    def report(self) -> list[str]:
+        total = (self._stopped or time.perf_counter()) - self._started
+        top_level = sum(seconds for name, seconds in self.timings.items() if self.depths[name] == 0)
+
+        lines = [f"{'phase':<36} {'calls':>7} {'ms':>10} {'%':>6}"]
+        for name, seconds in self.timings.items():
+            label = "  " * self.depths[name] + name
+            lines.append(f"{label:<36} {self.calls.get(name, 0):>7} {seconds * 1000:>10.1f} {seconds / total:>6.1%}")
+
+        lines.append(f"{'(outside instrumented phases)':<36} {'':>7} {(total - top_level) * 1000:>10.1f} {(total - top_level) / total:>6.1%}")
+        lines.append(f"{'total':<36} {'':>7} {total * 1000:>10.1f}")
+
+        for name, value in self.counters.items():
+            lines.append(f"{name:<36} {value:>7}")
+
+        return lines
+
+
+profiler = Profiler()
+
+
+@contextmanager
+def profile_command(pstats_path: str | None = None):
+    """
+    Enables the profiler for the block, and cProfile as well when pstats_path is given,
+    whose stats are dumped there when the block ends.
+    """
+    profile = None
+    if pstats_path:
+        import cProfile
+        profile = cProfile.Profile()
+
+    profiler.enable()
+    if profile:
+        profile.enable()
+
+    try:
+        yield profiler
+    finally:
+        if profile:
+            profile.disable()
+            profile.dump_stats(pstats_path)
+        profiler.disable()
@@ -0,0 +1,192 @@
+import heapq
+import math
+from collections import Counter, defaultdict
+from itertools import chain
+from .lazy_import import lazy_import
+
+fuzz = lazy_import("thefuzz.fuzz")
+process = lazy_import("thefuzz.process")
+
+
+class ServiceNameIndex:
+    """
+    In-memory n-gram index over lowercased service names for fuzzy search.
+
+    fuzz.partial_ratio can match at most `overlap` characters, the characters (with multiplicity)
+    the query and the name share, so its score never exceeds 200 * overlap / (shorter + overlap).
+    Keys whose bound does not clear the threshold are never scored. Longer n-grams cannot give
+    that guarantee because partial_ratio also rewards scattered matches, so the grams are single
+    characters, posted once per occurrence ("a" for the first "a" in a name, "a" x2 for the second).
+    When the query's posting lists cover more entries than the vault holds, filtering would cost
+    more than it saves and every cached name is scored in one batch instead.
+
+    Ranked searches stop early: filtered candidates are scored in descending order of their bound
+    until no remaining bound can beat the k-th best score, and full scans walk the names
+    alphabetically, so they can stop after k perfect matches without changing the result.
+    """
+
+    def __init__(self, names: dict[str, str] | None = None):
+        self._names: dict[str, str] = {}
+        self._postings: dict[tuple[str, int], set[str]] = defaultdict(set)
+        self._sorted_names = None
+
+        for key, name in (names or {}).items():
+            self.add(key, name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._names
+
+    @staticmethod
+    def _grams(lowered: str):
+        for char, count in Counter(lowered).items():
+            for occurrence in range(1, count + 1):
+                yield (char, occurrence)
+
+    def name(self, key: str) -> str:
+        return self._names[key]
+
+    def add(self, key: str, name: str):
+        if key in self._names:
+            self.remove(key)
+
+        lowered = name.lower()
+        self._names[key] = lowered
+        self._sorted_names = None
+
+        for gram in self._grams(lowered):
+            self._postings[gram].add(key)
+
+    def remove(self, key: str):
+        lowered = self._names.pop(key, None)
+        if lowered is None:
+            return
+
+        self._sorted_names = None
+
+        for gram in self._grams(lowered):
+            postings = self._postings[gram]
+            postings.discard(key)
+            if not postings:
+                del self._postings[gram]
+
+    def _alphabetical_names(self) -> dict[str, str]:
+        if self._sorted_names is None:
+            self._sorted_names = dict(sorted(self._names.items()))
+        return self._sorted_names
+
+    def _upper_bound(self, query_length: int, key: str, overlap: int) -> float:
+        shorter = min(query_length, len(self._names[key]))
+        return 200 * overlap / (shorter + overlap)
+
+    def _overlaps(self, query: str, threshold: int) -> dict[str, int] | None:
+        postings = [self._postings.get(gram, ()) for gram in self._grams(query)]
+        if sum(len(keys) for keys in postings) > len(self._names):
+            return None
+
+        overlaps = Counter(chain.from_iterable(postings))
+        query_length = len(query)
+        names = self._names
+        limit = 200 - threshold
+
+        return {
+            key: overlap for key, overlap in overlaps.items()
+            if limit * overlap > threshold * min(query_length, len(names[key]))
+        }
+
+    def candidates(self, query: str, threshold: int) -> list[str] | None:
+        """
+        Returns the keys whose names could score above threshold against the lowercased query,
+        or None when scanning every name is cheaper than filtering.
+        """
+        if not query:
+            return [key for key, name in self._names.items() if not name]
+
+        overlaps = self._overlaps(query, threshold)
+        return None if overlaps is None else list(overlaps)
+
+    def search(self, query: str, threshold: int) -> dict[str, int]:
+        """
+        Returns the partial_ratio score of every key scoring above threshold.
+        """
+        query = query.lower()
+        if not query:
+            return {key: 100 for key, name in self._names.items() if not name}
+
+        keys = self.candidates(query, threshold)
+        choices = self._names if keys is None else {key: self._names[key] for key in keys}
+
+        matches = process.extractWithoutOrder(
+            query, choices, processor=None, scorer=fuzz.partial_ratio, score_cutoff=threshold
+        )
+        return {key: score for _, score, key in matches if score > threshold}
+
+    def rank(self, query: str, threshold: int, limit: int | None = None) -> list[tuple[str, int]]:
+        """
+        Returns up to limit (key, score) pairs scoring above threshold, best first,
+        with ties ordered by key.
+        """
+        query = query.lower()
+
+        if limit is not None and limit <= 0:
+            return []
+
+        if not query:
+            results = [(key, 100) for key, name in self._alphabetical_names().items() if not name]
+        else:
+            overlaps = self._overlaps(query, threshold)
+            if overlaps is None:
+                results = self._rank_scan(query, threshold, limit)
+            else:
+                results = self._rank_bounded(query, overlaps, threshold, limit)
+
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results if limit is None else results[:limit]
+
+    def _rank_scan(self, query: str, threshold: int, limit: int | None) -> list[tuple[str, int]]:
+        results = []
+        perfect = 0
+
+        matches = process.extractWithoutOrder(
+            query, self._alphabetical_names(), processor=None, scorer=fuzz.partial_ratio, score_cutoff=threshold
+        )
+        for _, score, key in matches:
+            if score <= threshold:
+                continue
+
+            results.append((key, score))
+            if score == 100:
+                perfect += 1
+                if limit is not None and perfect >= limit:
+                    break
+
+        return results
+
+    def _rank_bounded(self, query: str, overlaps: dict[str, int], threshold: int, limit: int | None) -> list[tuple[str, int]]:
+        query_length = len(query)
+        ordered = sorted(
+            ((self._upper_bound(query_length, key, overlap), key) for key, overlap in overlaps.items()),
+            key=lambda item: (-item[0], item[1])
+        )
+
+        results = []
+        top_scores = []
+
+        for bound, key in ordered:
+            if limit is not None and len(top_scores) >= limit and math.ceil(bound + 1e-6) < top_scores[0]:
+                break
+
+            score = fuzz.partial_ratio(query, self._names[key])
+            if score <= threshold:
+                continue
+
+            results.append((key, score))
+            if limit is not None:
+                if len(top_scores) < limit:
+                    heapq.heappush(top_scores, score)
+                elif score > top_scores[0]:
+                    heapq.heapreplace(top_scores, score)
+
+        return results
@@ -0,0 +1,170 @@
+import json
+import struct
+from itertools import accumulate
+from typing import Iterable, Iterator
+from ..interfaces.record_serializer_interface import IRecordSerializer
+from .profiling import profiler
+
+CHUNK_SIZE = 64 * 1024
+
+
+class JsonDocumentSerializer(IRecordSerializer):
+    """
+    The whole vault as one JSON object, as written inside single-token (version 2) envelopes.
+    Decoding has to buffer the entire document.
+    """
+
+    FORMAT = "json"
+
+    def encode(self, records: dict) -> Iterator[bytes]:
+        yield json.dumps(records).encode('utf-8')
+
+    def decode(self, chunks: Iterable[bytes]) -> Iterator[tuple[str, dict]]:
+        data = b"".join(chunks)
+        with profiler.phase("payload.parse"):
+            records = json.loads(data)
+        yield from records.items()
+
+
+class JsonLinesSerializer(IRecordSerializer):
+    """
+    One [key, record] JSON array per line, emitted in chunks of about chunk_size bytes.
+    """
+
+    FORMAT = "jsonl"
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def encode(self, records: dict) -> Iterator[bytes]:
+        buffer = []
+        size = 0
+
+        for key, record in records.items():
+            line = (json.dumps([key, record], separators=(",", ":")) + "\n").encode('utf-8')
+            buffer.append(line)
+            size += len(line)
+
+            if size >= self.chunk_size:
+                yield b"".join(buffer)
+                buffer = []
+                size = 0
+
+        if buffer:
+            yield b"".join(buffer)
+
+    def decode(self, chunks: Iterable[bytes]) -> Iterator[tuple[str, dict]]:
+        pending = b""
+
+        for chunk in chunks:
+            complete, _, pending = (pending + chunk).rpartition(b"\n")
+
+            # json.dumps never emits a raw newline, so the lines of a chunk form one JSON array.
+            if complete:
+                with profiler.phase("payload.parse"):
+                    records = json.loads(b"[" + complete.replace(b"\n", b",") + b"]")
+                for key, record in records:
+                    yield key, record
+
+        if pending:
+            raise ValueError("Record stream ends in the middle of a record.")
+
+
+class BinaryRecordSerializer(IRecordSerializer):
+    """
+    Length-prefixed binary records. The stream opens with a magic and a schema version;
+    schema 1 stores the key, service_name, username and password of every record.
+
+    Records are grouped into blocks of records_per_block. A block is its record count and
+    data size, the length of every field in characters, and then all field values as one
+    UTF-8 string, so decoding a block takes one decode call and a run of slices.
+    """
+
+    FORMAT = "binary"
+    MAGIC = b"CVRB"
+    SCHEMA_VERSION = 1
+    FIELDS = ("service_name", "username", "password")
+
+    STREAM_HEADER = struct.Struct("<4sB")
+    BLOCK_HEADER = struct.Struct("<II")
+
+    def __init__(self, records_per_block: int = 1024):
+        self.records_per_block = records_per_block
+
+    def encode(self, records: dict) -> Iterator[bytes]:
+        yield self.STREAM_HEADER.pack(self.MAGIC, self.SCHEMA_VERSION)
+
+        values = []
+        for key, record in records.items():
+            values.append(key)
+            values.append(record["service_name"])
+            values.append(record["username"])
+            values.append(record["password"])
+
+            if len(values) >= self.records_per_block * 4:
+                yield self._encode_block(values)
+                values = []
+
+        if values:
+            yield self._encode_block(values)
+
+    def _encode_block(self, values: list[str]) -> bytes:
+        data = "".join(values).encode('utf-8')
+        lengths = struct.pack(f"<{len(values)}I", *map(len, values))
+        return self.BLOCK_HEADER.pack(len(values) // 4, len(data)) + lengths + data
+
+    def decode(self, chunks: Iterable[bytes]) -> Iterator[tuple[str, dict]]:
+        buffer = bytearray()
+        offset = 0
+        header_read = False
+
+        for chunk in chunks:
+            buffer += chunk
+
+            if not header_read:
+                if len(buffer) < self.STREAM_HEADER.size:
+                    continue
+                magic, version = self.STREAM_HEADER.unpack_from(buffer)
+                if magic != self.MAGIC or version != self.SCHEMA_VERSION:
+                    raise ValueError("Unsupported binary record stream.")
+                offset = self.STREAM_HEADER.size
+                header_read = True
+
+            while len(buffer) - offset >= self.BLOCK_HEADER.size:
+                count, size = self.BLOCK_HEADER.unpack_from(buffer, offset)
+                block_end = offset + self.BLOCK_HEADER.size + count * 16 + size
+                if len(buffer) < block_end:
+                    break
+
+                with profiler.phase("payload.parse"):
+                    records = self._decode_block(buffer, offset + self.BLOCK_HEADER.size, count, size)
+                yield from records
+                offset = block_end
+
+            del buffer[:offset]
+            offset = 0
+
+        if buffer or not header_read:
+            raise ValueError("Record stream ends in the middle of a record.")
+
+    @staticmethod
+    def _decode_block(buffer: bytearray, offset: int, count: int, size: int) -> list[tuple[str, dict]]:
+        lengths = struct.unpack_from(f"<{count * 4}I", buffer, offset)
+        offset += count * 16
+        text = buffer[offset:offset + size].decode('utf-8')
+
+        ends = list(accumulate(lengths))
+        values = [text[start:end] for start, end in zip([0, *ends[:-1]], ends)]
+
+        return [(values[i], {"service_name": values[i + 1], "username": values[i + 2], "password": values[i + 3]})
+                for i in range(0, len(values), 4)]
+
+
+SERIALIZERS = {serializer.FORMAT: serializer for serializer in (JsonDocumentSerializer, JsonLinesSerializer, BinaryRecordSerializer)}
+
+
+def get_serializer(payload_format: str) -> IRecordSerializer:
+    try:
+        return SERIALIZERS[payload_format]()
+    except KeyError:
+        raise ValueError(f"Unsupported vault payload format: {payload_format}")
@@ -0,0 +1,28 @@
+"""
+The vault payload pipeline: records are serialized, compressed and encrypted on the way out,
+and the header of each file says which serializer and codec read it back.
+"""
+from typing import BinaryIO, Iterator
+from ..interfaces.compression_codec_interface import ICompressionCodec
+from ..interfaces.encryption_interface import IDataEncryptor
+from ..interfaces.record_serializer_interface import IRecordSerializer
+from .compression import get_codec
+from .encryptors import payload_info, read_head
+from .serializers import get_serializer
+
+
+def write_payload(encryptor: IDataEncryptor, records: dict, password: str, target: BinaryIO,
+                  serializer: IRecordSerializer, codec: ICompressionCodec) -> None:
+    chunks = codec.compress(serializer.encode(records))
+    encryptor.encrypt_stream(chunks, password, target, {"format": serializer.FORMAT, "compression": codec.NAME})
+
+
+def read_payload(encryptor: IDataEncryptor, source: BinaryIO, password: str) -> Iterator[tuple[str, dict]]:
+    start = source.tell()
+    info = payload_info(read_head(source)) or {"format": "json", "compression": "none"}
+    source.seek(start)
+
+    serializer = get_serializer(info["format"])
+    codec = get_codec(info["compression"])
+
+    yield from serializer.decode(codec.decompress(encryptor.decrypt_stream(source, password)))
@@ -1,10 +1,22 @@
 import getpass
-from rich import print as rich_print
-from rich.table import Table
-from rich.panel import Panel
 from ..interfaces.user_io_interface import IUserIO
+from ..utils.lazy_import import lazy_import
+from ..utils.profiling import profiler
 from ..models.password_strength_result import PasswordStrengthResult
 
+# Submodules are imported where they are used: finding one would import the rich package itself.
+rich = lazy_import("rich")
+
+
+def rich_print(*objects, **kwargs):
+    with profiler.phase("view.render"):
+        rich.print(*objects, **kwargs)
+
+
+def rich_table(**kwargs):
+    from rich.table import Table
+    return Table(**kwargs)
+
 
 class ConsoleView(IUserIO):
     """
@@ -18,6 +30,7 @@ class ConsoleView(IUserIO):
 
     def show_header(self, vault_name="Default"):
         title = f"[bold cyan] Credential Vault : {vault_name} [/bold cyan]"
+        from rich.panel import Panel
         rich_print(Panel.fit("=+~+="*2 + title + "=+~+="*2, border_style="blue"))
 
     def line_break(self):
@@ -43,7 +56,7 @@ class ConsoleView(IUserIO):
             self.show_warning("Vault is empty.")
             return
 
-        table = Table(title="[bold cyan]Vault Contents[/bold cyan]", border_style="blue")
+        table = rich_table(title="[bold cyan]Vault Contents[/bold cyan]", border_style="blue")
         table.add_column("Service", style="bold green", no_wrap=True)
         table.add_column("Username", style="magenta")
         
@@ -58,7 +71,7 @@ class ConsoleView(IUserIO):
             self.show_warning(f"No credentials found containing '{query}'.")
             return
 
-        table = Table(title=f"[bold cyan]Search Results: '{query}'[/bold cyan]", border_style="blue")
+        table = rich_table(title=f"[bold cyan]Search Results: '{query}'[/bold cyan]", border_style="blue")
         table.add_column("Service", style="bold green", no_wrap=True)
         table.add_column("Username", style="magenta")
         
@@ -68,6 +81,29 @@ class ConsoleView(IUserIO):
             
         rich_print(table)
 
+    def show_ranked_results(self, results: list, query: str, offset: int = 0):
+        if not results:
+            self.show_warning(f"No credentials found containing '{query}'.")
+            return
+
+        title = f"[bold cyan]Search Results: '{query}'[/bold cyan]"
+        if offset:
+            title += f" [dim](from #{offset + 1})[/dim]"
+
+        table = rich_table(title=title, border_style="blue")
+        table.add_column("Score", style="cyan", justify="right")
+        table.add_column("Service", style="bold green", no_wrap=True)
+        table.add_column("Username", style="magenta")
+
+        for result in results:
+            table.add_row(str(result.score), result.credential.service_name, result.credential.username)
+
+        rich_print(table)
+
+    def show_progress(self, completed: int, total: int, label: str = ""):
+        end = "\n" if completed >= total else "\r"
+        rich_print(f"[dim]{completed}/{total} {label}[/dim]".ljust(60), end=end)
+
     def show_password_strength(self, strength: PasswordStrengthResult, feedback: list[str]):
         if strength == PasswordStrengthResult.STRONG:
             formatted_score = "[bold green]STRONG[/bold green]"
@@ -83,7 +119,7 @@ class ConsoleView(IUserIO):
             self.show_warning("No audit history found.")
             return
 
-        table = Table(title="Audit Log History")
+        table = rich_table(title="Audit Log History")
 
         table.add_column("Timestamp", style="cyan", no_wrap=True)
         table.add_column("Action", style="bold magenta")
@@ -107,4 +143,31 @@ class ConsoleView(IUserIO):
             )
 
         self.show_message(table)
-        print()
\ No newline at end of file
+        print()
+
+class PlainConsoleView(ConsoleView):
+    """
+    ConsoleView that prints its headers and messages as plain text, for commands such as
+    'generate' that show only a few lines and should start without importing rich.
+    Messages must not rely on rich markup; tables and other output still use rich.
+    """
+    def show_header(self, vault_name="Default"):
+        print(f"== Credential Vault : {vault_name} ==")
+
+    def line_break(self):
+        print()
+
+    def show_message(self, message: str):
+        print(message)
+
+    def show_success(self, message: str):
+        print(f"\n{message}\n")
+
+    def show_error(self, message: str):
+        print(f"\n{message}\n")
+
+    def show_warning(self, message: str):
+        print(f"\n{message}\n")
+
+    def show_info(self, message: str):
+        print(message)
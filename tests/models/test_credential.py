@@ -16,4 +16,13 @@ def test_credential_to_dict():
         "service_name": "Facebook",
         "username": "Mark",
         "password": "Zukerberg1"
-    }
\ No newline at end of file
+    }
+
+def test_credential_has_no_instance_dict():
+    cred = Credential("Facebook", "Mark", "Zukerberg1")
+
+    assert not hasattr(cred, "__dict__")
+    assert cred == Credential("Facebook", "Mark", "Zukerberg1")
+
+    with pytest.raises(AttributeError):
+        cred.notes = "not a field"
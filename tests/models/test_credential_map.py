@@ -0,0 +1,35 @@
+from src.vault.models.credential import Credential
+from src.vault.models.credential_map import CredentialMap
+
+def record(name, username="user", password="secret"):
+    return {"service_name": name, "username": username, "password": password}
+
+def test_credentials_are_built_on_access():
+    credentials = CredentialMap({"github": record("GitHub"), "netflix": record("Netflix")})
+
+    assert "github" in credentials
+    assert sorted(credentials) == ["github", "netflix"]
+    assert credentials.get("github") == Credential("GitHub", "user", "secret")
+    assert credentials.get("gitlab") is None
+    assert credentials["github"] is credentials["github"]
+    assert isinstance(credentials._entries["netflix"], dict)
+
+def test_records_keep_untouched_entries_and_reflect_changes():
+    untouched = record("Netflix")
+    credentials = CredentialMap({"github": record("GitHub"), "netflix": untouched})
+
+    credentials["github"].username = "octo"
+    credentials["hulu"] = Credential("Hulu", "u", "p")
+
+    records = dict(credentials.records())
+
+    assert records["netflix"] is untouched
+    assert records["github"] == record("GitHub", username="octo")
+    assert records["hulu"] == record("Hulu", "u", "p")
+
+def test_pop_and_items():
+    credentials = CredentialMap({"github": record("GitHub"), "netflix": record("Netflix")})
+
+    assert credentials.pop("github").service_name == "GitHub"
+    assert credentials.pop("github", None) is None
+    assert [(key, cred.service_name) for key, cred in credentials.items()] == [("netflix", "Netflix")]
@@ -0,0 +1,71 @@
+import os
+import pytest
+from src.vault.repositories.audit_index import AuditIndex
+
+def write_lines(path, lines, mode="a"):
+    with open(path, mode) as f:
+        f.write("".join(line + "\n" for line in lines))
+
+@pytest.fixture
+def log_file(tmp_path):
+    return str(tmp_path / "audit.log")
+
+def test_consecutive_entries_share_a_range(tmp_path, log_file):
+    write_lines(log_file, [
+        "[2024-01-01 10:00:00] RETRIEVE: a",
+        "[2024-01-01 10:00:01] RETRIEVE: b",
+        "[2024-01-01 10:00:02] SEARCH: c",
+        "[2024-01-02 10:00:00] RETRIEVE: d",
+    ])
+    index = AuditIndex(str(tmp_path))
+    index.catch_up(log_file)
+
+    retrieves = index.ranges(action="retrieve")["audit.log"]
+    assert len(retrieves) == 2
+
+    with open(log_file, "rb") as f:
+        data = f.read()
+    assert data[retrieves[0][0]:retrieves[0][1]].count(b"\n") == 2
+    assert data[retrieves[1][0]:retrieves[1][1]].endswith(b"RETRIEVE: d\n")
+
+def test_catch_up_is_incremental_and_skips_partial_lines(tmp_path, log_file):
+    index = AuditIndex(str(tmp_path))
+    write_lines(log_file, ["[2024-01-01 10:00:00] ADD: a"])
+    index.catch_up(log_file)
+
+    with open(log_file, "a") as f:
+        f.write("[2024-01-03 10:00:00] DELETE: b\n[2024-01-03 10:00:01] DEL")
+    index.catch_up(log_file)
+
+    assert list(index.ranges(since="2024-01-02")) == ["audit.log"]
+    assert len(index.ranges(since="2024-01-02")["audit.log"]) == 1
+
+    with open(log_file, "a") as f:
+        f.write("ETE: c\n")
+    index.catch_up(log_file)
+
+    assert len(index.ranges(action="DELETE")["audit.log"]) == 1
+    assert index.ranges(action="DELETE")["audit.log"][0][1] == os.path.getsize(log_file)
+
+def test_replaced_log_is_reindexed(tmp_path, log_file):
+    index = AuditIndex(str(tmp_path))
+    write_lines(log_file, ["[2024-01-01 10:00:00] ADD: a", "[2024-01-01 10:00:00] ADD: b"])
+    index.catch_up(log_file)
+
+    os.remove(log_file)
+    write_lines(log_file, ["[2024-02-01 10:00:00] SEARCH: x"])
+    index.catch_up(log_file)
+
+    assert index.ranges(action="ADD") == {}
+    assert list(index.ranges(action="SEARCH")) == ["audit.log"]
+
+def test_rotated_ranges_move_to_segment(tmp_path, log_file):
+    index = AuditIndex(str(tmp_path))
+    write_lines(log_file, ["[2024-01-01 10:00:00] ADD: a"])
+    index.catch_up(log_file)
+    index.rename_live_file("audit.log.1.gz")
+
+    write_lines(log_file, ["[2024-01-02 10:00:00] ADD: b"], mode="w")
+    index.catch_up(log_file)
+
+    assert list(index.ranges(action="ADD")) == ["audit.log.1.gz", "audit.log"]
@@ -0,0 +1,122 @@
+import os
+import pytest
+from src.vault.repositories.journaled_repository import JournaledJsonRepository
+from src.vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "MasterPassword10!"
+
+def record(name, username="user", password="secret"):
+    return {"service_name": name, "username": username, "password": password}
+
+@pytest.fixture
+def encryptor():
+    return FernetDataEncryptor()
+
+@pytest.fixture
+def repo(tmp_path, encryptor):
+    return JournaledJsonRepository(str(tmp_path / "vault.json"), encryptor, max_journal_records=1000)
+
+def test_changes_are_appended_to_journal(repo):
+    repo.save_data({"github": record("GitHub")}, PASSWORD)
+    snapshot = open(repo.filepath, "rb").read()
+
+    repo.save_changes({"netflix": record("Netflix")}, PASSWORD)
+
+    assert open(repo.filepath, "rb").read() == snapshot
+    assert os.path.getsize(repo.journal_path) > 0
+
+def test_load_replays_journal_over_snapshot(repo, tmp_path, encryptor):
+    repo.save_data({"github": record("GitHub"), "gitlab": record("GitLab")}, PASSWORD)
+    repo.save_changes({"netflix": record("Netflix")}, PASSWORD)
+    repo.save_changes({"github": record("GitHub", username="new-user")}, PASSWORD)
+    repo.save_changes({"gitlab": None}, PASSWORD)
+
+    reopened = JournaledJsonRepository(repo.filepath, encryptor)
+    data = reopened.load_data(PASSWORD)
+
+    assert sorted(data) == ["github", "netflix"]
+    assert data["github"].username == "new-user"
+
+def test_truncated_journal_tail_is_ignored(repo, encryptor):
+    repo.save_changes({"github": record("GitHub")}, PASSWORD)
+    repo.save_changes({"netflix": record("Netflix")}, PASSWORD)
+
+    with open(repo.journal_path, "r+b") as f:
+        f.truncate(os.path.getsize(repo.journal_path) - 5)
+
+    data = JournaledJsonRepository(repo.filepath, encryptor).load_data(PASSWORD)
+
+    assert list(data) == ["github"]
+
+def test_torn_journal_tail_is_cut_before_next_append(repo, encryptor):
+    repo.save_changes({"github": record("GitHub")}, PASSWORD)
+    repo.save_changes({"netflix": record("Netflix")}, PASSWORD)
+
+    with open(repo.journal_path, "r+b") as f:
+        f.truncate(os.path.getsize(repo.journal_path) - 5)
+
+    reopened = JournaledJsonRepository(repo.filepath, encryptor)
+    reopened.load_data(PASSWORD)
+    reopened.save_changes({"gitlab": record("GitLab")}, PASSWORD)
+
+    data = JournaledJsonRepository(repo.filepath, encryptor).load_data(PASSWORD)
+
+    assert sorted(data) == ["github", "gitlab"]
+
+def test_wrong_password_raises_value_error(repo, encryptor):
+    repo.save_changes({"github": record("GitHub")}, PASSWORD)
+
+    with pytest.raises(ValueError):
+        JournaledJsonRepository(repo.filepath, encryptor).load_data("WrongPassword")
+
+def test_compaction_folds_journal_into_snapshot(tmp_path, encryptor):
+    repo = JournaledJsonRepository(str(tmp_path / "vault.json"), encryptor, max_journal_records=3)
+    repo.load_data(PASSWORD)
+
+    for n in range(3):
+        repo.save_changes({f"service{n}": record(f"Service{n}")}, PASSWORD)
+    repo.flush()
+
+    assert not os.path.exists(repo.journal_path)
+
+    data = JournaledJsonRepository(repo.filepath, encryptor).load_data(PASSWORD)
+    assert sorted(data) == ["service0", "service1", "service2"]
+
+def test_save_data_replaces_journal(repo, encryptor):
+    repo.save_changes({"github": record("GitHub")}, PASSWORD)
+
+    repo.save_data({"netflix": record("Netflix")}, "NewPassword10!")
+
+    assert not os.path.exists(repo.journal_path)
+    assert list(JournaledJsonRepository(repo.filepath, encryptor).load_data("NewPassword10!")) == ["netflix"]
+
+def test_rotate_key_folds_journal_first(repo, encryptor):
+    repo.save_data({"github": record("GitHub")}, PASSWORD)
+    repo.save_changes({"netflix": record("Netflix")}, PASSWORD)
+
+    repo.rotate_key(PASSWORD, "NewPassword10!")
+
+    assert not os.path.exists(repo.journal_path)
+    data = JournaledJsonRepository(repo.filepath, FernetDataEncryptor()).load_data("NewPassword10!")
+    assert sorted(data) == ["github", "netflix"]
+
+def test_failed_compaction_is_reported_and_cleaned_up(tmp_path, encryptor, monkeypatch):
+    repo = JournaledJsonRepository(str(tmp_path / "vault.json"), encryptor, max_journal_records=2)
+    repo.load_data(PASSWORD)
+
+    def fail(target, data, password):
+        target.write(b"partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(repo, "_write_records", fail)
+    repo.save_changes({"github": record("GitHub")}, PASSWORD)
+    repo.save_changes({"netflix": record("Netflix")}, PASSWORD)
+    repo.flush()
+
+    assert isinstance(repo.take_write_error(), OSError)
+    assert repo.take_write_error() is None
+    assert not os.path.exists(repo.filepath + ".compact")
+
+    monkeypatch.undo()
+    data = JournaledJsonRepository(repo.filepath, encryptor).load_data(PASSWORD)
+    assert sorted(data) == ["github", "netflix"]
@@ -0,0 +1,73 @@
+import os
+import pytest
+from src.vault.repositories.json_repository import JsonRepository
+from src.vault.utils.compression import get_codec
+from src.vault.utils.encryptors import FernetDataEncryptor, unpack_envelope, envelope_version, STREAM_FORMAT_VERSION
+
+PASSWORD = "MasterPassword10!"
+NEW_PASSWORD = "NewPassword10!"
+
+@pytest.fixture
+def repo(tmp_path):
+    return JsonRepository(str(tmp_path / "vault.json"), FernetDataEncryptor())
+
+def test_load_missing_file_returns_empty(repo):
+    assert repo.load_data(PASSWORD) == {}
+
+def test_save_and_load_round_trip(repo):
+    repo.save_data({"github": {"service_name": "GitHub", "username": "octo", "password": "cat"}}, PASSWORD)
+
+    data = repo.load_data(PASSWORD)
+
+    assert data["github"].service_name == "GitHub"
+    assert data["github"].password == "cat"
+
+def test_load_wrong_password_raises_value_error(repo):
+    repo.save_data({}, PASSWORD)
+
+    with pytest.raises(ValueError):
+        repo.load_data("WrongPassword10!")
+
+def test_rotate_key_rewrites_header_only(repo):
+    repo.save_data({"github": {"service_name": "GitHub", "username": "octo", "password": "cat"}}, PASSWORD)
+    before = open(repo.filepath, "rb").read()
+
+    repo.rotate_key(PASSWORD, NEW_PASSWORD)
+    after = open(repo.filepath, "rb").read()
+
+    assert unpack_envelope(after)[1] == unpack_envelope(before)[1]
+    reopened = JsonRepository(repo.filepath, FernetDataEncryptor())
+    assert reopened.load_data(NEW_PASSWORD)["github"].username == "octo"
+
+def test_rotate_key_wrong_password_leaves_file(repo):
+    repo.save_data({}, PASSWORD)
+    before = open(repo.filepath, "rb").read()
+
+    with pytest.raises(ValueError):
+        repo.rotate_key("WrongPassword10!", NEW_PASSWORD)
+
+    assert open(repo.filepath, "rb").read() == before
+
+def test_single_token_vault_still_loads(repo):
+    encryptor = FernetDataEncryptor()
+    with open(repo.filepath, "wb") as f:
+        f.write(encryptor.encrypt('{"github": {"service_name": "GitHub", "username": "octo", "password": "cat"}}', PASSWORD))
+
+    assert repo.load_data(PASSWORD)["github"].username == "octo"
+
+    repo.save_data({"github": {"service_name": "GitHub", "username": "octo", "password": "cat"}}, PASSWORD)
+    assert envelope_version(open(repo.filepath, "rb").read()) == STREAM_FORMAT_VERSION
+    assert repo.load_data(PASSWORD)["github"].password == "cat"
+
+def test_compressed_vault_round_trips_and_old_files_still_open(repo, tmp_path):
+    records = {f"service-{i}": {"service_name": f"Service {i}", "username": "octo@example.com", "password": "cat"} for i in range(200)}
+    repo.save_data(records, PASSWORD)
+    plain_size = os.path.getsize(repo.filepath)
+
+    compressed = JsonRepository(repo.filepath, FernetDataEncryptor(), codec=get_codec("zlib"))
+    assert len(compressed.load_data(PASSWORD)) == 200
+
+    compressed.save_data(records, PASSWORD)
+
+    assert os.path.getsize(repo.filepath) < plain_size / 4
+    assert repo.load_data(PASSWORD)["service-7"].service_name == "Service 7"
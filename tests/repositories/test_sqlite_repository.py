@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import pytest
+from src.vault.repositories.sqlite_repository import SqliteRepository
+from src.vault.repositories.journaled_repository import JournaledJsonRepository
+from src.vault.services.vault_service import VaultService
+from src.vault.models.credential import Credential
+from src.vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "MasterPassword10!"
+NEW_PASSWORD = "NewPassword10!"
+
+def record(name, username="user", password="secret"):
+    return {"service_name": name, "username": username, "password": password}
+
+def rows(repo):
+    with sqlite3.connect(repo.filepath) as connection:
+        return dict(connection.execute("SELECT id, record FROM credentials").fetchall())
+
+@pytest.fixture
+def encryptor():
+    return FernetDataEncryptor()
+
+@pytest.fixture
+def legacy(tmp_path, encryptor):
+    return JournaledJsonRepository(str(tmp_path / "vault.json"), encryptor)
+
+@pytest.fixture
+def repo(tmp_path, encryptor, legacy):
+    return SqliteRepository(str(tmp_path / "vault.db"), encryptor, legacy_repository=legacy)
+
+def test_changes_touch_only_their_row(repo, encryptor):
+    repo.save_data({"github": record("GitHub"), "gitlab": record("GitLab")}, PASSWORD)
+    before = rows(repo)
+
+    repo.save_changes({"netflix": record("Netflix"), "gitlab": None}, PASSWORD)
+    after = rows(repo)
+
+    kept = set(before) & set(after)
+    assert len(after) == 2 and len(kept) == 1
+    assert all(after[row_id] == before[row_id] for row_id in kept)
+
+    data = SqliteRepository(repo.filepath, encryptor).load_data(PASSWORD)
+    assert sorted(data) == ["github", "netflix"]
+    assert data["netflix"].service_name == "Netflix"
+
+def test_service_names_are_not_stored_in_clear(repo):
+    repo.save_data({"github": record("GitHub", password="hunter2")}, PASSWORD)
+
+    with open(repo.filepath, "rb") as f:
+        contents = f.read()
+
+    assert b"github" not in contents.lower()
+    assert b"hunter2" not in contents
+
+def test_wrong_password_is_rejected(repo, encryptor):
+    repo.save_data({"github": record("GitHub")}, PASSWORD)
+
+    with pytest.raises(ValueError):
+        SqliteRepository(repo.filepath, encryptor).load_data("WrongPassword10!")
+
+def test_json_vault_is_migrated_on_first_load(repo, legacy):
+    legacy.save_data({"github": record("GitHub")}, PASSWORD)
+    legacy.save_changes({"netflix": record("Netflix")}, PASSWORD)
+    legacy.flush()
+
+    data = repo.load_data(PASSWORD)
+
+    assert sorted(data) == ["github", "netflix"]
+    assert os.path.exists(repo.filepath)
+    assert not os.path.exists(legacy.filepath)
+    assert not os.path.exists(legacy.journal_path)
+    assert os.path.exists(legacy.filepath + ".migrated")
+    assert os.path.exists(legacy.journal_path + ".migrated")
+
+def test_json_vault_survives_until_migration_is_verified(repo, legacy, monkeypatch):
+    legacy.save_data({"github": record("GitHub")}, PASSWORD)
+    monkeypatch.setattr(repo, "_seal", lambda data_key, key, value: SqliteRepository._seal(data_key, key, {**value, "password": ""}))
+
+    with pytest.raises(ValueError):
+        repo.load_data(PASSWORD)
+
+    assert os.path.exists(legacy.filepath)
+    assert not os.path.exists(repo.filepath)
+
+    monkeypatch.undo()
+    assert repo.load_data(PASSWORD)["github"].password == "secret"
+    assert not os.path.exists(legacy.filepath)
+
+def test_rotate_key_rewraps_without_rewriting_rows(repo, encryptor):
+    repo.save_data({"github": record("GitHub")}, PASSWORD)
+    before = rows(repo)
+
+    repo.rotate_key(PASSWORD, NEW_PASSWORD)
+
+    assert rows(repo) == before
+    assert sorted(SqliteRepository(repo.filepath, encryptor).load_data(NEW_PASSWORD)) == ["github"]
+    with pytest.raises(ValueError):
+        SqliteRepository(repo.filepath, encryptor).load_data(PASSWORD)
+
+def test_change_master_password_covers_json_and_sqlite_vaults(tmp_path, repo, encryptor):
+    other = JournaledJsonRepository(str(tmp_path / "work.json"), encryptor)
+    other.save_data({"jira": record("Jira")}, PASSWORD)
+
+    service = VaultService(repo, PASSWORD)
+    service.add_credential(Credential("GitHub", "user", "secret"))
+
+    success, errors = service.change_master_password(NEW_PASSWORD)
+
+    assert (success, errors) == (2, [])
+    assert sorted(repo.sibling(str(tmp_path / "work.db")).load_data(NEW_PASSWORD)) == ["jira"]
+    assert sorted(SqliteRepository(repo.filepath, encryptor).load_data(NEW_PASSWORD)) == ["github"]
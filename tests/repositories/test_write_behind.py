@@ -0,0 +1,132 @@
+import threading
+import time
+import pytest
+from src.vault.repositories.json_repository import JsonRepository
+from src.vault.repositories.write_behind import MAX_BACKGROUND_RETRIES, WriteBehindWriter
+from src.vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "MasterPassword10!"
+
+def record(name):
+    return {"service_name": name, "username": "user", "password": "secret"}
+
+class RecordingWrite:
+    def __init__(self):
+        self.writes = []
+        self.written = threading.Event()
+
+    def __call__(self, data, password):
+        self.writes.append(dict(data))
+        self.written.set()
+
+def test_strict_writes_every_save():
+    write = RecordingWrite()
+    writer = WriteBehindWriter(write, "strict")
+
+    writer.submit({"a": 1}, PASSWORD)
+    writer.submit({"a": 2}, PASSWORD)
+
+    assert write.writes == [{"a": 1}, {"a": 2}]
+    assert not writer.has_pending()
+
+def test_batched_coalesces_saves_until_batch_is_full():
+    write = RecordingWrite()
+    writer = WriteBehindWriter(write, "batched", batch_size=3, batch_interval=60)
+
+    writer.submit({"a": 1}, PASSWORD)
+    writer.submit({"a": 2}, PASSWORD)
+    assert write.writes == []
+
+    writer.submit({"a": 3}, PASSWORD)
+    assert write.writes == [{"a": 3}]
+
+def test_deferred_writes_newest_snapshot_in_background():
+    write = RecordingWrite()
+    writer = WriteBehindWriter(write, "deferred", deferred_interval=0.05)
+
+    writer.submit({"a": 1}, PASSWORD)
+    writer.submit({"a": 2}, PASSWORD)
+
+    assert write.written.wait(5)
+    assert write.writes == [{"a": 2}]
+
+def test_flush_writes_pending_snapshot():
+    write = RecordingWrite()
+    writer = WriteBehindWriter(write, "deferred", deferred_interval=60)
+
+    writer.submit({"a": 1}, PASSWORD)
+    writer.flush()
+    writer.flush()
+
+    assert write.writes == [{"a": 1}]
+
+def test_failed_write_is_retried_on_next_flush():
+    attempts = []
+
+    def write(data, password):
+        attempts.append(data)
+        if len(attempts) == 1:
+            raise IOError("disk full")
+
+    writer = WriteBehindWriter(write, "deferred", deferred_interval=60)
+    writer.submit({"a": 1}, PASSWORD)
+
+    with pytest.raises(IOError):
+        writer.flush()
+    assert writer.has_pending()
+
+    writer.flush()
+    assert attempts == [{"a": 1}, {"a": 1}]
+    assert not writer.has_pending()
+
+def test_background_failures_back_off_and_are_reported_once(capsys):
+    attempts = []
+    failing = threading.Event()
+    failing.set()
+
+    def write(data, password):
+        attempts.append(data)
+        if failing.is_set():
+            raise IOError("disk full")
+
+    writer = WriteBehindWriter(write, "deferred", deferred_interval=0.01)
+    writer.submit({"a": 1}, PASSWORD)
+
+    deadline = time.monotonic() + 5
+    while len(attempts) < MAX_BACKGROUND_RETRIES and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.5)
+
+    assert len(attempts) == MAX_BACKGROUND_RETRIES
+    assert capsys.readouterr().out == ""
+    assert isinstance(writer.take_error(), IOError)
+    assert writer.take_error() is None
+    assert writer.has_pending()
+
+    failing.clear()
+    writer.flush()
+    assert not writer.has_pending()
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        WriteBehindWriter(RecordingWrite(), "eventually")
+
+def test_repository_load_sees_pending_save(tmp_path):
+    path = tmp_path / "vault.json"
+    repo = JsonRepository(str(path), FernetDataEncryptor(), durability="deferred")
+
+    repo.save_data({"github": record("GitHub")}, PASSWORD)
+    assert not path.exists()
+
+    assert repo.load_data(PASSWORD)["github"].service_name == "GitHub"
+    assert path.exists()
+
+def test_repository_flush_persists_deferred_save(tmp_path):
+    path = tmp_path / "vault.json"
+    repo = JsonRepository(str(path), FernetDataEncryptor(), durability="batched")
+    repo.save_data({"github": record("GitHub")}, PASSWORD)
+
+    repo.flush()
+
+    reopened = JsonRepository(str(path), FernetDataEncryptor())
+    assert "github" in reopened.load_data(PASSWORD)
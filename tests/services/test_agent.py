@@ -0,0 +1,139 @@
+import os
+import stat
+import threading
+import time
+import pytest
+from src.vault.models.credential import Credential
+from src.vault.repositories.json_repository import JsonRepository
+from src.vault.services.vault_service import VaultService
+from src.vault.services.agent_client import AgentClient, AgentVaultService
+from src.vault.services.agent_server import VaultAgent
+from src.vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "MasterPassword10!"
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="Unix domain sockets required")
+
+def make_service(path, password):
+    return VaultService(JsonRepository(path, FernetDataEncryptor()), password)
+
+def wait_for(client):
+    for _ in range(100):
+        if client.is_running():
+            return
+        time.sleep(0.02)
+    raise AssertionError("agent did not start")
+
+@pytest.fixture
+def agent(tmp_path):
+    socket_path = str(tmp_path / "agent.sock")
+    agent = VaultAgent(socket_path, PASSWORD, make_service, ttl=60)
+
+    thread = threading.Thread(target=agent.serve)
+    thread.start()
+
+    client = AgentClient(socket_path, timeout=5)
+    wait_for(client)
+
+    yield agent, client
+
+    agent.shutdown()
+    thread.join(timeout=5)
+
+def test_agent_serves_vault_operations(agent, tmp_path):
+    _, client = agent
+    vault_path = str(tmp_path / "credentials.json")
+    service = AgentVaultService(client, vault_path)
+
+    assert service.add_credential(Credential("GitHub", "octo", "cat"))
+    assert not service.add_credential(Credential("github", "other", "dog"))
+
+    credential = service.get_credential("github")
+    assert credential.username == "octo"
+    assert credential.password == "cat"
+    assert service.get_credential("missing") is None
+
+    assert list(service.list_all_credentials()) == ["github"]
+    assert [result.key for result in service.rank_credentials("githb")] == ["github"]
+
+    assert make_service(vault_path, PASSWORD).get_credential("github").password == "cat"
+
+def test_agent_applies_bulk_changes(agent, tmp_path):
+    _, client = agent
+    vault_path = str(tmp_path / "credentials.json")
+    service = AgentVaultService(client, vault_path)
+
+    assert service.add_credentials([Credential("GitHub", "octo", "cat"), Credential("GitLab", "fox", "dog")]) == ["GitHub", "GitLab"]
+    assert service.delete_credentials(["github", "missing"]) == ["github"]
+
+    assert list(make_service(vault_path, PASSWORD).credentials) == ["gitlab"]
+
+def test_agent_reloads_vault_changed_on_disk(agent, tmp_path):
+    _, client = agent
+    vault_path = str(tmp_path / "credentials.json")
+    service = AgentVaultService(client, vault_path)
+
+    assert service.get_credential("gitlab") is None
+
+    time.sleep(0.01)
+    make_service(vault_path, PASSWORD).add_credential(Credential("GitLab", "fox", "tanuki"))
+
+    assert service.get_credential("gitlab").username == "fox"
+
+def test_agent_flushes_pending_saves_before_reloading(tmp_path):
+    vault_path = str(tmp_path / "credentials.json")
+    factory = lambda path, password: VaultService(JsonRepository(path, FernetDataEncryptor(), durability="deferred"), password)
+    agent = VaultAgent(str(tmp_path / "agent.sock"), PASSWORD, factory, ttl=60)
+
+    assert agent.dispatch({"method": "add_credential", "vault": vault_path,
+                           "args": [{"service_name": "GitHub", "username": "octo", "password": "cat"}]})
+
+    writer = agent._services[vault_path].repo.writer
+    write = writer._write
+    writer._write = lambda data, password: (_ for _ in ()).throw(OSError("disk full"))
+    open(vault_path + ".journal", "wb").close()
+
+    # The failed flush keeps the unsaved change in memory and reports the error.
+    assert agent.dispatch({"method": "get_credential", "vault": vault_path, "args": ["github"]}).username == "octo"
+    assert agent.dispatch({"method": "take_write_error", "vault": vault_path}) == "disk full"
+
+    writer._write = write
+    service = agent._services[vault_path]
+    assert agent.dispatch({"method": "get_credential", "vault": vault_path, "args": ["github"]}).username == "octo"
+
+    assert agent._services[vault_path] is not service
+    assert make_service(vault_path, PASSWORD).get_credential("github").username == "octo"
+
+def test_agent_socket_is_private(agent):
+    running_agent, client = agent
+
+    mode = stat.S_IMODE(os.stat(running_agent.socket_path).st_mode)
+    assert mode == 0o600
+    assert client.status()["pid"] == os.getpid()
+
+def test_agent_stops_and_removes_socket(tmp_path):
+    socket_path = str(tmp_path / "agent.sock")
+    agent = VaultAgent(socket_path, PASSWORD, make_service, ttl=60)
+    thread = threading.Thread(target=agent.serve)
+    thread.start()
+
+    client = AgentClient(socket_path, timeout=5)
+    wait_for(client)
+
+    assert client.stop()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert not os.path.exists(socket_path)
+    assert not client.is_running()
+
+def test_agent_locks_after_ttl(tmp_path):
+    socket_path = str(tmp_path / "agent.sock")
+    agent = VaultAgent(socket_path, PASSWORD, make_service, ttl=0)
+    thread = threading.Thread(target=agent.serve)
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert agent._password is None
+    assert not os.path.exists(socket_path)
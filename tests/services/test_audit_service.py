@@ -1,4 +1,7 @@
+import gzip
 import os
+import threading
+import time
 import pytest
 from src.vault.services.audit_service import AuditService
 
@@ -8,6 +11,7 @@ def service(tmp_path):
 
 def test_log_event_creates_and_writes_files(service):
     service.log_event("TEST_ACTION", "This is a test log.")
+    service.flush()
 
     assert os.path.exists(service.log_file)
     
@@ -40,3 +44,198 @@ def test_get_parsed_logs_respects_limit(service, tmp_path):
     assert len(logs) == 8
     
 
+@pytest.mark.parametrize("limit", [1, 3, 20, 500])
+def test_tail_lines_match_readlines(service, monkeypatch, limit):
+    monkeypatch.setattr("src.vault.services.audit_service.TAIL_BLOCK_SIZE", 7)
+
+    content = "".join(
+        f"[2016-03-02 12:00:{n % 60:02d}] EVENT_{n}: détails {'x' * (n % 13)}" + ["\n", "\r\n", "\r"][n % 3]
+        for n in range(200)
+    ) + "[2016-03-02 12:01:00] TRAILING: no newline"
+
+    with open(service.log_file, "w", newline="") as f:
+        f.write(content)
+
+    with open(service.log_file, "r") as f:
+        expected = f.readlines()[-limit:]
+
+    assert service._tail_lines(service.log_file, limit) == expected
+
+@pytest.mark.parametrize("block_size", range(1, 17))
+def test_tail_survives_multibyte_characters_across_blocks(service, monkeypatch, block_size):
+    monkeypatch.setattr("src.vault.services.audit_service.TAIL_BLOCK_SIZE", block_size)
+
+    with open(service.log_file, "w", encoding="utf-8") as f:
+        f.write("".join(f"[2016-03-02 12:00:{n:02d}] RETRIEVE: Copied password for: café-é€{n}\n" for n in range(40)))
+
+    logs = service.get_parsed_logs(5)
+
+    assert [entry["details"] for entry in logs] == [f"Copied password for: café-é€{n}" for n in range(35, 40)]
+
+def test_get_parsed_logs_returns_newest_entries(service, tmp_path):
+    fake_log_file = tmp_path / "audit.log"
+    fake_log_file.write_text("".join(f"[2016-03-02 12:00:00] LOGGED_EVENT: Event number {n}\n" for n in range(10000)))
+
+    logs = service.get_parsed_logs(3)
+
+    assert [log["details"] for log in logs] == ["Event number 9997", "Event number 9998", "Event number 9999"]
+
+def test_log_event_buffers_until_flush_threshold(tmp_path):
+    service = AuditService(str(tmp_path), flush_bytes=200, flush_interval=60)
+
+    service.log_event("FIRST", "buffered")
+    assert not os.path.exists(service.log_file)
+
+    service.log_event("SECOND", "x" * 200)
+    with open(service.log_file) as f:
+        assert [line.split("]")[1].split(":")[0].strip() for line in f] == ["FIRST", "SECOND"]
+
+def test_log_event_flushes_after_interval(tmp_path):
+    service = AuditService(str(tmp_path), flush_interval=0.05)
+    service.log_event("LATER", "flushed by the timer")
+
+    for _ in range(100):
+        if os.path.exists(service.log_file) and os.path.getsize(service.log_file):
+            break
+        time.sleep(0.02)
+
+    with open(service.log_file) as f:
+        assert "LATER" in f.read()
+
+def test_rotation_compresses_segments_and_reads_across_them(tmp_path):
+    service = AuditService(str(tmp_path), flush_bytes=1, max_bytes=500)
+
+    for n in range(100):
+        service.log_event("EVENT", f"number {n}")
+
+    segments = service.segments()
+    assert len(segments) > 1
+    assert all(segment.endswith(".gz") for segment in segments)
+
+    with gzip.open(segments[0], "rt") as f:
+        assert "number 0" in f.readline()
+
+    assert [log["details"] for log in service.get_parsed_logs(100)] == [f"number {n}" for n in range(100)]
+    assert [log["details"] for log in service.get_parsed_logs(3)] == ["number 97", "number 98", "number 99"]
+    assert len(service.get_parsed_logs(0)) == 100
+
+def test_concurrent_writers_never_split_lines(tmp_path):
+    writers = [AuditService(str(tmp_path), flush_bytes=512, max_bytes=4096) for _ in range(4)]
+
+    def write(index, writer):
+        for n in range(250):
+            writer.log_event(f"WRITER_{index}", f"entry {n} " + "y" * 40)
+        writer.flush()
+
+    threads = [threading.Thread(target=write, args=(i, w)) for i, w in enumerate(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    logs = writers[0].get_parsed_logs(2000)
+    assert len(logs) == 1000
+    assert all(log["details"].endswith("y" * 40) for log in logs)
+
+def test_query_logs_filters_by_action_day_and_text(tmp_path):
+    service = AuditService(str(tmp_path), flush_bytes=1, max_bytes=400)
+    lines = [
+        f"[2024-{month:02d}-1{day} 09:00:00] {action}: Copied password for: {name}\n"
+        for month in (6, 7, 8, 9, 10)
+        for day in range(3)
+        for action, name in (("RETRIEVE", "aws-prod"), ("SEARCH", "aws"), ("RETRIEVE", "github"))
+    ]
+
+    for line in lines:
+        with open(service.log_file, "a") as f:
+            f.write(line)
+
+        if os.path.getsize(service.log_file) >= service.max_bytes:
+            service.rotate()
+
+    assert len(service.segments()) > 1
+
+    logs = service.query_logs(action="retrieve", since="2024-07-01", until="2024-09-30", contains="AWS-PROD")
+
+    assert [log["timestamp"] for log in logs] == [
+        f"2024-{month:02d}-1{day} 09:00:00" for month in (7, 8, 9) for day in range(3)
+    ]
+    assert all(log["action"] == "RETRIEVE" and log["details"].endswith("aws-prod") for log in logs)
+
+    assert len(service.query_logs(action="SEARCH")) == 15
+    assert len(service.query_logs(action="SEARCH", limit=2)) == 2
+    assert service.query_logs(action="SEARCH", limit=2)[-1]["timestamp"] == "2024-10-12 09:00:00"
+    assert service.query_logs(since="2025-01-01") == []
+
+def test_query_logs_sees_events_from_other_writers(tmp_path):
+    writer = AuditService(str(tmp_path))
+    reader = AuditService(str(tmp_path))
+
+    writer.log_event("RETRIEVE", "Copied password for: github")
+    writer.flush()
+    with open(writer.log_file, "a") as f:
+        f.write("[2024-01-01 00:00:00] RETRIEVE: written by hand\n")
+
+    assert [log["details"] for log in reader.query_logs(action="RETRIEVE")] == [
+        "Copied password for: github", "written by hand"
+    ]
+
+def test_query_logs_indexes_segments_rotated_before_the_index(tmp_path):
+    service = AuditService(str(tmp_path), flush_bytes=1, max_bytes=300)
+    for n in range(30):
+        service.log_event("RETRIEVE", f"number {n}")
+    service.flush()
+    assert len(service.segments()) > 1
+
+    service.index.reset()
+
+    assert [log["details"] for log in service.query_logs(action="RETRIEVE")] == [f"number {n}" for n in range(30)]
+
+def test_query_logs_recovers_from_failed_segment_rename(tmp_path, monkeypatch):
+    service = AuditService(str(tmp_path), flush_bytes=1)
+    for n in range(5):
+        service.log_event("RETRIEVE", f"before {n}")
+    service.flush()
+    service.query_logs()
+
+    def fail(segment_name):
+        raise OSError("database is locked")
+
+    monkeypatch.setattr(service.index, "rename_live_file", fail)
+    service.rotate()
+    monkeypatch.undo()
+
+    for n in range(2):
+        service.log_event("RETRIEVE", f"after {n}")
+
+    assert [log["details"] for log in service.query_logs(action="RETRIEVE")] == (
+        [f"before {n}" for n in range(5)] + [f"after {n}" for n in range(2)]
+    )
+
+def test_flush_leaves_the_index_alone(tmp_path):
+    service = AuditService(str(tmp_path))
+    service.log_event("RETRIEVE", "Copied password for: github")
+    service.flush()
+
+    assert not os.path.exists(service.index.filepath)
+    assert len(service.query_logs(action="RETRIEVE")) == 1
+
+def test_query_logs_survives_a_corrupt_index_and_bad_bytes(tmp_path):
+    service = AuditService(str(tmp_path))
+    with open(service.log_file, "wb") as f:
+        f.write(b"[2024-01-01 00:00:00] RETRIEVE: caf\xc3\n")
+
+    assert [log["details"] for log in service.query_logs(action="RETRIEVE")] == ["caf\ufffd"]
+
+    with open(service.index.filepath, "wb") as f:
+        f.write(b"not an index" * 100)
+
+    assert service.query_logs(action="RETRIEVE") == []
+
+def test_observers_receive_each_event(service):
+    seen = []
+    service.add_observer(lambda action, details: seen.append((action, details)))
+
+    service.log_event("login_failure", "Incorrect master password attempt")
+
+    assert seen == [("LOGIN_FAILURE", "Incorrect master password attempt")]
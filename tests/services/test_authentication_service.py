@@ -38,3 +38,22 @@ def test_verify_password_fails_when_no_hash_exists(auth_service):
     auth_service.hasher.verify_password.assert_not_called()
 
 
+
+def test_verify_password_rehashes_outdated_hash(auth_service):
+    auth_service.repo.load_hash.return_value = "legacy_hash"
+    auth_service.hasher.verify_password.return_value = True
+    auth_service.hasher.needs_rehash.return_value = True
+    auth_service.hasher.hash_password.return_value = "upgraded_hash"
+
+    assert auth_service.verify_password("fake_password")
+
+    auth_service.repo.save_hash.assert_called_with("upgraded_hash")
+
+def test_failed_login_never_rehashes(auth_service):
+    auth_service.repo.load_hash.return_value = "legacy_hash"
+    auth_service.hasher.verify_password.return_value = False
+    auth_service.hasher.needs_rehash.return_value = True
+
+    assert not auth_service.verify_password("wrong_password")
+
+    auth_service.repo.save_hash.assert_not_called()
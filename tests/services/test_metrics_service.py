@@ -0,0 +1,69 @@
+import os
+import pytest
+from src.vault.services.audit_service import AuditService
+from src.vault.services.metrics_service import MetricsService
+from src.vault.utils.profiling import Profiler
+
+@pytest.fixture
+def metrics(tmp_path):
+    return MetricsService(str(tmp_path / "vault.prom"))
+
+def read_samples(metrics):
+    with open(metrics.filepath) as f:
+        return dict(line.rsplit(" ", 1) for line in f.read().splitlines() if not line.startswith("#"))
+
+def test_events_are_counted_by_action(tmp_path, metrics):
+    audit = AuditService(str(tmp_path))
+    metrics.attach(audit, Profiler())
+
+    audit.log_event("ADD", "Added credential for: github")
+    audit.log_event("ADD_FAIL", "Duplicate entry")
+    audit.log_event("ADD_FAIL", "Duplicate entry")
+    metrics.flush()
+
+    samples = read_samples(metrics)
+    assert samples['vault_events_total{action="ADD"}'] == "1"
+    assert samples['vault_events_total{action="ADD_FAIL"}'] == "2"
+
+def test_counters_accumulate_across_runs_and_gauges_replace(tmp_path):
+    path = str(tmp_path / "vault.prom")
+
+    for count in (3, 5):
+        metrics = MetricsService(path)
+        metrics.record_event("LOGIN_FAILURE")
+        metrics.record_vault(str(tmp_path / "credentials.json"), count)
+        metrics.flush()
+
+    samples = read_samples(metrics)
+    assert samples['vault_events_total{action="LOGIN_FAILURE"}'] == "2"
+    assert samples['vault_credentials{vault="credentials"}'] == "5"
+
+def test_kdf_phases_fill_histogram(metrics):
+    profiler = Profiler()
+    profiler.add_observer(["encryptor.kdf"], metrics.record_phase)
+
+    with profiler.phase("encryptor.kdf"):
+        pass
+    metrics.record_phase("auth.verify_password", 0.3)
+    metrics.flush()
+
+    samples = read_samples(metrics)
+    assert samples['vault_kdf_duration_seconds_bucket{operation="vault_key",le="0.01"}'] == "1"
+    assert samples['vault_kdf_duration_seconds_count{operation="vault_key"}'] == "1"
+    assert samples['vault_kdf_duration_seconds_bucket{operation="verify_master",le="0.25"}'] == "0"
+    assert samples['vault_kdf_duration_seconds_bucket{operation="verify_master",le="+Inf"}'] == "1"
+    assert samples['vault_kdf_duration_seconds_sum{operation="verify_master"}'] == "0.3"
+
+def test_file_is_replaced_without_temporary_prom_files(tmp_path, metrics):
+    metrics.record_event("RETRIEVE")
+    metrics.flush()
+
+    with open(metrics.filepath) as f:
+        assert f.readline() == "# HELP vault_events_total Audit events logged by the vault, by action.\n"
+    assert sorted(name for name in os.listdir(tmp_path) if name.endswith(".prom")) == ["vault.prom"]
+
+def test_unwritable_directory_is_ignored(tmp_path):
+    metrics = MetricsService(str(tmp_path / "missing" / "vault.prom"))
+    metrics.record_event("RETRIEVE")
+
+    metrics.flush()
@@ -0,0 +1,211 @@
+import os
+import base64
+import pytest
+from src.vault.models.credential import Credential
+from src.vault.repositories.json_repository import JsonRepository
+from src.vault.repositories.rotation_journal import RotationJournal
+from src.vault.services.vault_service import VaultService
+from src.vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "MasterPassword10!"
+NEW_PASSWORD = "NewPassword10!"
+
+def make_vault(data_dir, name, password=PASSWORD):
+    repo = JsonRepository(str(data_dir / f"{name}.json"), FernetDataEncryptor())
+    repo.save_data({name: Credential(name, "user", "secret").to_dict()}, password)
+
+def can_open(data_dir, name, password):
+    try:
+        JsonRepository(str(data_dir / f"{name}.json"), FernetDataEncryptor()).load_data(password)
+        return True
+    except ValueError:
+        return False
+
+@pytest.fixture
+def service(tmp_path):
+    repo = JsonRepository(str(tmp_path / "credentials.json"), FernetDataEncryptor())
+    return VaultService(repo, PASSWORD)
+
+def test_add_and_get_credential(service):
+    assert service.add_credential(Credential("GitHub", "octo", "cat"))
+    assert not service.add_credential(Credential("github", "other", "dog"))
+
+    assert service.get_credential("GITHUB").username == "octo"
+
+def test_update_and_delete_credential(service):
+    service.add_credential(Credential("GitHub", "octo", "cat"))
+
+    assert service.update_credential(Credential("GitHub", None, "new-cat"))
+    assert service.get_credential("github").username == "octo"
+    assert service.get_credential("github").password == "new-cat"
+
+    assert service.delete_credential("github")
+    assert not service.delete_credential("github")
+
+def test_change_master_password_rotates_every_vault(service, tmp_path):
+    service.add_credential(Credential("GitHub", "octo", "cat"))
+    for name in ("work", "personal", "shared"):
+        make_vault(tmp_path, name)
+
+    progress = []
+    success_count, errors = service.change_master_password(NEW_PASSWORD, progress=lambda *args: progress.append(args))
+
+    assert (success_count, errors) == (4, [])
+    assert len(progress) == 4
+    assert progress[-1][:2] == (4, 4)
+    for name in ("credentials", "work", "personal", "shared"):
+        assert can_open(tmp_path, name, NEW_PASSWORD)
+    assert not RotationJournal(str(tmp_path)).exists()
+
+def test_change_master_password_reports_failed_vaults(service, tmp_path):
+    make_vault(tmp_path, "work")
+    make_vault(tmp_path, "other", password="SomeOtherPassword10!")
+
+    success_count, errors = service.change_master_password(NEW_PASSWORD)
+
+    assert success_count == 1
+    assert len(errors) == 1
+    assert "other.json" in errors[0]
+    assert service.password == PASSWORD
+    assert service.has_pending_rotation()
+
+def test_failed_vault_leaves_active_vault_and_journal_for_retry(service, tmp_path, monkeypatch):
+    service.add_credential(Credential("GitHub", "octo", "cat"))
+    for name in ("a", "b"):
+        make_vault(tmp_path, name)
+
+    original_rotate = JsonRepository.rotate_key
+
+    def failing_rotate(repo, old, new):
+        if repo.filepath.endswith("b.json"):
+            raise IOError("disk full")
+        original_rotate(repo, old, new)
+
+    monkeypatch.setattr(JsonRepository, "rotate_key", failing_rotate)
+    success_count, errors = service.change_master_password(NEW_PASSWORD)
+
+    assert (success_count, len(errors)) == (1, 1) and "b.json" in errors[0]
+    assert service.password == PASSWORD
+    assert service.has_pending_rotation()
+    assert can_open(tmp_path, "credentials", PASSWORD)
+    assert can_open(tmp_path, "b", PASSWORD)
+
+    rotated = []
+    monkeypatch.setattr(JsonRepository, "rotate_key",
+                        lambda repo, old, new: (rotated.append(os.path.basename(repo.filepath)), original_rotate(repo, old, new)))
+    success_count, errors = service.change_master_password(NEW_PASSWORD)
+
+    assert (success_count, errors) == (3, [])
+    assert sorted(rotated) == ["b.json", "credentials.json"]
+    assert service.password == NEW_PASSWORD
+    assert not service.has_pending_rotation()
+
+def test_interrupted_rotation_resumes_remaining_vaults(service, tmp_path, monkeypatch):
+    for name in ("a", "b", "c"):
+        make_vault(tmp_path, name)
+
+    original_rotate = JsonRepository.rotate_key
+    calls = []
+
+    def interrupted_rotate(repo, old, new):
+        calls.append(os.path.basename(repo.filepath))
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        original_rotate(repo, old, new)
+
+    monkeypatch.setattr(JsonRepository, "rotate_key", interrupted_rotate)
+    with pytest.raises(KeyboardInterrupt):
+        service.change_master_password(NEW_PASSWORD, max_workers=1)
+    monkeypatch.setattr(JsonRepository, "rotate_key", original_rotate)
+
+    assert service.has_pending_rotation()
+    assert service.password == PASSWORD
+
+    rotated = []
+    monkeypatch.setattr(JsonRepository, "rotate_key",
+                        lambda repo, old, new: (rotated.append(os.path.basename(repo.filepath)), original_rotate(repo, old, new)))
+    success_count, errors = service.change_master_password(NEW_PASSWORD, max_workers=1)
+
+    assert (success_count, errors) == (3, [])
+    assert calls[0] not in rotated
+    for name in ("a", "b", "c"):
+        assert can_open(tmp_path, name, NEW_PASSWORD)
+    assert not service.has_pending_rotation()
+
+def test_resume_with_different_new_password_is_rejected(service, tmp_path):
+    make_vault(tmp_path, "work")
+    journal = RotationJournal(str(tmp_path))
+    verifier = FernetDataEncryptor().encrypt("credential-vault-rotation", NEW_PASSWORD)
+    journal.start(base64.b64encode(verifier).decode("ascii"))
+
+    with pytest.raises(ValueError, match="interrupted"):
+        service.change_master_password("YetAnotherPassword10!")
+
+def test_search_tracks_adds_deletes_and_imports(service):
+    assert service.search_credentials("netflix") == {}
+
+    service.add_credential(Credential("Netflix", "saul", "pw"))
+    service.add_credential(Credential("GitHub", "octo", "cat"))
+    service.import_credentials({"hulu": {"service_name": "Hulu", "username": "u", "password": "p"}})
+
+    assert list(service.search_credentials("netlfix")) == ["netflix"]
+    assert list(service.search_credentials("HULU")) == ["hulu"]
+
+    service.delete_credential("netflix")
+
+    assert service.search_credentials("netlfix") == {}
+
+def test_rank_credentials_pages_through_results(service):
+    for name in ("GitHub", "GitLab", "GitHub-Work", "Gitea", "Netflix"):
+        service.add_credential(Credential(name, "user", "pw"))
+
+    everything = service.rank_credentials("github")
+    first_page = service.rank_credentials("github", limit=2)
+    second_page = service.rank_credentials("github", limit=2, offset=2)
+
+    assert everything[0].credential.service_name == "GitHub"
+    assert [r.key for r in first_page + second_page] == [r.key for r in everything[:4]]
+    assert all(r.score >= 61 for r in everything)
+    assert all(r.score >= 90 for r in service.rank_credentials("github", min_score=90))
+
+def test_transaction_saves_once_at_commit(service, monkeypatch):
+    saves = []
+    original = service.repo.save_data
+    monkeypatch.setattr(service.repo, "save_data", lambda data, password: (saves.append(len(data)), original(data, password)))
+
+    with service.transaction():
+        service.add_credential(Credential("GitHub", "octo", "cat"))
+        service.add_credential(Credential("GitLab", "fox", "dog"))
+        service.delete_credential("github")
+        assert saves == []
+
+    assert saves == [1]
+    reopened = VaultService(JsonRepository(service.repo.filepath, FernetDataEncryptor()), PASSWORD)
+    assert list(reopened.credentials) == ["gitlab"]
+
+def test_transaction_rolls_back_on_error(service):
+    service.add_credential(Credential("GitHub", "octo", "cat"))
+    service.add_credential(Credential("Netflix", "saul", "popcorn"))
+    service.rank_credentials("github")
+
+    with pytest.raises(RuntimeError):
+        with service.transaction():
+            service.add_credential(Credential("GitLab", "fox", "dog"))
+            service.update_credential(Credential("GitHub", "someone", "else"))
+            service.delete_credential("netflix")
+            raise RuntimeError("abort")
+
+    assert sorted(service.credentials) == ["github", "netflix"]
+    assert service.get_credential("github").username == "octo"
+    assert "gitlab" not in [result.key for result in service.rank_credentials("gitlab")]
+    assert "netflix" in [result.key for result in service.rank_credentials("netflix")]
+
+def test_bulk_add_and_delete_report_what_changed(service):
+    service.add_credential(Credential("GitHub", "octo", "cat"))
+
+    added = service.add_credentials([Credential("GitHub", "x", "y"), Credential("GitLab", "fox", "dog")])
+    deleted = service.delete_credentials(["github", "missing", "gitlab"])
+
+    assert added == ["GitLab"]
+    assert deleted == ["github", "gitlab"]
+    assert len(service.credentials) == 0
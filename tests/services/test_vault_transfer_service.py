@@ -0,0 +1,106 @@
+import json
+import pytest
+from src.vault.models.credential import Credential
+from src.vault.repositories.json_repository import JsonRepository
+from src.vault.services.vault_service import VaultService
+from src.vault.services.vault_transfer_service import VaultTransferService
+from src.vault.utils.encryptors import FernetDataEncryptor
+
+PASSWORD = "MasterPassword10!"
+
+@pytest.fixture
+def service(tmp_path):
+    service = VaultService(JsonRepository(str(tmp_path / "credentials.json"), FernetDataEncryptor()), PASSWORD)
+    service.add_credential(Credential("GitHub", "octo", "cat"))
+    return service
+
+def write_ndjson(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+def reopen(service):
+    return VaultService(JsonRepository(service.repo.filepath, FernetDataEncryptor()), PASSWORD)
+
+def test_import_streams_records_in_chunks_and_saves_each_chunk(service, tmp_path, monkeypatch):
+    path = tmp_path / "export.ndjson"
+    write_ndjson(path, [{"service_name": f"Service-{i}", "username": "user", "password": "secret"} for i in range(25)]
+                 + [{"service_name": "GitHub", "username": "new", "password": "dog"}, {"username": "no-name"}])
+
+    saves, chunks, progress = [], [], []
+    monkeypatch.setattr(service.repo, "save_data", lambda data, password, save=service.repo.save_data: (saves.append(1), save(data, password)))
+    monkeypatch.setattr(service, "import_credentials", lambda data, original=service.import_credentials: (chunks.append(len(data)), original(data))[1])
+    monkeypatch.setattr(service, "list_all_credentials", lambda: pytest.fail("import must not list the whole vault"))
+
+    summary = VaultTransferService(service).import_from_file(str(path), chunk_size=10, progress=lambda *args: progress.append(args))
+
+    assert (summary.imported, summary.conflicts, summary.invalid) == (26, 1, 1)
+    assert chunks == [10, 10, 6]
+    assert len(saves) == 3
+    assert progress[-1][0] == progress[-1][1]
+    assert len(reopen(service).credentials) == 26
+    assert reopen(service).get_credential("github").username == "new"
+
+def test_dry_run_reports_without_writing(service, tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text("title,username,password\nGitHub,octo,cat\nGitLab,fox,dog\nGitLab,fox,dog\n")
+    before = open(service.repo.filepath, "rb").read()
+
+    summary = VaultTransferService(service).import_from_file(str(path), dry_run=True)
+
+    assert (summary.imported, summary.conflicts, summary.invalid) == (3, 2, 0)
+    assert summary.dry_run
+    assert list(service.credentials) == ["github"]
+    assert open(service.repo.filepath, "rb").read() == before
+
+def test_broken_file_keeps_chunks_imported_before_the_error(service, tmp_path):
+    path = tmp_path / "backup.json"
+    path.write_text('{"gitlab": {"service_name": "GitLab", "username": "fox", "password": "dog"}, "broken": ')
+
+    with pytest.raises(ValueError):
+        VaultTransferService(service).import_from_file(str(path), chunk_size=1)
+
+    assert sorted(service.credentials) == ["github", "gitlab"]
+    assert sorted(reopen(service).credentials) == ["github", "gitlab"]
+
+def test_failed_chunk_save_rolls_back_that_chunk(service, tmp_path, monkeypatch):
+    path = tmp_path / "export.ndjson"
+    write_ndjson(path, [{"service_name": "GitHub", "username": "new", "password": "dog"},
+                        {"service_name": "GitLab", "username": "fox", "password": "dog"}])
+
+    def fail(data, password):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(service.repo, "save_data", fail)
+
+    with pytest.raises(OSError):
+        VaultTransferService(service).import_from_file(str(path))
+
+    assert list(service.credentials) == ["github"]
+    assert service.get_credential("github").username == "octo"
+
+def test_read_credentials_accepts_export_layout(service, tmp_path):
+    path = tmp_path / "backup.json"
+    VaultTransferService(service).export_to_file(str(path))
+
+    assert VaultTransferService(service).read_credentials(str(path)) == [Credential("GitHub", "octo", "cat")]
+
+@pytest.mark.parametrize("name", ["export.json", "export.ndjson", "export.csv"])
+def test_export_round_trips_through_import(service, tmp_path, name):
+    service.add_credential(Credential("Netflix", "saul", "pop,corn"))
+    path = tmp_path / name
+    progress = []
+
+    VaultTransferService(service).export_to_file(str(path), progress=lambda *args: progress.append(args))
+
+    target = VaultService(JsonRepository(str(tmp_path / "target.json"), FernetDataEncryptor()), PASSWORD)
+    summary = VaultTransferService(target).import_from_file(str(path))
+
+    assert summary.imported == 2
+    assert target.get_credential("netflix").password == "pop,corn"
+    assert progress[-1] == (2, 2, "credentials")
+
+def test_export_selected_fields_with_explicit_format(service, tmp_path):
+    path = tmp_path / "usernames.txt"
+
+    VaultTransferService(service).export_to_file(str(path), "ndjson", ["username"])
+
+    assert path.read_text() == '{"username":"octo"}\n'
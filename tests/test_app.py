@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def loaded_modules(tmp_path, script):
+    code = (
+        f"import sys, importlib.util\n{script}\n"
+        "loaded = [name for name, module in list(sys.modules.items()) if type(module) is not importlib.util._LazyModule]\n"
+        "sys.stderr.write(' '.join(loaded))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=dict(os.environ, HOME=str(tmp_path)),
+        stdin=subprocess.DEVNULL, capture_output=True, text=True, check=True
+    )
+    return {name.split(".")[0] for name in completed.stderr.split()}
+
+def test_help_loads_no_heavy_dependencies(tmp_path):
+    modules = loaded_modules(tmp_path, "sys.argv = ['vault', 'help']\nfrom src.vault.app import run\nrun()")
+
+    assert not modules & {"cryptography", "thefuzz", "rapidfuzz", "rich", "pyperclip"}
+
+def test_generate_path_skips_crypto_search_and_rich(tmp_path):
+    modules = loaded_modules(tmp_path, (
+        "from src.vault.app import setup_plain_view\n"
+        "from src.vault.controllers.generator_controller import GeneratorController\n"
+        "view = setup_plain_view()\n"
+        "view.show_header('Password Generator')\n"
+        "view.show_success('secret')"
+    ))
+
+    assert not modules & {"cryptography", "thefuzz", "rapidfuzz", "rich", "pyperclip"}
+
+def test_console_view_imports_rich_on_first_output(tmp_path):
+    assert "rich" not in loaded_modules(tmp_path, "from src.vault.app import setup_view\nsetup_view()")
+    assert "rich" in loaded_modules(tmp_path, "from src.vault.app import setup_view\nsetup_view().show_info('hi')")
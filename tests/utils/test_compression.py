@@ -0,0 +1,24 @@
+import os
+import pytest
+from src.vault.utils.compression import available_codecs, get_codec
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_round_trip(name):
+    codec = get_codec(name)
+    chunks = [b'{"service_name": "GitHub", "username": "octo@example.com"}\n' * 500, os.urandom(1000), b""]
+
+    compressed = list(codec.compress(chunks))
+
+    assert b"".join(codec.decompress(compressed)) == b"".join(chunks)
+
+@pytest.mark.parametrize("name", [name for name in available_codecs() if name != "none"])
+def test_truncated_stream_is_rejected(name):
+    codec = get_codec(name)
+    compressed = b"".join(codec.compress([b"credential " * 1000]))
+
+    with pytest.raises(ValueError):
+        list(codec.decompress([compressed[:len(compressed) // 2]]))
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        get_codec("brotli")
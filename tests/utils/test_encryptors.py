@@ -1,7 +1,14 @@
+import hashlib
+import io
+import os
 import pytest
-from src.vault.utils.encryptors import Pbkdf2PasswordHasher, FernetDataEncryptor
+from src.vault.utils.encryptors import Pbkdf2PasswordHasher, FernetDataEncryptor, unpack_envelope, SEGMENT_SIZE, SEGMENT_TAG_SIZE
 from cryptography.fernet import InvalidToken
 
+def salt_of(blob):
+    header, _ = unpack_envelope(blob)
+    return header["salt"]
+
 @pytest.fixture
 def hasher():
     return Pbkdf2PasswordHasher()
@@ -63,3 +70,156 @@ def test_decrypt_wrong_password(encryptor):
 
     with pytest.raises(InvalidToken):
         encryptor.decrypt(encrypted_data, wrong_password)
+
+def test_repeated_saves_reuse_derived_key(encryptor, monkeypatch):
+    password = "MasterPassword10!"
+    calls = []
+    original_derive = encryptor.derive_key
+
+    def counting_derive(pwd, salt, params=None):
+        calls.append(salt)
+        return original_derive(pwd, salt, params)
+
+    monkeypatch.setattr(encryptor, "derive_key", counting_derive)
+
+    first = encryptor.encrypt("one", password)
+    second = encryptor.encrypt("two", password)
+
+    assert len(calls) == 1
+    assert salt_of(first) == salt_of(second)
+    assert encryptor.decrypt(second, password) == "two"
+    assert len(calls) == 1
+
+def test_decrypt_adopts_vault_salt_for_later_saves(encryptor):
+    password = "MasterPassword10!"
+    vault_blob = FernetDataEncryptor().encrypt("data", password)
+
+    encryptor.decrypt(vault_blob, password)
+    saved = encryptor.encrypt("new data", password)
+
+    assert salt_of(saved) == salt_of(vault_blob)
+
+def test_rekey_forces_fresh_salt(encryptor):
+    password = "MasterPassword10!"
+
+    before = encryptor.encrypt("data", password)
+    encryptor.rekey(password)
+    after = encryptor.encrypt("data", password)
+
+    assert salt_of(before) != salt_of(after)
+    assert encryptor.decrypt(before, password) == "data"
+
+def test_rewrap_keeps_payload_and_changes_password(encryptor):
+    data = '{"Netflix": {"username": "saul", "password": "password123"} }'
+    old_password = "MasterPassword10!"
+    new_password = "NewPassword10!"
+
+    encrypted_data = encryptor.encrypt(data, old_password)
+    rewrapped = encryptor.rewrap(encrypted_data, old_password, new_password)
+
+    assert unpack_envelope(rewrapped)[1] == unpack_envelope(encrypted_data)[1]
+    assert FernetDataEncryptor().decrypt(rewrapped, new_password) == data
+
+    with pytest.raises(InvalidToken):
+        FernetDataEncryptor().decrypt(rewrapped, old_password)
+
+def test_rewrap_wrong_password(encryptor):
+    encrypted_data = encryptor.encrypt("data", "MasterPassword10!")
+
+    with pytest.raises(InvalidToken):
+        encryptor.rewrap(encrypted_data, "WrongPassword10!", "NewPassword10!")
+
+def test_decrypt_rejects_non_envelope_data(encryptor):
+    with pytest.raises(InvalidToken):
+        encryptor.decrypt(b"\x00" * 16 + b"gAAAAAnotatoken", "MasterPassword10!")
+
+def encrypt_to_bytes(encryptor, plaintext, password, chunk=1000):
+    target = io.BytesIO()
+    encryptor.encrypt_stream((plaintext[i:i + chunk] for i in range(0, len(plaintext), chunk)), password, target)
+    return target.getvalue()
+
+def decrypt_from_bytes(encryptor, blob, password):
+    return b"".join(encryptor.decrypt_stream(io.BytesIO(blob), password))
+
+@pytest.mark.parametrize("size", [0, 1, SEGMENT_SIZE, SEGMENT_SIZE + 1, 3 * SEGMENT_SIZE])
+def test_stream_round_trip(encryptor, size):
+    plaintext = os.urandom(size)
+    blob = encrypt_to_bytes(encryptor, plaintext, "MasterPassword10!")
+
+    assert decrypt_from_bytes(FernetDataEncryptor(), blob, "MasterPassword10!") == plaintext
+
+def test_stream_detects_truncation_at_segment_boundary(encryptor):
+    blob = encrypt_to_bytes(encryptor, os.urandom(3 * SEGMENT_SIZE), "MasterPassword10!")
+    header, payload = unpack_envelope(blob)
+    truncated = blob[:len(blob) - len(payload)] + payload[:2 * (SEGMENT_SIZE + SEGMENT_TAG_SIZE)]
+
+    with pytest.raises(InvalidToken):
+        decrypt_from_bytes(encryptor, truncated, "MasterPassword10!")
+
+def test_stream_detects_reordered_segments(encryptor):
+    blob = encrypt_to_bytes(encryptor, os.urandom(3 * SEGMENT_SIZE), "MasterPassword10!")
+    header, payload = unpack_envelope(blob)
+    size = SEGMENT_SIZE + SEGMENT_TAG_SIZE
+    swapped = payload[size:2 * size] + payload[:size] + payload[2 * size:]
+
+    with pytest.raises(InvalidToken):
+        decrypt_from_bytes(encryptor, blob[:len(blob) - len(payload)] + swapped, "MasterPassword10!")
+
+def test_stream_rewrap_keeps_segments(encryptor):
+    blob = encrypt_to_bytes(encryptor, b"segmented data", "MasterPassword10!")
+
+    rewrapped = encryptor.rewrap(blob, "MasterPassword10!", "NewPassword10!")
+
+    assert unpack_envelope(rewrapped)[1] == unpack_envelope(blob)[1]
+    assert decrypt_from_bytes(FernetDataEncryptor(), rewrapped, "NewPassword10!") == b"segmented data"
+
+SCRYPT = {"kdf": "scrypt", "n": 1024, "r": 8, "p": 1}
+
+def test_header_records_configured_kdf():
+    blob = FernetDataEncryptor(SCRYPT).encrypt("data", "MasterPassword10!")
+
+    header, _ = unpack_envelope(blob)
+    assert {key: header[key] for key in SCRYPT} == SCRYPT
+    assert "iterations" not in header
+
+def test_vault_is_opened_with_its_own_kdf_and_saved_with_the_configured_one():
+    password = "MasterPassword10!"
+    old_blob = FernetDataEncryptor().encrypt("data", password)
+    encryptor = FernetDataEncryptor(SCRYPT)
+
+    assert encryptor.decrypt(old_blob, password) == "data"
+    saved = encryptor.encrypt("data", password)
+
+    assert unpack_envelope(saved)[0]["kdf"] == "scrypt"
+    assert salt_of(saved) == salt_of(old_blob)
+    assert FernetDataEncryptor().decrypt(saved, password) == "data"
+
+def test_rewrap_replaces_kdf_parameters():
+    blob = FernetDataEncryptor().encrypt("data", "MasterPassword10!")
+
+    header, _ = unpack_envelope(FernetDataEncryptor(SCRYPT).rewrap(blob, "MasterPassword10!", "NewPassword10!"))
+
+    assert header["kdf"] == "scrypt" and "iterations" not in header
+
+def test_unsupported_kdf_header_is_rejected(encryptor):
+    blob = FernetDataEncryptor().encrypt("data", "MasterPassword10!")
+    tampered = blob.replace(b'"iterations":100000', b'"iterations":999999999999')
+
+    with pytest.raises(InvalidToken):
+        encryptor.decrypt(tampered, "MasterPassword10!")
+
+def test_hash_records_kdf_and_verifies_with_it():
+    hashed = Pbkdf2PasswordHasher(SCRYPT).hash_password("MasterPassword10!")
+
+    assert hashed.startswith("scrypt$n=1024,r=8,p=1$")
+    assert Pbkdf2PasswordHasher().verify_password("MasterPassword10!", hashed)
+    assert not Pbkdf2PasswordHasher().verify_password("WrongPassword10!", hashed)
+
+def test_legacy_hash_verifies_and_needs_rehash(hasher):
+    salt = os.urandom(16)
+    legacy = (salt + hashlib.pbkdf2_hmac("sha256", b"MasterPassword10!", salt, 100000)).hex()
+
+    assert hasher.verify_password("MasterPassword10!", legacy)
+    assert hasher.needs_rehash(legacy)
+    assert not hasher.needs_rehash(hasher.hash_password("MasterPassword10!"))
+    assert Pbkdf2PasswordHasher(SCRYPT).needs_rehash(hasher.hash_password("MasterPassword10!"))
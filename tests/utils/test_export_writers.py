@@ -0,0 +1,44 @@
+import csv
+import io
+import json
+import pytest
+from src.vault.utils.export_writers import get_writer, select_fields, write_csv, write_json, write_ndjson
+from src.vault.utils.import_readers import iter_csv, iter_json, iter_ndjson
+
+RECORDS = [
+    ("github", {"service_name": "GitHub", "username": "octo", "password": "cat"}),
+    ("netflix", {"service_name": "Netflix", "username": "saul", "password": "pop,corn \"1\"\n"}),
+]
+
+def test_json_is_the_export_layout_and_reads_back():
+    stream = io.StringIO()
+    write_json(iter(RECORDS), stream)
+
+    assert json.loads(stream.getvalue()) == dict(RECORDS)
+    assert list(iter_json(io.StringIO(stream.getvalue()), 5)) == RECORDS
+
+def test_json_with_no_records():
+    stream = io.StringIO()
+    write_json(iter([]), stream)
+
+    assert json.loads(stream.getvalue()) == {}
+
+def test_ndjson_and_csv_read_back():
+    ndjson, table = io.StringIO(), io.StringIO()
+    write_ndjson(iter(RECORDS), ndjson)
+    write_csv(iter(RECORDS), table)
+
+    assert [record for _, record in iter_ndjson(io.StringIO(ndjson.getvalue()))] == [record for _, record in RECORDS]
+    assert [record for _, record in iter_csv(io.StringIO(table.getvalue(), newline=""))] == [record for _, record in RECORDS]
+
+def test_field_selection():
+    stream = io.StringIO()
+    write_csv(iter(RECORDS), stream, select_fields(["service_name", "username"]))
+
+    assert list(csv.reader(io.StringIO(stream.getvalue()))) == [["service_name", "username"], ["GitHub", "octo"], ["Netflix", "saul"]]
+
+def test_unknown_fields_and_formats_are_rejected():
+    with pytest.raises(ValueError):
+        select_fields(["pin"])
+    with pytest.raises(ValueError):
+        get_writer("xml")
@@ -0,0 +1,77 @@
+import io
+import json
+import pytest
+from src.vault.utils.import_readers import detect_format, get_reader, iter_csv, iter_json, iter_ndjson
+
+RECORDS = {
+    "github": {"service_name": "GitHub", "username": "octo", "password": "cat"},
+    "netflix": {"service_name": "Netflix", "username": "saul", "password": "pop,corn \"1\""},
+}
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_json_object_is_parsed_incrementally(chunk_size):
+    stream = io.StringIO(json.dumps(RECORDS, indent=4))
+
+    assert list(iter_json(stream, chunk_size)) == list(RECORDS.items())
+
+@pytest.mark.parametrize("chunk_size", [3, 64 * 1024])
+def test_json_array_yields_records_without_keys(chunk_size):
+    stream = io.StringIO(json.dumps(list(RECORDS.values())))
+
+    assert list(iter_json(stream, chunk_size)) == [(None, record) for record in RECORDS.values()]
+
+def test_json_empty_containers():
+    assert list(iter_json(io.StringIO(" {} "))) == []
+    assert list(iter_json(io.StringIO("[]"))) == []
+
+def test_json_truncated_file_raises_value_error():
+    with pytest.raises(ValueError):
+        list(iter_json(io.StringIO(json.dumps(RECORDS)[:-10]), 8))
+
+class CountingStream(io.StringIO):
+    def __init__(self, text):
+        super().__init__(text)
+        self.chars_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.chars_read += len(data)
+        return data
+
+def test_json_syntax_error_fails_without_reading_the_rest():
+    records = {f"service-{i}": {"service_name": f"Service-{i}", "username": "user", "password": "pw"} for i in range(200000)}
+    text = json.dumps(records).replace('"username": "user"', '"username" "user"', 1)
+    stream = CountingStream(text)
+
+    with pytest.raises(ValueError, match="Expecting ':' delimiter"):
+        list(iter_json(stream, 1024))
+
+    assert stream.chars_read <= 2 * 1024
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 16])
+def test_json_long_strings_span_many_chunks(chunk_size):
+    records = {"github": {"service_name": "GitHub", "username": "octo", "password": "x" * 200}}
+
+    assert list(iter_json(io.StringIO(json.dumps(records)), chunk_size)) == list(records.items())
+
+def test_ndjson_skips_blank_lines():
+    stream = io.StringIO("\n".join(json.dumps(record) for record in RECORDS.values()) + "\n\n")
+
+    assert [record for _, record in iter_ndjson(stream)] == list(RECORDS.values())
+
+def test_csv_maps_column_aliases():
+    stream = io.StringIO('name,url,login_username,login_password\n'
+                         'GitHub,https://github.com,octo,cat\n'
+                         '\n'
+                         'Netflix,,saul,"pop,corn ""1"""\n')
+
+    assert [record for _, record in iter_csv(stream)] == list(RECORDS.values())
+
+def test_format_is_detected_from_extension():
+    assert detect_format("export.CSV") == "csv"
+    assert detect_format("export.ndjson") == "ndjson"
+    assert detect_format("export.jsonl") == "ndjson"
+    assert detect_format("backup.json") == "json"
+
+    with pytest.raises(ValueError):
+        get_reader("xml")
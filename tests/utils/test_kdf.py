@@ -0,0 +1,39 @@
+import pytest
+from src.vault.utils import kdf
+from src.vault.utils.kdf import DEFAULT_KDF, MIN_CALIBRATED, calibrate, derive, format_params, normalise_kdf, parse_params
+
+def test_missing_parameters_take_defaults():
+    assert normalise_kdf(None) == DEFAULT_KDF
+    assert normalise_kdf({"kdf": "scrypt"}) == {"kdf": "scrypt", "n": 32768, "r": 8, "p": 1}
+
+@pytest.mark.parametrize("params", [
+    {"kdf": "argon2"},
+    {"kdf": "pbkdf2-sha256", "iterations": 10},
+    {"kdf": "pbkdf2-sha256", "iterations": "many"},
+    {"kdf": "scrypt", "n": 3000},
+    {"kdf": "scrypt", "n": 2 ** 20, "r": 16},
+])
+def test_invalid_parameters_are_rejected(params):
+    with pytest.raises(ValueError):
+        normalise_kdf(params)
+
+def test_params_round_trip_through_text():
+    params = {"kdf": "scrypt", "n": 1024, "r": 4, "p": 2}
+
+    assert parse_params("scrypt", format_params(params)) == params
+
+def test_pbkdf2_matches_original_derivation():
+    import hashlib
+
+    assert derive(DEFAULT_KDF, b"password", b"salt" * 4) == hashlib.pbkdf2_hmac("sha256", b"password", b"salt" * 4, 100000)
+
+def test_calibration_never_goes_below_minimum():
+    assert calibrate("pbkdf2-sha256", 0.001)["iterations"] == MIN_CALIBRATED["pbkdf2-sha256"]
+    assert calibrate("scrypt", 0.001)["n"] == MIN_CALIBRATED["scrypt"]
+
+def test_calibration_extrapolates_to_target(monkeypatch):
+    # A machine doing a million PBKDF2 iterations, or scrypt blocks of n=16384, per second.
+    monkeypatch.setattr(kdf, "_time_derivation", lambda params: params.get("iterations", params.get("n")) / 1000000)
+
+    assert calibrate("pbkdf2-sha256", 0.5)["iterations"] == 500000
+    assert calibrate("scrypt", 0.1)["n"] == 65536
@@ -0,0 +1,69 @@
+import json
+import os
+import pytest
+from cryptography.fernet import Fernet, InvalidToken
+from src.vault.utils.encryptors import FernetDataEncryptor, is_envelope, payload_info
+from src.vault.utils.migrators import EnvelopeFormatMigrator
+from src.vault.utils.serializers import BinaryRecordSerializer
+from src.vault.repositories.json_repository import JsonRepository
+
+PASSWORD = "MasterPassword10!"
+DATA = '{"netflix": {"service_name": "Netflix", "username": "saul", "password": "password123"}}'
+
+def legacy_blob(encryptor, data, password):
+    salt = os.urandom(16)
+    return salt + Fernet(encryptor.derive_key(password, salt)).encrypt(data.encode('utf-8'))
+
+@pytest.fixture
+def encryptor():
+    return FernetDataEncryptor()
+
+@pytest.fixture
+def migrator(encryptor):
+    return EnvelopeFormatMigrator(encryptor)
+
+def test_needs_upgrade_detects_legacy_files(migrator, encryptor):
+    assert migrator.needs_upgrade(legacy_blob(encryptor, DATA, PASSWORD))
+    assert not migrator.needs_upgrade(encryptor.encrypt(DATA, PASSWORD))
+    assert not migrator.needs_upgrade(b"")
+
+def test_upgrade_produces_envelope(migrator, encryptor):
+    upgraded = migrator.upgrade(legacy_blob(encryptor, DATA, PASSWORD), PASSWORD)
+
+    assert is_envelope(upgraded)
+    assert encryptor.decrypt(upgraded, PASSWORD) == DATA
+
+def test_upgrade_wrong_password(migrator, encryptor):
+    with pytest.raises(InvalidToken):
+        migrator.upgrade(legacy_blob(encryptor, DATA, PASSWORD), "WrongPassword10!")
+
+def test_repository_rewrites_legacy_vault_on_load(tmp_path, encryptor, migrator):
+    path = tmp_path / "vault.json"
+    path.write_bytes(legacy_blob(encryptor, DATA, PASSWORD))
+
+    data = JsonRepository(str(path), encryptor, migrator).load_data(PASSWORD)
+
+    assert data["netflix"].username == "saul"
+    assert is_envelope(path.read_bytes())
+
+def test_json_vault_is_rewritten_in_configured_format(tmp_path, encryptor):
+    path = tmp_path / "vault.json"
+    JsonRepository(str(path), encryptor).save_data(json.loads(DATA), PASSWORD)
+
+    migrator = EnvelopeFormatMigrator(encryptor, BinaryRecordSerializer())
+    repository = JsonRepository(str(path), encryptor, migrator, BinaryRecordSerializer())
+
+    assert migrator.needs_upgrade(path.read_bytes())
+    assert repository.load_data(PASSWORD)["netflix"].username == "saul"
+    assert payload_info(path.read_bytes())["format"] == "binary"
+    assert not migrator.needs_upgrade(path.read_bytes())
+
+def test_legacy_vault_is_upgraded_to_configured_format(tmp_path, encryptor):
+    path = tmp_path / "vault.json"
+    path.write_bytes(legacy_blob(encryptor, DATA, PASSWORD))
+
+    repository = JsonRepository(str(path), encryptor, EnvelopeFormatMigrator(encryptor, BinaryRecordSerializer()),
+                                BinaryRecordSerializer())
+
+    assert repository.load_data(PASSWORD)["netflix"].password == "password123"
+    assert payload_info(path.read_bytes())["format"] == "binary"
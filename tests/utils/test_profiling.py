@@ -0,0 +1,76 @@
+import pstats
+import threading
+from src.vault.models.credential import Credential
+from src.vault.repositories.json_repository import JsonRepository
+from src.vault.services.vault_service import VaultService
+from src.vault.utils.encryptors import FernetDataEncryptor
+from src.vault.utils.profiling import NULL_PHASE, Profiler, profile_command, profiler
+
+PASSWORD = "MasterPassword10!"
+
+def test_disabled_profiler_records_nothing():
+    local = Profiler()
+
+    assert local.phase("load") is NULL_PHASE
+    with local.phase("load"):
+        local.count("things")
+
+    assert local.timings == {} and local.counters == {}
+
+def test_nested_phases_are_inclusive_and_ordered():
+    local = Profiler()
+    local.enable()
+
+    with local.phase("load"):
+        with local.phase("kdf"):
+            pass
+        with local.phase("parse"):
+            with local.phase("parse"):
+                pass
+    local.disable()
+
+    assert list(local.timings) == ["load", "kdf", "parse"]
+    assert local.depths == {"load": 0, "kdf": 1, "parse": 1}
+    assert local.calls["parse"] == 2
+    assert local.timings["load"] >= local.timings["kdf"] + local.timings["parse"]
+    assert local.report()[2].startswith("  kdf")
+
+def test_other_threads_are_not_recorded():
+    local = Profiler()
+    local.enable()
+
+    thread = threading.Thread(target=lambda: local.phase("background").__enter__())
+    thread.start()
+    thread.join()
+
+    assert "background" not in local.timings
+
+def test_observers_see_phases_while_disabled():
+    local = Profiler()
+    seen = []
+    local.add_observer(["kdf"], lambda name, seconds: seen.append(name))
+
+    assert local.phase("parse") is NULL_PHASE
+    with local.phase("kdf"):
+        pass
+    local.enable()
+    with local.phase("kdf"):
+        pass
+
+    assert seen == ["kdf", "kdf"]
+    assert local.calls == {"kdf": 1}
+
+def test_vault_phases_are_recorded(tmp_path):
+    JsonRepository(str(tmp_path / "vault.json"), FernetDataEncryptor()).save_data(
+        {"github": Credential("GitHub", "octo", "cat").to_dict()}, PASSWORD)
+    dump = tmp_path / "command.pstats"
+
+    with profile_command(str(dump)):
+        service = VaultService(JsonRepository(str(tmp_path / "vault.json"), FernetDataEncryptor()), PASSWORD)
+        service.get_credential("github")
+
+    assert {"vault.load", "repository.load", "encryptor.kdf", "encryptor.decrypt", "payload.parse"} <= set(profiler.timings)
+    assert profiler.depths["repository.load"] > profiler.depths["vault.load"]
+    assert profiler.counters["credentials built"] == 1
+    assert not profiler.enabled
+    assert pstats.Stats(str(dump)).total_calls > 0
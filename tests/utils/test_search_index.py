@@ -0,0 +1,109 @@
+import random
+import string
+import pytest
+from thefuzz import fuzz
+from src.vault.utils.search_index import ServiceNameIndex
+
+def naive_matches(names, query, threshold=60):
+    return {key for key, name in names.items() if fuzz.partial_ratio(query.lower(), name.lower()) > threshold}
+
+def indexed_matches(index, query, threshold=60):
+    return set(index.search(query, threshold))
+
+def random_name(rng):
+    alphabet = string.ascii_letters + string.digits + "-_. "
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+
+def test_search_matches_linear_scan_on_random_corpus():
+    rng = random.Random(1234)
+    words = ["github", "gitlab", "netflix", "amazon", "aws-prod", "aws-dev", "bank", "mail", "google", "outlook"]
+    names = {}
+    for n in range(1500):
+        name = rng.choice(words) + random_name(rng) if rng.random() < 0.5 else random_name(rng)
+        names[f"key{n}"] = name
+
+    index = ServiceNameIndex(names)
+    queries = words + ["netlfix", "gthub", "aws", "a", "", "zz", "amzon-prod-account-name"]
+    queries += [random_name(rng) for _ in range(150)]
+
+    for query in queries:
+        assert indexed_matches(index, query) == naive_matches(names, query), query
+
+def test_filtered_candidates_never_drop_a_match():
+    rng = random.Random(99)
+    names = {f"key{n}": random_name(rng) for n in range(800)}
+    index = ServiceNameIndex(names)
+
+    for _ in range(200):
+        query = random_name(rng).lower()
+        keys = index.candidates(query, 60)
+        if keys is not None:
+            assert naive_matches(names, query) <= set(keys), query
+
+def test_search_returns_scores():
+    index = ServiceNameIndex({"netflix": "Netflix", "github": "GitHub"})
+
+    assert index.search("NETFLIX", 60) == {"netflix": 100}
+
+def test_candidates_narrow_the_scan():
+    names = {f"key{n}": f"service-{n}" for n in range(500)}
+    names["netflix"] = "Netflix"
+
+    index = ServiceNameIndex(names)
+    keys = index.candidates("xfl", 60)
+
+    assert "netflix" in keys
+    assert len(keys) < len(names)
+
+def test_candidates_fall_back_to_scan_for_common_characters():
+    index = ServiceNameIndex({f"key{n}": f"service-{n}" for n in range(50)})
+
+    assert index.candidates("service", 60) is None
+
+def test_add_and_remove_update_the_index():
+    index = ServiceNameIndex({"github": "GitHub"})
+
+    index.add("netflix", "Netflix")
+    index.remove("github")
+
+    assert "github" not in index
+    assert index.search("github", 60) == {}
+    assert list(index.search("netflix", 60)) == ["netflix"]
+
+def test_add_replaces_existing_name():
+    index = ServiceNameIndex({"work": "GitHub"})
+
+    index.add("work", "Netflix")
+
+    assert index.name("work") == "netflix"
+    assert index.search("github", 60) == {}
+
+def test_empty_query_only_matches_empty_names():
+    index = ServiceNameIndex({"blank": "", "github": "GitHub"})
+
+    assert index.search("", 60) == {"blank": 100}
+
+def naive_ranking(names, query, threshold=60):
+    scored = [(key, fuzz.partial_ratio(query.lower(), name.lower())) for key, name in names.items()]
+    return sorted([item for item in scored if item[1] > threshold], key=lambda item: (-item[1], item[0]))
+
+@pytest.mark.parametrize("limit", [None, 1, 5, 50])
+def test_rank_matches_full_sort_on_random_corpus(limit):
+    rng = random.Random(7)
+    words = ["github", "gitlab", "netflix", "aws", "mail"]
+    names = {f"key{n}": rng.choice(words) + random_name(rng) for n in range(600)}
+    names.update({f"dup{n}": "GitHub" for n in range(8)})
+    index = ServiceNameIndex(names)
+
+    queries = words + ["xq", "zz9", "netlfix", "g"] + [random_name(rng) for _ in range(40)]
+    for query in queries:
+        expected = naive_ranking(names, query)
+        if limit is not None:
+            expected = expected[:limit]
+        assert index.rank(query, 60, limit) == expected, query
+
+def test_rank_orders_by_score_then_key():
+    index = ServiceNameIndex({"b": "GitHub", "a": "GitHub", "c": "GitLab", "d": "Netflix"})
+
+    assert [key for key, _ in index.rank("github", 60)] == ["a", "b", "c"]
+    assert index.rank("github", 60, limit=0) == []
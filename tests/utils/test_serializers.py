@@ -0,0 +1,35 @@
+import pytest
+from src.vault.utils.serializers import BinaryRecordSerializer, JsonLinesSerializer, get_serializer
+
+RECORDS = {f"service-{i}": {"service_name": f"Sérvice {i}", "username": "user", "password": "pässword\n\x00"} for i in range(100)}
+
+@pytest.mark.parametrize("serializer", [JsonLinesSerializer(chunk_size=256), BinaryRecordSerializer(records_per_block=7)])
+def test_round_trip_with_arbitrary_chunk_boundaries(serializer):
+    stream = b"".join(serializer.encode(RECORDS))
+
+    chunks = [stream[i:i + 7] for i in range(0, len(stream), 7)]
+
+    assert dict(serializer.decode(chunks)) == RECORDS
+
+@pytest.mark.parametrize("serializer", [JsonLinesSerializer(), BinaryRecordSerializer()])
+def test_partial_last_record_is_rejected(serializer):
+    stream = b"".join(serializer.encode({"github": {"service_name": "GitHub", "username": "octo", "password": "cat"}}))
+
+    with pytest.raises(ValueError):
+        list(serializer.decode([stream[:-3]]))
+
+def test_binary_stream_checks_schema_version():
+    stream = bytearray(b"".join(BinaryRecordSerializer().encode(RECORDS)))
+    stream[4] = 99
+
+    with pytest.raises(ValueError):
+        list(BinaryRecordSerializer().decode([bytes(stream)]))
+
+def test_binary_empty_vault_round_trips():
+    serializer = BinaryRecordSerializer()
+
+    assert dict(serializer.decode(serializer.encode({}))) == {}
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        get_serializer("yaml")
@@ -3,6 +3,7 @@ import getpass
 import pytest
 from src.vault.views.console_view import ConsoleView
 from src.vault.models.credential import Credential
+from src.vault.models.search_result import SearchResult
 
 
 @pytest.fixture
@@ -82,4 +83,21 @@ def test_populated_log_audit(console_view, capsys):
 
     assert "2026-02-18 11:12:33" in captured.out
     assert "Deleted credential: google" in captured.out
-    assert "LOGIN_FAIL" in captured.out
\ No newline at end of file
+    assert "LOGIN_FAIL" in captured.out
+
+def test_ranked_search_results_show_scores_in_order(console_view, capsys):
+    console_view.show_ranked_results([
+        SearchResult("github", Credential("GitHub", "octo", "pw"), 100),
+        SearchResult("gitlab", Credential("GitLab", "fox", "pw"), 67)
+    ], "github")
+    captured = capsys.readouterr()
+
+    assert captured.out.index("GitHub") < captured.out.index("GitLab")
+    assert "100" in captured.out
+    assert "67" in captured.out
+
+def test_empty_ranked_search_results(console_view, capsys):
+    console_view.show_ranked_results([], "apple")
+    captured = capsys.readouterr()
+
+    assert "No credentials found containing 'apple'." in captured.out